@@ -0,0 +1,225 @@
+# benchmark.py
+"""
+가짜 드라이버 벤치마크 모듈 (Chrome/네트워크 없이 수집 파이프라인 처리 속도 측정)
+"""
+
+import contextlib
+import html
+import logging
+import os
+import shutil
+import tempfile
+import time
+import zlib
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from browser_handler import BrowserHandler
+from page_state import PROBE_MARKER
+from selector_stats import SelectorStats
+from collector import NaverSellerInfoCollector
+from structured_log import flush as flush_logs
+
+MAIN_WINDOW = 'BENCH-MAIN'
+
+
+class FakeElement:
+    """WebElement 대용 (text, 하위 요소 검색, 클릭만 지원)"""
+
+    def __init__(self, text='', children=None, on_click=None):
+        self.text = text
+        self.children = children or {}   # CSS 선택자 → 하위 요소 리스트
+        self.on_click = on_click
+
+    def find_elements(self, by, selector):
+        return self.children.get(selector, [])
+
+    def click(self):
+        if self.on_click:
+            self.on_click()
+
+
+def _fake_seller_pairs(url):
+    """URL별로 항상 같은 판매자 정보 (라벨, 값) 목록"""
+    seed = zlib.crc32(str(url).encode('utf-8'))
+    return [
+        ('상호명', f"벤치상사{seed % 1000:03d}"),
+        ('대표자', f"대표{seed % 97}"),
+        ('사업자등록번호', f"{seed % 900 + 100}-{seed % 90 + 10}-{seed % 90000 + 10000}"),
+        ('사업장 소재지', f"서울특별시 강남구 테헤란로 {seed % 500}"),
+        ('고객센터', f"010-{seed % 9000 + 1000}-{seed // 7 % 9000 + 1000}"),
+        ('e-mail', f"seller{seed % 100000}@example.com")
+    ]
+
+
+def _fake_seller_popup(url):
+    """판매자 정보 팝업 요소 (dl > div 안의 dt/dd 쌍)"""
+    return [
+        FakeElement(f"{label}\n{value}", {
+            'dt': [FakeElement(label)],
+            'dd': [FakeElement(value)]
+        })
+        for label, value in _fake_seller_pairs(url)
+    ]
+
+
+class _FakeSwitchTo:
+    def window(self, handle):
+        pass
+
+
+class FakeDriver:
+    """WebDriver 대용 - 스토어 페이지를 메모리에서 생성해 돌려줌
+
+    closed_ratio 비율의 스토어는 판매자 정보 버튼이 없는 영업종료 페이지가 된다.
+    """
+
+    def __init__(self, closed_ratio=0.0):
+        self.closed_ratio = closed_ratio
+        self.current_url = ''
+        self.current_window_handle = MAIN_WINDOW
+        self.window_handles = [MAIN_WINDOW]
+        self.switch_to = _FakeSwitchTo()
+        self.capabilities = {}
+        self._popup = []
+
+    def _is_closed(self):
+        return zlib.crc32(self.current_url.encode('utf-8')) % 1000 < self.closed_ratio * 1000
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def get(self, url):
+        self.current_url = url
+        self._popup = []
+
+    @property
+    def page_source(self):
+        """현재 페이지 HTML (run --record와 같은 형식으로 코퍼스 기록 가능)"""
+        body = ''
+        if not self._is_closed():
+            body = '<button data-shp-area-id="sellerinfo">판매자 상세정보</button>'
+        if self._popup:
+            body += '<dl>' + ''.join(
+                f'<div><dt class="_1nqckXI-BW">{html.escape(label)}</dt><dd class="EdE67hDR6I">{html.escape(value)}</dd></div>'
+                for label, value in _fake_seller_pairs(self.current_url)
+            ) + '</dl>'
+        return f"<html><head><title>벤치마크 스토어</title></head><body>{body}</body></html>"
+
+    def _open_popup(self):
+        self._popup = _fake_seller_popup(self.current_url)
+
+    def _seller_button(self):
+        return None if self._is_closed() else FakeElement('판매자 상세정보', on_click=self._open_popup)
+
+    def execute_script(self, script, *args):
+        if PROBE_MARKER in script:
+            # 페이지 상태 프로브 - 실제 브라우저와 같은 형식으로 응답
+            return {
+                'ready_state': 'complete', 'url': self.current_url, 'head': '벤치마크 스토어\n',
+                'button': self._seller_button(), 'captcha': [], 'close': [], 'not_found': None
+            }
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {'cookies': []}
+
+    def find_element(self, by, selector):
+        if by == By.XPATH:
+            button = self._seller_button()
+            if button is None:
+                raise NoSuchElementException(selector)
+            return button
+        if by == By.TAG_NAME:
+            return FakeElement('\n'.join(e.text for e in self._popup))
+        raise NoSuchElementException(selector)
+
+    def find_elements(self, by, selector):
+        if selector == 'dl > div':
+            return self._popup
+        return []
+
+    def quit(self):
+        pass
+
+
+class FakeBrowserHandler(BrowserHandler):
+    """FakeDriver를 쓰는 BrowserHandler (대기 시간 0, 추출 로직은 실제 코드 그대로)"""
+
+    def __init__(self, closed_ratio=0.0):
+        super().__init__(selector_stats=SelectorStats())   # 메모리에만 (실제 통계 파일과 분리)
+        self.closed_ratio = closed_ratio
+        self.navigation_delay = 0
+        self.captcha_detect_wait = 0
+        self.button_wait = 0
+
+    def setup_driver(self):
+        self.driver = FakeDriver(self.closed_ratio)
+        self.main_window = self.driver.current_window_handle
+
+    def kill_driver(self):
+        pass
+
+    def browser_memory_mb(self):
+        return None
+
+
+class BenchmarkCollector(NaverSellerInfoCollector):
+    """로그인 대기 없이 FakeBrowserHandler로 실행하는 수집기"""
+
+    def __init__(self, excel_file_path, closed_ratio=0.0, recorder=None, memory=False):
+        super().__init__(
+            excel_file_path, browser_handler=FakeBrowserHandler(closed_ratio), inter_store_delay=0,
+            recorder=recorder, memory=memory, live_config=False
+        )
+
+    def login(self):
+        pass
+
+
+def run_benchmark(file_path, limit=None, closed_ratio=0.0, verbose=False, recorder=None, memory=False):
+    """원본 CSV 사본에 대해 가짜 드라이버로 수집을 실행하고 처리 속도 출력
+
+    원본 파일은 수정하지 않는다. limit을 주면 앞에서부터 limit개 행만 사용한다.
+    recorder(PageRecorder)를 주면 가짜 페이지를 코퍼스로 기록한다 (replay 점검용).
+    memory면 메모리 추적을 켜고 (추적 오버헤드 포함) 증가 추세/할당 위치를 함께 출력한다.
+    """
+    with tempfile.TemporaryDirectory(prefix='bench_') as work_dir:
+        bench_path = os.path.join(work_dir, os.path.basename(file_path))
+        if limit:
+            import pandas as pd
+            pd.read_csv(file_path, encoding='utf-8').head(limit).to_csv(
+                bench_path, index=False, encoding='utf-8'
+            )
+        else:
+            shutil.copyfile(file_path, bench_path)
+
+        collector = BenchmarkCollector(bench_path, closed_ratio, recorder, memory)
+
+        print(f"⏱️ 가짜 드라이버 벤치마크 시작: {file_path}" + (f" (앞 {limit}개 행)" if limit else ""))
+        started = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                # 스토어별 진행 메시지/INFO 로그는 버림 (콘솔 출력 비용 없이 파이프라인만 측정)
+                logging.disable(logging.INFO)
+                stack.callback(logging.disable, logging.NOTSET)
+            collector.run()
+        elapsed = time.perf_counter() - started
+        flush_logs()
+
+    processed = collector.processed_count
+    rate = processed / elapsed if elapsed else 0.0
+    print("="*60)
+    print("📊 벤치마크 결과")
+    print(f"처리 스토어: {processed}개")
+    print(f"소요 시간: {elapsed:.2f}초")
+    print(f"처리 속도: {rate:.1f} 스토어/초")
+    if collector.memory_report:
+        for column, slope in collector.memory_report['trends'].items():
+            if slope is not None:
+                print(f"메모리 증가 ({column}): 100개 스토어당 {slope:+.1f}MB")
+        for site, size_kb, count in collector.memory_report['allocations'][:5]:
+            print(f"   +{size_kb}KB ({count:+d}개) {site}")
+    print("="*60)
+    return processed, elapsed
@@ -3,29 +3,112 @@
 브라우저 제어 및 웹 스크래핑 모듈 (영업종료 기준: 버튼 유무, 1회 검색)
 """
 
+import os
+import signal
 import time
 import re
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 import logging
 
 from config import (
     BROWSER_WAIT_TIME, PAGE_LOAD_DELAY, BUTTON_CLICK_DELAY,
-    CAPTCHA_SELECTORS, SELLER_INFO_BUTTON_XPATH
+    CAPTCHA_EVENT_MODE, NETWORK_CAPTURE_MODE, NAVIGATION_DELAY, SELLER_INFO_SELECTORS, SELLER_INFO_MAX_CONTAINERS,
+    PAGE_STATE_BUTTON_WAIT, PAGE_STATE_LOAD_TIMEOUT, PAGE_STATE_POLL_INTERVAL,
+    BROWSER_MODE, BROWSER_WINDOW_SIZE, BROWSER_PROFILE_DIR, CAPTCHA_HANDOFF_WAIT
 )
+from failures import PageNotFoundError
+from field_rules import DEFAULT_MATCHER, FieldMatcher, clean_phone_number, rules_with_keywords
+from target_events import TargetWatcher
+from network_capture import NetworkCapture
+from page_state import PageState, DEFAULT_PROBE_SELECTORS, wait_for_page_state
+from selector_stats import SelectorStats
+from server_mode import SERVER_MODES, CaptchaHandoff, VirtualDisplay, chrome_arguments, profile_path
+from structured_log import say, detail, set_stage, flush as flush_logs
+
+try:
+    import psutil
+except ImportError:  # 메모리 기준 재시작만 비활성화
+    psutil = None
 
 logger = logging.getLogger(__name__)
 
+# 전체 페이지 검색용 패턴 (모듈 로드 시 1회 컴파일)
+PHONE_PATTERNS = [
+    re.compile(r'(\d{2,3}-\d{3,4}-\d{4})'),  # 일반적인 전화번호
+    re.compile(r'(\d{3}-\d{4}-\d{4})'),      # 휴대폰 번호
+    re.compile(r'(\d{10,11})')               # 연속된 숫자
+]
+EMAIL_PATTERN = re.compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+
+# 컨테이너 텍스트를 '라벨: 값' 줄로 파싱하는 레이아웃 (라벨/값 선택자 쌍 다음에 시도)
+TEXT_LAYOUT = 'text'
+
+
+def build_pair_layouts(selectors):
+    """SELLER_INFO_SELECTORS → {'라벨 | 값': (라벨 선택자, 값 선택자)} (LABELS/VALUES 같은 위치끼리)"""
+    return {
+        f"{label} | {value}": (label, value)
+        for label, value in zip(selectors['LABELS'], selectors['VALUES'])
+    }
+
 class BrowserHandler:
     """브라우저 제어 클래스"""
     
-    def __init__(self):
+    def __init__(self, field_matcher=None, selector_stats=None, mode=None, profile_dir=BROWSER_PROFILE_DIR, worker=None,
+                 lightweight=False):
         self.driver = None
+        # 가벼운 로드 (로드 완료를 기다리지 않음, 이미지/네트워크 로그/타깃 감시 없음 - liveness_sweep.py)
+        self.lightweight = lightweight
+        # 실행 방식 (desktop/headless/xvfb - server_mode.py), 서버 모드는 콘솔 입력 없이 진행
+        self.mode = mode or BROWSER_MODE
+        chrome_arguments(self.mode)     # 알 수 없는 모드는 여기서 ValueError
+        self.profile_dir = profile_path(profile_dir, worker)   # Chrome 사용자 데이터 폴더 (None이면 임시)
+        self.virtual_display = None     # xvfb 모드의 VirtualDisplay (브라우저 재시작 후에도 유지)
+        self.captcha_handoff = CaptchaHandoff() if self.server_mode else None
         self.main_window = None
+        self.field_matcher = field_matcher or DEFAULT_MATCHER
+        self.last_error = None  # 마지막 페이지 이동 실패 원인 (실패 분류용)
+        self.target_watcher = None  # DevTools 타깃 이벤트 감시 (없으면 폴링)
+        self.captcha_window = None
+        self.session_cookies = []   # 브라우저 재시작 시 복원할 로그인 쿠키
+        self.navigation_delay = NAVIGATION_DELAY   # 페이지 이동 후 대기 (초)
+        self.captcha_detect_wait = 1  # 폴링 방식 캡차 감지 대기 (초)
+        self.network_capture = None  # 네트워크 응답 기반 추출 (없으면 DOM만 사용)
+        self.button_wait = PAGE_STATE_BUTTON_WAIT  # 로드 후 판매자 정보 버튼 대기 (초)
+        self.load_timeout = PAGE_STATE_LOAD_TIMEOUT
+        self.poll_interval = PAGE_STATE_POLL_INTERVAL
+        self.probe_selectors = DEFAULT_PROBE_SELECTORS  # (버튼 XPath, 캡차, 캡차 닫기, 404 문구)
+        self.page_state = None      # 마지막 페이지 판정 (page_state.ProbeResult)
+        # 선택자/레이아웃 적중률 (기본: 파일에서 불러와 실행 간 유지, 샤드 작업자는 작업자별 파일)
+        self.selector_stats = selector_stats if selector_stats is not None else SelectorStats.load(worker=worker)
+        self.set_seller_info_selectors(SELLER_INFO_SELECTORS)
+    
+    @property
+    def server_mode(self):
+        """무인 실행 여부 (로그인/캡차에서 콘솔 입력을 기다리지 않음)"""
+        return self.mode in SERVER_MODES
+    
+    def set_seller_info_selectors(self, selectors):
+        """판매자 정보 컨테이너/라벨·값 선택자 교체 (시도 순서는 적중률 기준)"""
+        self.container_selectors = list(selectors['DL_CONTAINERS'])
+        self.pair_layouts = build_pair_layouts(selectors)
+        self.layouts = list(self.pair_layouts) + [TEXT_LAYOUT]
+    
+    def apply_settings(self, settings):
+        """실행 중 다시 불러온 설정 적용 (live_config.py - 다음 스토어부터 사용)"""
+        self.set_seller_info_selectors(settings['SELLER_INFO_SELECTORS'])
+        self.probe_selectors = (
+            settings['SELLER_INFO_BUTTON_XPATH'], settings['CAPTCHA_SELECTORS'],
+            settings['CAPTCHA_CLOSE_SELECTORS'], settings['NOT_FOUND_MARKERS']
+        )
+        self.field_matcher = FieldMatcher(rules_with_keywords(settings['FIELD_KEYWORDS'], self.field_matcher.rules))
+        self.navigation_delay = settings['NAVIGATION_DELAY']
+        self.button_wait = settings['PAGE_STATE_BUTTON_WAIT']
+        self.load_timeout = settings['PAGE_STATE_LOAD_TIMEOUT']
+        self.poll_interval = settings['PAGE_STATE_POLL_INTERVAL']
     
     def setup_driver(self):
         """Undetected Chrome 드라이버 설정"""
@@ -35,45 +118,245 @@ class BrowserHandler:
             options.add_argument("--disable-blink-features=AutomationControlled")
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--no-sandbox")
-            
-            self.driver = uc.Chrome(options=options, version_main=None)
+            for argument in chrome_arguments(self.mode):
+                options.add_argument(argument)
+            if self.lightweight:
+                # 명령이 탭 로드 완료를 기다리지 않아야 여러 탭을 동시에 불러올 수 있음
+                options.page_load_strategy = 'none'
+                options.add_argument("--blink-settings=imagesEnabled=false")
+            elif NETWORK_CAPTURE_MODE:
+                # 판매자 정보 응답을 읽기 위한 Network 이벤트 로그
+                options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            
+            if self.mode == 'xvfb' and self.virtual_display is None:
+                self.virtual_display = VirtualDisplay(BROWSER_WINDOW_SIZE).start()
+            
+            self.driver = uc.Chrome(
+                options=options, version_main=None, user_data_dir=self.profile_dir,
+                headless=self.mode == 'headless'
+            )
             self.driver.implicitly_wait(BROWSER_WAIT_TIME)
             
             # 메인 윈도우 핸들 저장
             self.main_window = self.driver.current_window_handle
             
-            logger.info("Undetected Chrome 드라이버 초기화 완료")
+            # 새 탭/탭 닫힘을 이벤트로 감지 (실패하면 기존 폴링 방식 사용)
+            if CAPTCHA_EVENT_MODE and not self.lightweight:
+                self._start_target_watcher()
+            
+            # 재시작 시에는 기존 상태(비활성화 여부 등)를 유지하고 드라이버만 교체
+            if NETWORK_CAPTURE_MODE and not self.lightweight:
+                if self.network_capture:
+                    self.network_capture.driver = self.driver
+                else:
+                    self.network_capture = NetworkCapture(self.driver)
+            
+            logger.info(f"Undetected Chrome 드라이버 초기화 완료 ({self.mode})")
             
         except Exception as e:
             logger.error(f"드라이버 설정 실패: {e}")
             raise
     
-    def close_driver(self):
-        """드라이버 종료"""
+    def _start_target_watcher(self):
+        """DevTools 타깃 이벤트 감시 시작"""
+        try:
+            debugger_address = self.driver.capabilities['goog:chromeOptions']['debuggerAddress']
+            self.target_watcher = TargetWatcher(debugger_address)
+            self.target_watcher.start()
+        except Exception as e:
+            logger.warning(f"DevTools 이벤트 감시 불가 - 폴링 방식 사용: {e}")
+            self.target_watcher = None
+    
+    def _events_active(self):
+        """이벤트 감시 사용 가능 여부"""
+        return self.target_watcher is not None and self.target_watcher.running
+    
+    @staticmethod
+    def _target_id(handle):
+        """창 핸들 → DevTools targetId (구버전 chromedriver의 'CDwindow-' 접두어 제거)"""
+        return handle[len('CDwindow-'):] if handle and handle.startswith('CDwindow-') else handle
+    
+    def _window_handle(self, target_id):
+        """DevTools targetId → 창 핸들"""
+        if self.main_window and self.main_window.startswith('CDwindow-'):
+            return f"CDwindow-{target_id}"
+        return target_id
+    
+    def close_driver(self, keep_display=False):
+        """드라이버 종료 (keep_display면 가상 디스플레이는 재시작에 쓰도록 유지)"""
+        self.selector_stats.save()
+        if self.target_watcher:
+            self.target_watcher.stop()
+            self.target_watcher = None
+        try:
+            if self.driver:
+                self.driver.quit()
+                logger.info("드라이버 종료")
+        finally:
+            if self.virtual_display and not keep_display:
+                self.virtual_display.stop()
+                self.virtual_display = None
+    
+    def _process_ids(self):
+        """Chrome / chromedriver 프로세스 ID"""
+        pids = []
+        browser_pid = getattr(self.driver, 'browser_pid', None)
+        if browser_pid:
+            pids.append(browser_pid)
+        service = getattr(self.driver, 'service', None)
+        process = getattr(service, 'process', None)
+        if process is not None and process.pid:
+            pids.append(process.pid)
+        return pids
+    
+    def _process_tree(self):
+        """Chrome / chromedriver 및 모든 자식 프로세스 (psutil 필요)"""
+        processes = []
+        for pid in self._process_ids():
+            try:
+                root = psutil.Process(pid)
+                processes.append(root)
+                processes.extend(root.children(recursive=True))
+            except psutil.Error:
+                continue
+        return processes
+    
+    def browser_memory_breakdown(self):
+        """Chrome / chromedriver 프로세스 트리 메모리 (MB)와 프로세스/탭 수 (psutil이 없으면 탭 수만)"""
+        result = {}
         if self.driver:
-            self.driver.quit()
-            logger.info("드라이버 종료")
+            try:
+                result['tabs'] = len(self.driver.window_handles)
+            except Exception:
+                pass
+        if psutil is None or not self.driver:
+            return result
+        chrome = driver = 0
+        processes = {p.pid: p for p in self._process_tree()}
+        for process in processes.values():
+            try:
+                rss = process.memory_info().rss
+                if 'chromedriver' in process.name().lower():
+                    driver += rss
+                else:
+                    chrome += rss
+            except psutil.Error:
+                continue
+        result.update({
+            'chrome_mb': round(chrome / (1024 * 1024), 1),
+            'driver_mb': round(driver / (1024 * 1024), 1),
+            'processes': len(processes)
+        })
+        return result
+    
+    def browser_memory_mb(self):
+        """Chrome 프로세스 트리 메모리 합계 (MB, psutil이 없으면 None)"""
+        if psutil is None or not self.driver:
+            return None
+        total = 0
+        for process in {p.pid: p for p in self._process_tree()}.values():
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    
+    def kill_driver(self):
+        """응답 없는 브라우저 강제 종료 (다른 스레드에서 호출 가능)"""
+        if not self.driver:
+            return
+        if psutil is not None:
+            for process in self._process_tree():
+                try:
+                    process.kill()
+                except psutil.Error:
+                    continue
+            return
+        for pid in self._process_ids():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                continue
+    
+    def save_session(self):
+        """로그인 쿠키 저장 (모든 도메인)"""
+        try:
+            self.session_cookies = self.driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+            logger.info(f"세션 쿠키 저장: {len(self.session_cookies)}개")
+        except Exception as e:
+            logger.warning(f"세션 쿠키 저장 실패: {e}")
+    
+    def restore_session(self):
+        """저장된 로그인 쿠키 복원"""
+        if not self.session_cookies:
+            return
+        try:
+            cookies = [
+                {key: value for key, value in cookie.items() if key not in ('size', 'session')}
+                for cookie in self.session_cookies
+            ]
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+            logger.info(f"세션 쿠키 복원: {len(cookies)}개")
+        except Exception as e:
+            logger.warning(f"세션 쿠키 복원 실패: {e}")
+    
+    def restart_driver(self, graceful=True):
+        """브라우저 재시작 (로그인 세션 유지)"""
+        say("♻️ 브라우저 재시작 중...")
+        if graceful:
+            self.save_session()
+        try:
+            self.close_driver(keep_display=True)
+        except Exception as e:
+            logger.warning(f"드라이버 종료 중 오류 (무시): {e}")
+            self.kill_driver()
+        self.driver = None
+        
+        self.setup_driver()
+        self.restore_session()
+        say("✅ 브라우저 재시작 완료")
     
     def navigate_to_url(self, url):
         """URL로 이동 (URL 형식 검증 추가)"""
+        self.last_error = None
         try:
             # URL 형식 검증 및 수정
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
             self.driver.get(url)
-            time.sleep(1)  # 2초에서 1초로 단축
+            time.sleep(self.navigation_delay)
             return True
         except Exception as e:
             logger.error(f"URL 이동 실패: {e}")
+            self.last_error = e
             return False
     
+    def probe_page_state(self):
+        """현재 페이지 상태 판정 (설정된 선택자 전체를 스크립트 1회로 확인, 확정될 때까지 반복)"""
+        self.page_state = wait_for_page_state(
+            self.driver, self.button_wait, self.load_timeout, self.poll_interval, self.probe_selectors
+        )
+        detail(f"🔎 페이지 상태: {self.page_state.state}", page_state=self.page_state.state,
+               probes=self.page_state.probes, captcha_selectors=list(self.page_state.captcha))
+        return self.page_state
+    
     def check_page_accessibility(self, url):
-        """페이지 접근 가능성 체크"""
+        """페이지 접근 가능성 체크 (실패 시 원인은 last_error에 보관, 판정은 page_state에 보관)"""
+        set_stage('navigate')
+        self.page_state = None
         try:
-            self.navigate_to_url(url)
+            if not self.navigate_to_url(url):
+                return False, f"접근 오류: {self.last_error}"
+            
+            # 존재하지 않는 페이지 확인 (버튼/캡차 판정과 같은 프로브에서)
+            if self.probe_page_state().state == PageState.NOT_FOUND:
+                self.last_error = PageNotFoundError("페이지 없음 (404)")
+                return False, "페이지 없음 (404)"
+            
             return True, "접근 가능"
         except Exception as e:
+            self.last_error = e
             return False, f"접근 오류: {str(e)}"
     
     def check_login_status(self):
@@ -95,48 +378,72 @@ class BrowserHandler:
         except:
             return False
     
-    def find_seller_info_button(self):
-        """판매자 정보 버튼 찾기 (초고속 버전)"""
+    def find_seller_info_button(self, probe=None):
+        """판매자 정보 버튼 찾아서 클릭 (probe가 없으면 현재 페이지를 새로 판정)
+        
+        버튼이 없으면 False - 이유(영업 종료/캡차/로딩)는 self.page_state.state로 확인한다.
+        """
         try:
-            print("🔍 판매자 정보 버튼 찾는 중...")
-            
-            # 즉시 버튼 존재 여부 확인 (대기시간 없음)
-            try:
-                # 0.5초만 대기 (3초에서 0.5초로 대폭 단축)
-                seller_info_button = WebDriverWait(self.driver, 0.5).until(
-                    EC.presence_of_element_located((By.XPATH, SELLER_INFO_BUTTON_XPATH))
-                )
-                print("✅ 판매자 정보 버튼 발견!")
-                
-                # 즉시 클릭 (스크롤 대기시간 제거)
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", seller_info_button)
-                seller_info_button.click()
-                
-                print("✅ 판매자 정보 버튼 클릭 완료!")
-                return True
-                
-            except TimeoutException:
-                print(f"❌ 판매자 정보 버튼을 찾을 수 없음 - 영업 종료로 판단")
+            say("🔍 판매자 정보 버튼 찾는 중...", stage='button')
+            
+            result = probe or self.probe_page_state()
+            self.page_state = result
+            if result.button is None:
+                if result.state == PageState.CLOSED:
+                    say(f"❌ 판매자 정보 버튼을 찾을 수 없음 - 영업 종료로 판단")
+                else:
+                    say(f"❌ 판매자 정보 버튼을 찾을 수 없음 (페이지 상태: {result.state})")
                 return False
+            detail("✅ 판매자 정보 버튼 발견!")
+            
+            # 즉시 클릭 (스크롤 대기시간 제거)
+            seller_info_button = result.button
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", seller_info_button)
+            if self.network_capture:
+                self.network_capture.begin()
+            seller_info_button.click()
+            
+            say("✅ 판매자 정보 버튼 클릭 완료!")
+            return True
             
         except Exception as e:
-            print(f"❌ 버튼 클릭 중 예외 발생: {e}")
+            say(f"❌ 버튼 클릭 중 예외 발생: {e}")
             return False
     
-    def detect_captcha_by_window_change(self):
-        """창 변화로 캡차 감지 (최적화)"""
+    def detect_captcha_by_window_change(self, wait=None):
+        """창 변화로 캡차 감지 (이벤트 감시 중이면 새 탭이 열리는 즉시 반환)"""
+        if wait is None:
+            wait = self.captcha_detect_wait
         try:
+            self.captcha_window = None
+            
+            if self._events_active():
+                target_id = self.target_watcher.wait_for_new_page(
+                    exclude={self._target_id(self.main_window)}, timeout=wait
+                )
+                if not target_id:
+                    return False
+                
+                say("✅ 새 탭 열림 - 캡차로 판단")
+                self.captcha_window = target_id
+                self.driver.switch_to.window(self._window_handle(target_id))
+                return True
+            
+            # 잠시 대기 후 창 변화 확인 (폴링 방식)
+            time.sleep(wait)
+            
             # 현재 모든 창 핸들
             current_windows = self.driver.window_handles
             
             # 메인 창보다 창이 많으면 캡차 팝업으로 간주
             if len(current_windows) > 1:
-                print("✅ 새 탭 열림 - 캡차로 판단")
+                say("✅ 새 탭 열림 - 캡차로 판단")
                 
                 # 새 탭으로 포커스 이동
                 for window in current_windows:
                     if window != self.main_window:
                         self.driver.switch_to.window(window)
+                        self.captcha_window = self._target_id(window)
                         break
                 
                 return True
@@ -144,36 +451,41 @@ class BrowserHandler:
             return False
             
         except Exception as e:
-            print(f"❌ 캡차 감지 오류: {e}")
+            say(f"❌ 캡차 감지 오류: {e}")
             return False
     
     def wait_for_captcha_completion(self, timeout=30):
-        """캡차 완료 대기 (브라우저 상태 초기화 추가)"""
+        """캡차 완료 대기 (브라우저 상태 초기화 추가, 콘솔 입력 - 서버 모드는 hand_off_captcha)"""
+        
+        events_active = self._events_active() and self.captcha_window is not None
+        set_stage('captcha')
         
         # 🚨 브라우저 상태 초기화 (이전 페이지 영향 제거)
-        try:
-            # 메인 창으로 포커스 이동
-            self.driver.switch_to.window(self.main_window)
+        if not events_active:
+            try:
+                # 메인 창으로 포커스 이동
+                self.driver.switch_to.window(self.main_window)
+                
+                # 잠시 대기 후 다시 캡차 창으로 이동
+                current_windows = self.driver.window_handles
+                if len(current_windows) > 1:
+                    for window in current_windows:
+                        if window != self.main_window:
+                            self.driver.switch_to.window(window)
+                            break
+            except:
+                pass
             
-            # 잠시 대기 후 다시 캡차 창으로 이동
-            current_windows = self.driver.window_handles
-            if len(current_windows) > 1:
-                for window in current_windows:
-                    if window != self.main_window:
-                        self.driver.switch_to.window(window)
-                        break
-        except:
-            pass
+            # 🚨 강제 대기를 맨 처음에 실행 (이벤트 감시 중에는 불필요)
+            say("⏳ 캡차 로딩 대기 중... (5초)")
+            time.sleep(5)  # 3초에서 5초로 늘림
         
-        # 🚨 강제 대기를 맨 처음에 실행
-        print("⏳ 캡차 로딩 대기 중... (5초)")
-        time.sleep(5)  # 3초에서 5초로 늘림
-        
-        print("\n" + "="*50)
-        print("🔍 캡차가 나타났습니다!")
-        print("🤖 캡차를 풀어주세요. 완료되면 자동으로 감지합니다.")
-        print("🔄 다른 옵션: r(캡차 다시로드) / s(건너뛰기)")
-        print("="*50)
+        say("\n" + "="*50)
+        say("🔍 캡차가 나타났습니다!")
+        say("🤖 캡차를 풀어주세요. 완료되면 자동으로 감지합니다.")
+        say("🔄 다른 옵션: r(캡차 다시로드) / s(건너뛰기)")
+        say("="*50)
+        flush_logs()    # 입력 프롬프트보다 안내 메시지가 먼저 보이도록
         
         import threading
         import queue
@@ -192,38 +504,109 @@ class BrowserHandler:
         input_thread = threading.Thread(target=get_user_input, daemon=True)
         input_thread.start()
         
-        # 캡차 완료 자동 감지
+        if events_active:
+            result = self._wait_captcha_by_events(input_queue, timeout)
+        else:
+            result = self._wait_captcha_by_polling(input_queue, timeout)
+        
+        if result == "timeout":
+            say(f"⏰ 캡차 대기 시간 초과 ({timeout}초)")
+        return result
+
+    def hand_off_captcha(self, task, reason="판매자 정보 캡차", wait=CAPTCHA_HANDOFF_WAIT):
+        """서버 모드 캡차 처리 - 스크린샷/웹훅 알림 후 wait초 동안 원격 해결 대기 (콘솔 입력 없음)
+
+        반환: success/auto_retry (대기 중 해결됨) 또는 handed_off (미해결 - captcha 실패로 기록)
+        """
+        import queue
+
+        set_stage('captcha')
+        self.captcha_handoff.notify(self.driver, task, reason)
+        if wait <= 0:
+            return "handed_off"
+
+        say(f"⏳ 원격 캡차 해결 대기 ({wait}초)")
+        no_input = queue.Queue()    # r/s 선택 없음
+        if self._events_active() and self.captcha_window is not None:
+            result = self._wait_captcha_by_events(no_input, wait)
+        else:
+            result = self._wait_captcha_by_polling(no_input, wait)
+        return "handed_off" if result == "timeout" else result
+
+    @staticmethod
+    def _read_user_choice(input_queue):
+        """사용자 입력 확인 (r: reload / s: skip / 없으면 None)"""
+        try:
+            user_input = input_queue.get_nowait()
+        except Exception:
+            return None
+        return {'r': "reload", 's': "skip"}.get(user_input)
+    
+    @staticmethod
+    def _is_seller_url(url):
+        """판매자 정보 페이지 URL 여부"""
+        url = (url or '').lower()
+        return 'sellerinfo' in url or 'seller' in url or 'contact' in url
+    
+    def _wait_captcha_by_events(self, input_queue, timeout):
+        """캡차 탭 닫힘/주소 변경 이벤트로 완료 감지 (WebDriver 호출 없음)"""
+        watcher = self.target_watcher
+        captcha = self.captcha_window
+        
+        def finished():
+            return not watcher.is_open(captcha) or self._is_seller_url(watcher.url_of(captcha))
+        
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            choice = self._read_user_choice(input_queue)
+            if choice:
+                return choice
+            
+            # 사용자 입력을 확인할 수 있도록 짧게 나눠서 이벤트 대기
+            watcher.wait_for(finished, timeout=min(0.2, max(0, deadline - time.time())))
+            
+            if not watcher.running:
+                # 이벤트 연결이 끊기면 남은 시간은 폴링으로
+                return self._wait_captcha_by_polling(input_queue, max(0, deadline - time.time()))
+            
+            if not watcher.is_open(captcha):
+                say("🔄 캡차 창이 닫힌 것을 감지 - 자동 재시도")
+                return "auto_retry"
+            
+            if self._is_seller_url(watcher.url_of(captcha)):
+                detail("   📋 판매자 정보 URL로 변경됨")
+                say("✅ 캡차 완료 자동 감지!")
+                return "success"
+        
+        return "timeout"
+    
+    def _wait_captcha_by_polling(self, input_queue, timeout):
+        """창 개수/URL을 주기적으로 확인하여 완료 감지"""
         start_time = time.time()
         check_interval = 3  # 2초에서 3초로 늘림 (더 여유있게)
         last_window_count = len(self.driver.window_handles)
         
         while time.time() - start_time < timeout:
             # 사용자 입력 확인
-            try:
-                user_input = input_queue.get_nowait()
-                if user_input == 'r':
-                    return "reload"
-                elif user_input == 's':
-                    return "skip"
-            except queue.Empty:
-                pass
+            choice = self._read_user_choice(input_queue)
+            if choice:
+                return choice
             
             current_window_count = len(self.driver.window_handles)
             
             # 캡차 창이 수동으로 닫혔는지 감지
             if last_window_count > 1 and current_window_count == 1:
-                print("🔄 캡차 창이 수동으로 닫힌 것을 감지 - 자동 재시도")
+                say("🔄 캡차 창이 수동으로 닫힌 것을 감지 - 자동 재시도")
                 return "auto_retry"
             
             # 캡차 완료 자동 감지 (엄격하게)
             if self._check_captcha_completion():
-                print("✅ 캡차 완료 자동 감지!")
+                say("✅ 캡차 완료 자동 감지!")
                 return "success"
             
             last_window_count = current_window_count
             time.sleep(check_interval)
         
-        print("⏰ 캡차 대기 시간 초과 (30초)")
         return "timeout"
     
     def _check_captcha_completion(self):
@@ -233,7 +616,7 @@ class BrowserHandler:
             
             # 1. 캡차 창이 자동으로 닫혔는지 확인
             if len(current_windows) == 1:
-                print("   📋 캡차 창이 닫혔음을 감지")
+                detail("   📋 캡차 창이 닫혔음을 감지")
                 return True
             
             # 2. 현재 캡차 창이 열려있다면 매우 엄격하게 확인
@@ -242,10 +625,8 @@ class BrowserHandler:
                     current_url = self.driver.current_url
                     
                     # URL이 명확히 판매자 정보 페이지로 변경되었는지만 확인
-                    if ('sellerinfo' in current_url.lower() or 
-                        'seller' in current_url.lower() or
-                        'contact' in current_url.lower()):
-                        print("   📋 판매자 정보 URL로 변경됨")
+                    if self._is_seller_url(current_url):
+                        detail("   📋 판매자 정보 URL로 변경됨")
                         return True
                         
                 except Exception as e:
@@ -260,7 +641,7 @@ class BrowserHandler:
     def close_captcha_page(self):
         """캡차 페이지/팝업 닫기 (최적화)"""
         try:
-            print("🔄 캡차 탭 닫기...")
+            say("🔄 캡차 탭 닫기...")
             
             # 현재 창 정보 확인
             current_windows = self.driver.window_handles
@@ -272,7 +653,7 @@ class BrowserHandler:
                 if hasattr(self, 'main_window') and current_window != self.main_window:
                     self.driver.close()
                     self.driver.switch_to.window(self.main_window)
-                    print("✅ 캡차 탭 닫기 완료")
+                    say("✅ 캡차 탭 닫기 완료")
                     return True
                 
                 # 메인 탭이 아닌 다른 탭들 모두 닫기
@@ -286,14 +667,14 @@ class BrowserHandler:
                 
                 # 메인 탭으로 돌아가기
                 self.driver.switch_to.window(self.main_window)
-                print("✅ 모든 캡차 탭 닫기 완료")
+                say("✅ 모든 캡차 탭 닫기 완료")
                 return True
             
-            print("❌ 닫을 캡차 탭이 없음")
+            say("❌ 닫을 캡차 탭이 없음")
             return False
             
         except Exception as e:
-            print(f"❌ 캡차 탭 닫기 실패: {e}")
+            say(f"❌ 캡차 탭 닫기 실패: {e}")
             return False
     
     def extract_store_id_from_url(self, url):
@@ -306,184 +687,123 @@ class BrowserHandler:
     
     def _clean_phone_number(self, phone):
         """전화번호 정리"""
-        if not phone:
-            return None
-        
-        # 불필요한 텍스트 제거
-        cleaned = phone.replace('잘못된 번호 신고', '').replace('인증', '').strip()
-        cleaned = re.sub(r'\s+', ' ', cleaned)  # 중복 공백 제거
-        cleaned = re.sub(r'[^\d\-\(\)\s]', '', cleaned)  # 숫자, 하이픈, 괄호, 공백만 남기기
-        
-        return cleaned.strip() if cleaned.strip() else None
+        return clean_phone_number(phone)
     
     def _process_label_value_pair(self, label, value, seller_info):
         """라벨-값 쌍 처리"""
-        from config import PHONE_KEYWORDS, EMAIL_KEYWORDS
-        
-        # 전화번호 정보 처리
-        if any(keyword in label for keyword in PHONE_KEYWORDS):
-            cleaned_value = self._clean_phone_number(value)
-            if cleaned_value:
-                seller_info['전화번호'] = cleaned_value
-                print(f"   ✅ 전화번호 저장: {cleaned_value}")
-        
-        # 이메일 정보 처리
-        elif any(keyword in label.lower() for keyword in EMAIL_KEYWORDS):
-            if '@' in value:  # 간단한 이메일 형식 확인
-                seller_info['이메일'] = value
-                print(f"   ✅ 이메일 저장: {value}")
+        before = set(seller_info)
+        self.field_matcher.apply([(label, value)], seller_info)
+        for key in seller_info.keys() - before:
+            detail(f"   ✅ {key} 저장: {seller_info[key]}")
     
     def extract_seller_info(self):
-        """판매자 정보 추출 (중복 제거 및 성능 최적화)"""
+        """판매자 정보 추출 (설정된 필드 규칙을 단일 패스로 적용)"""
         try:
-            from config import PHONE_KEYWORDS, EMAIL_KEYWORDS
-            
             seller_info = {}
-            
-            print("🔍 판매자 정보 추출 시작...")
-            
-            # 빠른 추출을 위해 우선순위 선택자 사용
-            priority_selectors = [
-                'dl > div',  # 가장 일반적인 패턴
-                '.aAVvlAZ43w'  # 네이버 특화 클래스
-            ]
-            
-            # 우선순위 선택자로 먼저 시도
-            for selector in priority_selectors:
+            set_stage('extract')
+            
+            # 팝업을 채운 백엔드 응답에서 먼저 추출 (못 찾은 필드만 DOM에서 채움)
+            if self.network_capture and self.network_capture.enabled:
+                seller_info.update(self.network_capture.collect())
+                if seller_info:
+                    detail(f"   ⚡ 네트워크 응답에서 {len(seller_info)}개 필드 추출", source='network')
+                if self.field_matcher.is_complete(seller_info):
+                    detail(f"📋 최종 추출된 정보: {seller_info}")
+                    return seller_info
+            
+            say("🔍 판매자 정보 추출 시작...")
+            
+            # 최근 적중률이 높은 컨테이너 선택자부터 시도 (정보가 나온 선택자에서 멈춤)
+            # - 선택자마다 앞 SELLER_INFO_MAX_CONTAINERS개만 확인, 잘렸으면 다음 선택자로 나머지 필드 보완
+            for selector in self.selector_stats.order('container', self.container_selectors):
                 try:
+                    found_before = len(seller_info)
                     containers = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    truncated = len(containers) > SELLER_INFO_MAX_CONTAINERS
                     if containers:
-                        print(f"   ✅ {selector}에서 {len(containers)}개 컨테이너 발견")
+                        detail(f"   ✅ {selector}에서 {len(containers)}개 컨테이너 발견")
                         
-                        # 각 컨테이너에서 정보 추출 (최대 3개만)
-                        for container in containers[:3]:
-                            extracted = self._extract_from_container(container)
-                            if extracted:
-                                # 중복 방지: 이미 있는 정보는 덮어쓰지 않음
-                                for key, value in extracted.items():
-                                    if key not in seller_info:
-                                        seller_info[key] = value
-                        
-                        # 전화번호와 이메일 모두 찾았으면 조기 종료
-                        if '전화번호' in seller_info and '이메일' in seller_info:
-                            break
+                        # 각 컨테이너에서 정보 추출 (이미 있는 정보는 덮어쓰지 않음)
+                        for container in containers[:SELLER_INFO_MAX_CONTAINERS]:
+                            self._extract_from_container(container, seller_info)
+                            if self.field_matcher.is_complete(seller_info):
+                                break
+                    
+                    hit = len(seller_info) > found_before
+                    self.selector_stats.record('container', selector, hit)
+                    if self.field_matcher.is_complete(seller_info) or (hit and not truncated):
+                        break
                             
                 except Exception as e:
                     continue
             
-            # 우선순위 선택자로 못 찾았을 때만 전체 페이지 검색
+            # 컨테이너 선택자로 못 찾았을 때만 전체 페이지 검색
             if not seller_info:
-                print("🔍 전체 페이지에서 패턴 검색...")
+                say("🔍 전체 페이지에서 패턴 검색...")
                 self._extract_from_full_page(seller_info)
+                self.selector_stats.record('fallback', 'full_page', bool(seller_info))
             
-            print(f"📋 최종 추출된 정보: {seller_info}")
+            detail(f"📋 최종 추출된 정보: {seller_info}")
             return seller_info
             
         except Exception as e:
             logger.error(f"정보 추출 실패: {e}")
-            print(f"❌ 정보 추출 중 예외: {e}")
+            say(f"❌ 정보 추출 중 예외: {e}")
             return {}
     
-    def _extract_from_container(self, container):
-        """컨테이너에서 정보 추출 (중복 제거)"""
-        from config import PHONE_KEYWORDS, EMAIL_KEYWORDS
+    def _apply_layout(self, container, layout, seller_info):
+        """레이아웃 1개 적용 → 구조가 맞았는지 (라벨/값 쌍 발견, 텍스트는 필드 발견)"""
+        if layout == TEXT_LAYOUT:
+            before = len(seller_info)
+            container_text = container.text.strip()
+            if container_text:
+                self.field_matcher.parse_text(container_text, seller_info)
+            return len(seller_info) > before
         
-        extracted = {}
+        label_selector, value_selector = self.pair_layouts[layout]
+        labels = container.find_elements(By.CSS_SELECTOR, label_selector)
+        if not labels:
+            return False
+        values = container.find_elements(By.CSS_SELECTOR, value_selector)
+        if len(labels) != len(values):
+            return False
+        pairs = (
+            (label_elem.text, value_elem.text)
+            for label_elem, value_elem in zip(labels, values)
+        )
+        self.field_matcher.apply(pairs, seller_info)
+        return True
+    
+    def _extract_from_container(self, container, seller_info=None):
+        """컨테이너에서 정보 추출 (적중률 높은 라벨/값 레이아웃부터, 구조가 맞으면 멈춤)"""
+        seller_info = {} if seller_info is None else seller_info
+        before = set(seller_info)
         
         try:
-            # dt/dd 패턴 시도
-            labels = container.find_elements(By.CSS_SELECTOR, 'dt, ._1nqckXI-BW')
-            values = container.find_elements(By.CSS_SELECTOR, 'dd, .EdE67hDR6I')
-            
-            if len(labels) == len(values):
-                for label_elem, value_elem in zip(labels, values):
-                    try:
-                        label = label_elem.text.strip()
-                        value = value_elem.text.strip()
-                        
-                        if not label or not value:
-                            continue
-                        
-                        # 전화번호 확인 (중복 방지)
-                        if any(keyword in label for keyword in PHONE_KEYWORDS) and '전화번호' not in extracted:
-                            cleaned_phone = self._clean_phone_number(value)
-                            if cleaned_phone:
-                                extracted['전화번호'] = cleaned_phone
-                                print(f"   ✅ 전화번호 발견: {cleaned_phone}")
-                        
-                        # 이메일 확인 (중복 방지)
-                        elif any(keyword in label.lower() for keyword in EMAIL_KEYWORDS) and '이메일' not in extracted:
-                            if '@' in value:
-                                extracted['이메일'] = value
-                                print(f"   ✅ 이메일 발견: {value}")
-                        
-                        # 둘 다 찾았으면 조기 종료
-                        if len(extracted) == 2:
-                            break
-                            
-                    except Exception:
-                        continue
+            for layout in self.selector_stats.order('layout', self.layouts):
+                matched = self._apply_layout(container, layout, seller_info)
+                self.selector_stats.record('layout', layout, matched)
+                if matched:
+                    break
             
-            # dt/dd 패턴으로 못 찾았고 아직 정보가 없으면 텍스트 파싱
-            if not extracted:
-                container_text = container.text.strip()
-                if container_text:
-                    extracted.update(self._parse_text_for_info(container_text))
+            for key in seller_info.keys() - before:
+                detail(f"   ✅ {key} 발견: {seller_info[key]}")
             
-            return extracted
+            return seller_info
             
         except Exception as e:
-            return {}
+            return seller_info
     
     def _parse_text_for_info(self, text):
-        """텍스트에서 정보 파싱 (최적화)"""
-        from config import PHONE_KEYWORDS, EMAIL_KEYWORDS
-        
-        info = {}
-        lines = text.split('\n')
-        
-        for line in lines:
-            if ':' not in line:
-                continue
-                
-            parts = line.split(':', 1)
-            if len(parts) != 2:
-                continue
-                
-            label = parts[0].strip()
-            value = parts[1].strip()
-            
-            if not label or not value:
-                continue
-            
-            # 전화번호 확인
-            if any(keyword in label for keyword in PHONE_KEYWORDS) and '전화번호' not in info:
-                cleaned_phone = self._clean_phone_number(value)
-                if cleaned_phone:
-                    info['전화번호'] = cleaned_phone
-            
-            # 이메일 확인
-            elif any(keyword in label.lower() for keyword in EMAIL_KEYWORDS) and '이메일' not in info:
-                if '@' in value:
-                    info['이메일'] = value
-            
-            # 둘 다 찾았으면 조기 종료
-            if len(info) == 2:
-                break
-        
-        return info
+        """텍스트에서 정보 파싱"""
+        return self.field_matcher.parse_text(text)
     
     def _process_container_text(self, text, seller_info):
         """컨테이너 텍스트 처리"""
-        lines = text.split('\n')
-        for line in lines:
-            if ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    label = parts[0].strip()
-                    value = parts[1].strip()
-                    if label and value:
-                        self._process_label_value_pair(label, value, seller_info)
+        before = set(seller_info)
+        self.field_matcher.parse_text(text, seller_info)
+        for key in seller_info.keys() - before:
+            detail(f"   ✅ {key} 저장: {seller_info[key]}")
     
     def _extract_from_full_page(self, seller_info):
         """전체 페이지에서 정보 추출"""
@@ -491,29 +811,23 @@ class BrowserHandler:
             # 페이지 전체 텍스트에서 패턴 검색
             page_text = self.driver.find_element(By.TAG_NAME, 'body').text
             
-            # 전화번호 패턴 검색
-            phone_patterns = [
-                r'(\d{2,3}-\d{3,4}-\d{4})',  # 일반적인 전화번호
-                r'(\d{3}-\d{4}-\d{4})',      # 휴대폰 번호
-                r'(\d{10,11})'               # 연속된 숫자
-            ]
-            
-            for pattern in phone_patterns:
-                matches = re.findall(pattern, page_text)
-                if matches and '전화번호' not in seller_info:
-                    # 가장 그럴듯한 전화번호 선택
-                    for match in matches:
-                        if len(match) >= 10:
-                            seller_info['전화번호'] = match
-                            print(f"   ✅ 패턴으로 전화번호 발견: {match}")
-                            break
+            # 전화번호 패턴 검색 (미리 컴파일된 패턴 사용)
+            for pattern in PHONE_PATTERNS:
+                if '전화번호' in seller_info:
+                    break
+                # 가장 그럴듯한 전화번호 선택
+                for match in pattern.findall(page_text):
+                    if len(match) >= 10:
+                        seller_info['전화번호'] = match
+                        detail(f"   ✅ 패턴으로 전화번호 발견: {match}")
+                        break
             
             # 이메일 패턴 검색
-            email_pattern = r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-            email_matches = re.findall(email_pattern, page_text)
-            if email_matches and '이메일' not in seller_info:
-                seller_info['이메일'] = email_matches[0]
-                print(f"   ✅ 패턴으로 이메일 발견: {email_matches[0]}")
+            if '이메일' not in seller_info:
+                email_match = EMAIL_PATTERN.search(page_text)
+                if email_match:
+                    seller_info['이메일'] = email_match.group(1)
+                    detail(f"   ✅ 패턴으로 이메일 발견: {email_match.group(1)}")
                 
         except Exception as e:
-            print(f"   - 전체 페이지 검색 오류: {e}")
\ No newline at end of file
+            detail(f"   - 전체 페이지 검색 오류: {e}")
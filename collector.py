@@ -5,23 +5,62 @@
 
 import logging
 import time
-import pandas as pd
+from datetime import datetime
 
-from config import EXCEL_FILE_PATH, COLUMNS, INTER_STORE_DELAY, SELLER_INFO_BUTTON_XPATH
+from config import (
+    EXCEL_FILE_PATH, INTER_STORE_DELAY, SELLER_INFO_BUTTON_XPATH,
+    STORE_DEADLINE, BROWSER_RECYCLE_EVERY, BROWSER_RECYCLE_MEMORY_MB, BROWSER_MEMORY_CHECK_EVERY,
+    BROWSER_PROFILE_DIR, SESSION_COOKIES_PATH
+)
 from excel_handler import ExcelHandler
 from browser_handler import BrowserHandler
+from scheduler import parse_policies
+from sharding import get_shard_path, select_shard
+from tasks import build_tasks
+from failures import FailureKind, RetryQueue, classify_exception
+from store_watchdog import StoreWatchdog
+from page_state import PageState
+from live_config import LiveConfig
+from server_mode import load_session_file, session_expiry
+from structured_log import say, detail, set_stage, store_scope, flush as flush_logs
 
 logger = logging.getLogger(__name__)
 
 class NaverSellerInfoCollector:
     """네이버 판매자 정보 수집기"""
     
-    def __init__(self, excel_file_path=None):
+    def __init__(self, excel_file_path=None, scheduling_policies=None, shard=None, pending_only=False,
+                 browser_handler=None, inter_store_delay=None, recorder=None, memory=False, live_config=True,
+                 http_stores=False, browser_mode=None, profile_dir=BROWSER_PROFILE_DIR, captcha_only=False):
         self.excel_file_path = excel_file_path or EXCEL_FILE_PATH
-        self.excel_handler = ExcelHandler(self.excel_file_path)
-        self.browser_handler = BrowserHandler()
+        self.scheduling_policies = scheduling_policies
+        self.pending_only = pending_only
+        # 샤드 모드: (번호, 전체 수) - 해당 샤드만 처리하고 결과 파일에 저장
+        self.shard = shard
+        self.output_path = get_shard_path(self.excel_file_path, *shard) if shard else None
+        self.excel_handler = ExcelHandler(self.excel_file_path, self.output_path)
+        # 서버 모드(headless/xvfb)는 작업자(샤드)마다 프로필 폴더를 따로 사용
+        self.browser_handler = browser_handler or BrowserHandler(
+            mode=browser_mode, profile_dir=profile_dir, worker=shard[0] if shard else None
+        )
+        self.captcha_only = captcha_only    # 캡차 실패 행만 처리 (데스크톱에서 서버 작업자가 남긴 캡차 처리)
+        self.inter_store_delay = INTER_STORE_DELAY if inter_store_delay is None else inter_store_delay
         self.processed_count = 0
         self.total_count = 0
+        self.retry_queue = RetryQueue()
+        self.watchdog = StoreWatchdog(self.browser_handler.kill_driver, STORE_DEADLINE)
+        self.stores_since_restart = 0
+        self.recorder = recorder    # PageRecorder - 처리한 페이지를 코퍼스로 기록 (run --record)
+        self.telemetry = None       # MemoryTelemetry - 메모리 샘플링 (run --memory)
+        self.memory_report = None
+        if memory:
+            from memory_telemetry import MemoryTelemetry
+            self.telemetry = MemoryTelemetry(self.browser_handler, lambda: self.excel_handler.df)
+        # LiveConfig - 선택자/키워드/대기 시간 설정 파일 감시 (스토어마다 확인)
+        self.live_config = LiveConfig() if live_config else None
+        # 네이버 외 스토어를 HTTP 어댑터로 함께 처리 (run --http, storefronts.py)
+        self.http_stores = http_stores
+        self.http_queue = None
     
     def setup(self):
         """초기 설정"""
@@ -41,256 +80,472 @@ class NaverSellerInfoCollector:
     
     def cleanup(self):
         """정리 작업"""
+        if self.http_queue:
+            self.http_queue.shutdown()      # 대기 중인 작업은 취소, 진행 중인 작업은 끝까지
+            self._drain_http_results()
+        self.watchdog.disarm()
         self.browser_handler.close_driver()
     
-    def process_single_store(self, store_info):
-        """단일 스토어 처리 (버튼 유무로 영업 상태 판단)"""
-        try:
-            store_name = store_info[COLUMNS['COMPANY_NAME']]
-            store_url = store_info[COLUMNS['STORE_URL']]
+    def _record_failure(self, task, kind, message, retry=True):
+        """실패 기록 (유형 포함) 및 재시도 대상이면 재시도 큐에 추가 (retry=False면 기록만)"""
+        if self.watchdog.expired:
+            return  # 제한 시간 초과로 인한 연쇄 예외는 process_with_watchdog에서 한 번만 기록
+        self.excel_handler.log_error(task, message, kind)
+        if retry and self.retry_queue.push(task, kind):
+            say(f"🔁 재시도 예약 [{kind}] ({self.retry_queue.attempts[task.row]}/{self.retry_queue.max_attempts})",
+                stage='failed', kind=kind)
+        elif kind == FailureKind.PERMANENT:
+            say(f"🚫 영구 실패 [{kind}] - 다시 시도하지 않음", stage='failed', kind=kind)
+    
+    def _reload_live_config(self):
+        """설정 파일이 바뀌었으면 이번 스토어부터 적용 (잘못된 편집은 LiveConfig가 거부)"""
+        if self.live_config is None:
+            return
+        settings = self.live_config.poll()
+        if settings:
+            self.inter_store_delay = settings['INTER_STORE_DELAY']
+            self.browser_handler.apply_settings(settings)
+    
+    def process_with_watchdog(self, task, is_retry=False):
+        """제한 시간 안에서 스토어 처리 (초과 시 브라우저 재시작 후 재시도 큐로)"""
+        self._reload_live_config()
+        with store_scope(task):
+            self.watchdog.arm()
+            try:
+                success = self.process_single_store(task, is_retry)
+            finally:
+                expired = self.watchdog.disarm()
             
-            # 실제 엑셀 행 번호 찾기
-            original_df = self.excel_handler.get_dataframe()
-            actual_row = None
-            for idx, row in original_df.iterrows():
-                if row[COLUMNS['COMPANY_NAME']] == store_name:
-                    actual_row = idx + 2
-                    break
+            if expired:
+                say(f"⏱️ 처리 제한 시간 초과 ({STORE_DEADLINE}초) - 브라우저 재시작", stage='watchdog')
+                self.browser_handler.restart_driver(graceful=False)
+                self.stores_since_restart = 0
+                self.watchdog.expired = False
+                self._record_failure(task, FailureKind.TIMEOUT, f"처리 제한 시간 초과 ({STORE_DEADLINE}초)")
+                return False
             
-            if actual_row is None:
-                actual_row = "알 수 없음"
+            self.stores_since_restart += 1
+            self._maybe_recycle_browser()
+            if self.telemetry:
+                self.telemetry.maybe_sample(self.processed_count, self.stores_since_restart)
+            return success
+    
+    def _maybe_recycle_browser(self):
+        """N개 처리마다 또는 메모리 임계치 초과 시 브라우저 재시작"""
+        reason = None
+        if BROWSER_RECYCLE_EVERY and self.stores_since_restart >= BROWSER_RECYCLE_EVERY:
+            reason = f"{self.stores_since_restart}개 처리"
+        elif (BROWSER_RECYCLE_MEMORY_MB and BROWSER_MEMORY_CHECK_EVERY
+              and self.stores_since_restart % BROWSER_MEMORY_CHECK_EVERY == 0):
+            memory_mb = self.browser_handler.browser_memory_mb()
+            if memory_mb is not None and memory_mb > BROWSER_RECYCLE_MEMORY_MB:
+                reason = f"메모리 {memory_mb:.0f}MB"
+        
+        if reason:
+            say(f"♻️ 브라우저 재시작 ({reason})")
+            self.browser_handler.restart_driver()
+            self.stores_since_restart = 0
+    
+    def process_single_store(self, task, is_retry=False):
+        """단일 스토어 처리 (버튼 유무로 영업 상태 판단)"""
+        try:
+            store_name = task.name
+            store_url = task.url
             
-            self.processed_count += 1
+            if not is_retry:
+                self.processed_count += 1
             
-            print(f"\n📍 스토어 처리 중: {store_name} ({self.processed_count}/{self.total_count})")
-            print(f"📊 엑셀 행 번호: {actual_row}")
-            print(f"🔗 URL: {store_url}")
+            say(f"\n📍 스토어 처리 중: {store_name} ({self.processed_count}/{self.total_count})",
+                stage='start', url=store_url, excel_row=task.excel_row, retry=is_retry)
+            detail(f"📊 엑셀 행 번호: {task.excel_row}")
+            detail(f"🔗 URL: {store_url}")
             
             # 현재 최신화 상태 확인
-            current_phone = store_info.get(COLUMNS['UPDATED_PHONE'], '')
-            current_email = store_info.get(COLUMNS['UPDATED_EMAIL'], '')
+            current_phone = str(task.current_phone or '').strip()
+            current_email = str(task.current_email or '').strip()
             
             # 이미 영업 종료로 표기된 경우 건너뛰기 (추가 보안)
-            if (pd.notna(current_phone) and str(current_phone).strip().startswith('영업종료')):
-                print(f"⏭️ 이미 영업종료로 표기됨 - 건너뜀")
+            if current_phone.startswith('영업종료'):
+                say(f"⏭️ 이미 영업종료로 표기됨 - 건너뜀")
                 return True
             
             # 둘 다 이미 있고 ERROR가 아닌 경우 건너뛰기 (추가 보안)
-            if (pd.notna(current_phone) and pd.notna(current_email) and 
-                str(current_phone).strip() != '' and str(current_email).strip() != '' and
-                not str(current_phone).strip().startswith('ERROR') and
-                not str(current_phone).strip().startswith('영업종료')):
-                print(f"⏭️ 이미 최신화 완료됨 - 건너뜀")
+            if current_phone and current_email and not current_phone.startswith('ERROR'):
+                say(f"⏭️ 이미 최신화 완료됨 - 건너뜀")
                 return True
             
             # 스토어 페이지 접속
             accessible, access_msg = self.browser_handler.check_page_accessibility(store_url)
             if not accessible:
-                print(f"❌ {access_msg}")
-                # 접속 실패도 실시간 저장
-                self.excel_handler.log_error(store_info, access_msg)
+                say(f"❌ {access_msg}")
+                # 접속 실패도 실시간 저장 (원인별 분류)
+                last_error = self.browser_handler.last_error
+                kind = classify_exception(last_error) if last_error else FailureKind.UNKNOWN
+                self._record_failure(task, kind, access_msg)
                 return False
             
-            # 판매자 정보 버튼 찾기 (1회만 시도)
-            if not self.browser_handler.find_seller_info_button():
-                print(f"❌ 영업 종료로 판단됨")
+            # 판매자 정보 버튼 찾기 (접속 시 프로브 판정 그대로 사용, 1회만 시도)
+            if not self.browser_handler.find_seller_info_button(self.browser_handler.page_state):
+                state = self.browser_handler.page_state.state
+                if state == PageState.CAPTCHA:
+                    # 서버 모드는 알림 1회 후 재시도 큐에 넣지 않음 (데스크톱 run --captcha-only로 처리)
+                    server_mode = self.browser_handler.server_mode
+                    if server_mode:
+                        self.browser_handler.captcha_handoff.notify(
+                            self.browser_handler.driver, task, "스토어 페이지 캡차"
+                        )
+                    self._record_failure(task, FailureKind.CAPTCHA_ABANDONED, "스토어 페이지에 캡차 표시",
+                                         retry=not server_mode)
+                    return False
+                if state == PageState.LOADING:
+                    self._record_failure(task, FailureKind.TIMEOUT, "페이지 로드 시간 초과")
+                    return False
+                
+                say(f"❌ 영업 종료로 판단됨", stage='closed')
+                self._record_page(task, closed=True)
                 # 영업 종료 실시간 표기 및 저장
-                if self.excel_handler.mark_as_closed(store_info):
-                    print(f"💾 영업종료 실시간 저장 완료")
+                if self.excel_handler.mark_as_closed(task):
+                    say(f"💾 영업종료 실시간 저장 완료")
                 else:
-                    print(f"❌ 영업종료 저장 실패")
+                    say(f"❌ 영업종료 저장 실패")
                 return True  # 정상적인 건너뛰기로 처리
             
             # 캡차 처리 및 정보 추출
-            return self._handle_captcha_and_extract_info(store_info)
+            return self._handle_captcha_and_extract_info(task)
             
         except Exception as e:
             logger.error(f"스토어 처리 실패: {e}")
-            self.excel_handler.log_error(store_info, f"처리 실패: {str(e)}")
+            self._record_failure(task, classify_exception(e), f"처리 실패: {str(e)}")
             return False
     
-    def _handle_captcha_and_extract_info(self, store_info, max_retries=3):
+    def _handle_captcha_and_extract_info(self, task, max_retries=3):
         """캡차 처리 및 정보 추출 (최적화)"""
         for attempt in range(max_retries):
             try:
-                print(f"\n🔄 캡차 처리 시도 {attempt + 1}/{max_retries}")
+                say(f"\n🔄 캡차 처리 시도 {attempt + 1}/{max_retries}", stage='captcha')
                 
-                # 잠시 대기 후 창 변화로 캡차 감지
-                time.sleep(1)
-                
-                # 창 변화로 캡차 확인
+                # 창 변화로 캡차 확인 (최대 1초, 이벤트 감시 중이면 새 탭이 열리는 즉시)
                 has_captcha = self.browser_handler.detect_captcha_by_window_change()
                 
                 if not has_captcha:
-                    print("✅ 캡차 없음 - 바로 정보 추출")
-                    return self._extract_and_save_info(store_info)
+                    say("✅ 캡차 없음 - 바로 정보 추출")
+                    return self._extract_and_save_info(task)
                 
-                print("🔍 캡차 감지됨")
+                say("🔍 캡차 감지됨")
                 
-                # 사용자 입력 대기 (자동 감지 포함)
-                result = self.browser_handler.wait_for_captcha_completion()
+                # 사용자 입력 대기 (자동 감지 포함), 서버 모드는 스크린샷/웹훅 알림 후 정해진 시간만 대기
+                if self.browser_handler.server_mode:
+                    result = self.browser_handler.hand_off_captcha(task)
+                else:
+                    result = self.browser_handler.wait_for_captcha_completion()
                 
                 if result == "skip":
-                    print("⏭️ 사용자 요청으로 건너뜀")
+                    say("⏭️ 사용자 요청으로 건너뜀")
+                    self._record_failure(task, FailureKind.CAPTCHA_ABANDONED, "캡차 건너뜀")
                     return False
                 
                 elif result == "timeout":
-                    print("⏰ 캡차 대기 시간 초과 - 건너뜀")
+                    say("⏰ 캡차 대기 시간 초과 - 건너뜀")
+                    self._record_failure(task, FailureKind.CAPTCHA_ABANDONED, "캡차 대기 시간 초과")
+                    return False
+                
+                elif result == "handed_off":
+                    say("📨 캡차 알림 후 미해결 - 데스크톱 처리 대상으로 남김")
+                    self.browser_handler.close_captcha_page()
+                    self._record_failure(task, FailureKind.CAPTCHA_ABANDONED, "서버 모드 캡차 - 데스크톱에서 처리 필요",
+                                         retry=False)
                     return False
                 
                 elif result == "auto_retry":
-                    print("🔄 캡차 창 수동 종료 감지 - 자동으로 버튼 재클릭")
+                    say("🔄 캡차 창 수동 종료 감지 - 자동으로 버튼 재클릭")
                     # 메인 창으로 포커스 이동
                     self.browser_handler.driver.switch_to.window(self.browser_handler.main_window)
                     time.sleep(0.5)
                     
                     # 다시 버튼 클릭
                     if self.browser_handler.find_seller_info_button():
-                        print("✅ 자동 버튼 재클릭 완료")
+                        say("✅ 자동 버튼 재클릭 완료")
                         continue  # 다음 시도로
                     else:
-                        print("❌ 자동 재시도 버튼 클릭 실패")
+                        say("❌ 자동 재시도 버튼 클릭 실패")
                         return False
                     
                 elif result == "reload":
-                    print("🔄 캡차 탭 닫고 다시 시도")
+                    say("🔄 캡차 탭 닫고 다시 시도")
                     
                     # 캡차 페이지 닫기
                     if self.browser_handler.close_captcha_page():
-                        print("✅ 캡차 탭 닫기 완료")
+                        say("✅ 캡차 탭 닫기 완료")
                         time.sleep(0.5)
                         
                         # 다시 버튼 클릭
-                        print("🔄 판매자 정보 버튼 다시 클릭...")
+                        say("🔄 판매자 정보 버튼 다시 클릭...")
                         if self.browser_handler.find_seller_info_button():
-                            print("✅ 버튼 재클릭 완료")
+                            say("✅ 버튼 재클릭 완료")
                             continue  # 다음 시도로
                         else:
-                            print("❌ 재시도 버튼 클릭 실패")
+                            say("❌ 재시도 버튼 클릭 실패")
                             return False
                     else:
-                        print("❌ 캡차 탭 닫기 실패")
+                        say("❌ 캡차 탭 닫기 실패")
                         return False
                         
                 elif result == "success":
-                    print("✅ 캡차 완료 - 정보 추출 시도")
+                    say("✅ 캡차 완료 - 정보 추출 시도")
                     time.sleep(1)
                     
                     # 정보 추출 시도
-                    return self._extract_and_save_info(store_info)
+                    return self._extract_and_save_info(task)
                 
             except Exception as e:
-                print(f"❌ 캡차 처리 시도 {attempt + 1} 실패: {e}")
+                say(f"❌ 캡차 처리 시도 {attempt + 1} 실패: {e}")
                 if attempt < max_retries - 1:
-                    print("🔄 다음 시도 준비...")
+                    say("🔄 다음 시도 준비...")
                     time.sleep(1)
                     continue
                 else:
-                    print("❌ 모든 캡차 처리 시도 실패")
+                    say("❌ 모든 캡차 처리 시도 실패")
+                    self._record_failure(task, classify_exception(e), f"캡차 처리 실패: {e}")
                     return False
         
-        print("❌ 최대 재시도 횟수 초과")
+        say("❌ 최대 재시도 횟수 초과")
+        self._record_failure(task, FailureKind.CAPTCHA_ABANDONED, "캡차 최대 재시도 횟수 초과")
         return False
     
-    def _extract_and_save_info(self, store_info):
+    def _extract_and_save_info(self, task):
         """정보 추출 및 실시간 저장"""
         try:
-            print("📋 판매자 정보 추출 중...")
+            say("📋 판매자 정보 추출 중...", stage='extract')
             
             # 판매자 정보 추출
             seller_info = self.browser_handler.extract_seller_info()
+            self._record_page(task, seller_info)
             
             if seller_info:
-                print(f"✅ 정보 추출 완료:")
+                say(f"✅ 정보 추출 완료:", found=len(seller_info))
                 for key, value in seller_info.items():
-                    print(f"   {key}: {value}")
+                    say(f"   {key}: {value}")
                 
                 # 실시간 엑셀 업데이트 및 저장
-                if self.excel_handler.update_seller_info(store_info, seller_info):
-                    print(f"💾 실시간 CSV 저장 완료")
+                set_stage('save')
+                if self.excel_handler.update_seller_info(task, seller_info):
+                    say(f"💾 실시간 CSV 저장 완료")
                     return True
                 else:
-                    print(f"⚠️ 실시간 저장 실패")
+                    say(f"⚠️ 실시간 저장 실패")
                     return False
             else:
-                print(f"❌ 정보 추출 실패")
-                # 에러도 실시간 저장
-                self.excel_handler.log_error(store_info, "정보 추출 실패")
+                say(f"❌ 정보 추출 실패")
+                # 에러도 실시간 저장 (정보 영역을 못 찾음 → 선택자 문제)
+                self._record_failure(task, FailureKind.SELECTOR_MISSING, "정보 추출 실패")
                 return False
                 
         except Exception as e:
             logger.error(f"정보 추출 및 저장 실패: {e}")
-            print(f"❌ 정보 추출 및 저장 중 오류: {e}")
+            say(f"❌ 정보 추출 및 저장 중 오류: {e}")
             # 에러도 실시간 저장
-            self.excel_handler.log_error(store_info, f"처리 오류: {str(e)}")
+            self._record_failure(task, classify_exception(e), f"처리 오류: {str(e)}")
             return False
     
+    def _record_page(self, task, seller_info=None, closed=False):
+        """기록 모드면 현재 페이지(팝업 포함)와 추출 결과를 코퍼스에 저장"""
+        if not self.recorder:
+            return
+        try:
+            html = self.browser_handler.driver.page_source
+        except Exception as e:
+            logger.warning(f"페이지 HTML 가져오기 실패: {e}")
+            return
+        if self.recorder.record(task, html, seller_info, closed):
+            say(f"🎞️ 페이지 기록 완료 ({self.recorder.recorded_count}개)")
+    
+    def _drain_retry_queue(self):
+        """재시도 큐가 빌 때까지 처리 (실패하면 백오프 후 다시 큐에 들어감)"""
+        if not len(self.retry_queue):
+            return 0
+        
+        say(f"\n🔁 재시도 대기 중인 스토어 {len(self.retry_queue)}개 처리")
+        success_count = 0
+        
+        while len(self.retry_queue):
+            try:
+                task, kind, attempt = self.retry_queue.pop()
+                say(f"\n🔁 재시도 [{kind}] {attempt}/{self.retry_queue.max_attempts}: {task.name}", kind=kind)
+                if self.process_with_watchdog(task, is_retry=True):
+                    success_count += 1
+                self._drain_http_results()
+                time.sleep(self.inter_store_delay)
+            except KeyboardInterrupt:
+                say("\n⏹️ 사용자에 의해 재시도 중단됨")
+                break
+            except Exception as e:
+                logger.error(f"재시도 처리 중 오류: {e}")
+                continue
+        
+        return success_count
+    
+    def _start_http_stores(self):
+        """네이버 외 스토어를 HTTP 작업 스레드에 넣기 (브라우저 처리와 동시에 진행) → 작업 수"""
+        from storefronts import ADAPTERS, HttpStoreQueue, http_tasks
+        
+        stores = self.excel_handler.filter_http_stores(list(ADAPTERS), self.pending_only)
+        if self.shard:
+            stores = select_shard(stores, *self.shard)
+        pairs = http_tasks(self.excel_handler.df, build_tasks(stores))
+        if not pairs:
+            return 0
+        
+        self.http_queue = HttpStoreQueue()
+        for task, adapter in pairs:
+            self.http_queue.submit(task, adapter)
+        say(f"🌐 HTTP 어댑터로 {len(pairs)}개 스토어 동시 처리 시작")
+        return len(pairs)
+    
+    def _drain_http_results(self, timeout=0):
+        """끝난 HTTP 결과를 CSV에 반영 (메인 스레드, 모아서 한 번 저장)"""
+        if not self.http_queue:
+            return
+        from storefronts import apply_http_result
+        
+        with self.excel_handler.batch():
+            self.http_queue.drain(lambda result: apply_http_result(self.excel_handler, result), timeout)
+    
+    def _finish_http_stores(self):
+        """남은 HTTP 작업이 끝날 때까지 결과 반영"""
+        if not self.http_queue:
+            return
+        if self.http_queue.pending:
+            say(f"🌐 HTTP 어댑터 남은 작업 {self.http_queue.pending}개 대기")
+        while self.http_queue.pending:
+            self._drain_http_results(timeout=1)
+        stats = self.http_queue.stats
+        say(f"🌐 HTTP 어댑터: {stats['done']}개 처리 (성공 {stats['success']} / 실패 {stats['failed']})")
+    
+    def login(self):
+        """네이버 로그인 (사용자가 브라우저에서 직접 로그인, 서버 모드는 저장된 쿠키 파일)"""
+        if self.browser_handler.server_mode:
+            self._restore_login_session()
+            return
+        
+        say("🔑 네이버 로그인 페이지로 이동합니다...")
+        self.browser_handler.navigate_to_url("https://nid.naver.com/nidlogin.login")
+        say("브라우저에서 네이버에 로그인해주세요.")
+        flush_logs()
+        input("로그인 완료 후 Enter를 눌러주세요...")
+        
+        # 브라우저 재시작 시 복원할 로그인 세션 저장
+        self.browser_handler.save_session()
+    
+    def _restore_login_session(self, path=SESSION_COOKIES_PATH):
+        """서버 모드 로그인 - python main.py login으로 저장한 쿠키 적용 (콘솔 입력 없음)"""
+        cookies = load_session_file(path)
+        logged_in, expires = session_expiry(cookies)
+        if not logged_in:
+            logger.warning(f"로그인 쿠키 없음 ({path}) - 프로필 폴더의 로그인 상태로 진행 "
+                           f"(데스크톱에서 python main.py login으로 저장)")
+            return
+        if expires and expires < datetime.now():
+            logger.warning(f"로그인 쿠키 만료 ({expires:%Y-%m-%d %H:%M}) - 데스크톱에서 python main.py login으로 다시 저장하세요")
+        
+        self.browser_handler.session_cookies = cookies
+        self.browser_handler.restore_session()
+        say(f"🔑 저장된 로그인 쿠키 적용 ({path})")
+    
     def run(self):
         """메인 실행 함수"""
         try:
-            print("🚀 네이버 판매자 정보 수집 시작")
-            print("📋 처리 방식: 아래에서 위로 (역순)")
-            print("⏭️ 이미 최신화된 항목은 자동 건너뜀")
-            print("🚫 영업종료 표기된 항목은 자동 제외")
-            print("✅ 이미 최신화된 항목도 자동 제외")
-            print("🔑 네이버 로그인이 필요합니다!")
-            print("🎯 최적화된 캡차 처리 시스템 적용")
-            print("🆕 판매자 정보 버튼 유무로 영업 상태 판단")
-            print("🤖 캡차 자동 완료 감지 시스템 적용")
-            print("🔄 캡차 창 수동 종료 시 자동 재시도")
-            print("⚡ 정보 추출 성능 최적화 적용")
-            print("💾 실시간 CSV 저장 시스템 적용")
-            print("="*60)
+            say("🚀 네이버 판매자 정보 수집 시작")
+            say(f"📋 처리 순서 정책: {' > '.join(parse_policies(self.scheduling_policies))}")
+            say("⏭️ 이미 최신화된 항목은 자동 건너뜀")
+            say("🚫 영업종료 표기된 항목은 자동 제외")
+            say("✅ 이미 최신화된 항목도 자동 제외")
+            say("🔑 네이버 로그인이 필요합니다!")
+            say("🎯 최적화된 캡차 처리 시스템 적용")
+            say("🆕 판매자 정보 버튼 유무로 영업 상태 판단")
+            say("🤖 캡차 자동 완료 감지 시스템 적용")
+            say("🔄 캡차 창 수동 종료 시 자동 재시도")
+            say("⚡ 정보 추출 성능 최적화 적용")
+            say("💾 실시간 CSV 저장 시스템 적용")
+            say("="*60)
             
             # 1. 초기 설정
             if not self.setup():
-                print("❌ 초기 설정 실패")
+                say("❌ 초기 설정 실패")
                 return
             
             # 2. 네이버 스토어 필터링
-            naver_stores, self.total_count = self.excel_handler.filter_naver_stores()
+            naver_stores, self.total_count = self.excel_handler.filter_naver_stores(
+                self.scheduling_policies, self.pending_only, self.captcha_only
+            )
+            
+            # 샤드 모드: 고유번호 기준으로 이 노드의 몫만 선택
+            if self.shard:
+                naver_stores = select_shard(naver_stores, *self.shard)
+                self.total_count = len(naver_stores)
+                say(f"🔀 샤드 {self.shard[0]}/{self.shard[1]}: {self.total_count}개 처리 (결과: {self.output_path})")
+            
+            if self.http_stores:
+                self._start_http_stores()
             
             if self.total_count == 0:
-                print("❌ 처리할 네이버 스토어가 없습니다.")
+                say("❌ 처리할 네이버 스토어가 없습니다.")
+                self._finish_http_stores()
                 return
             
-            # 3. 네이버 로그인 페이지로 이동
-            print("🔑 네이버 로그인 페이지로 이동합니다...")
-            self.browser_handler.navigate_to_url("https://nid.naver.com/nidlogin.login")
-            print("브라우저에서 네이버에 로그인해주세요.")
-            input("로그인 완료 후 Enter를 눌러주세요...")
+            # 작업 레코드로 한 번에 변환 (DataFrame은 저장 시에만 사용)
+            tasks = build_tasks(naver_stores)
+            del naver_stores
+            
+            # 3. 네이버 로그인
+            self.login()
+            
+            if self.telemetry:
+                self.telemetry.start()
             
             # 4. 각 스토어 처리
             success_count = 0
+            interrupted = False
             
-            for _, store_info in naver_stores.iterrows():
+            for task in tasks:
                 try:
-                    if self.process_single_store(store_info):
+                    if self.process_with_watchdog(task):
                         success_count += 1
+                    self._drain_http_results()
                     
                     # 잠시 대기 (서버 부하 방지)
-                    time.sleep(INTER_STORE_DELAY)
+                    time.sleep(self.inter_store_delay)
                     
                 except KeyboardInterrupt:
-                    print("\n⏹️ 사용자에 의해 중단됨")
+                    say("\n⏹️ 사용자에 의해 중단됨")
+                    interrupted = True
                     break
                 except Exception as e:
                     logger.error(f"스토어 처리 중 오류: {e}")
                     continue
             
-            # 5. 최종 결과 요약
+            # 5. 재시도 큐 처리 (일시적 실패만, 지수 백오프)
+            if not interrupted:
+                success_count += self._drain_retry_queue()
+                self._finish_http_stores()
+            
+            if self.telemetry:
+                self.memory_report = self.telemetry.report(self.processed_count, self.stores_since_restart)
+            
+            # 6. 최종 결과 요약
             failed_count = self.processed_count - success_count
-            print("\n" + "="*60)
-            print("📊 작업 완료 요약")
-            print(f"총 스토어 수: {self.total_count}")
-            print(f"처리 완료: {self.processed_count}")
-            print(f"성공: {success_count}")
-            print(f"실패: {failed_count}")
+            say("\n" + "="*60)
+            say("📊 작업 완료 요약")
+            say(f"총 스토어 수: {self.total_count}")
+            say(f"처리 완료: {self.processed_count}")
+            say(f"성공: {success_count}")
+            say(f"실패: {failed_count}")
             if failed_count > 0:
-                print(f"⚠️ 실패한 스토어들은 엑셀에 에러 메시지가 기록되었습니다.")
-            print(f"📝 모든 변경사항이 실시간으로 저장되어 중단되어도 데이터가 보존됩니다.")
-            print(f"최종 파일: {self.excel_file_path}")
-            print("="*60)
+                say(f"⚠️ 실패한 스토어들은 엑셀에 에러 메시지가 기록되었습니다.")
+            say(f"📝 모든 변경사항이 실시간으로 저장되어 중단되어도 데이터가 보존됩니다.")
+            say(f"최종 파일: {self.output_path or self.excel_file_path}")
+            if self.recorder:
+                say(f"기록된 페이지: {self.recorder.recorded_count}개 ({self.recorder.corpus_dir})")
+            say("="*60)
             
         except Exception as e:
             logger.error(f"실행 중 오류: {e}")
@@ -11,10 +11,67 @@ BROWSER_WAIT_TIME = 10
 PAGE_LOAD_DELAY = 2
 BUTTON_CLICK_DELAY = 1
 INTER_STORE_DELAY = 2
+NAVIGATION_DELAY = 1   # 페이지 이동 후 대기
+
+# 서버(무인) 실행 설정 (server_mode.py 참고, run --browser-mode로 지정 가능)
+# desktop: 화면에 Chrome 창 / headless: 창 없는 Chrome / xvfb: 가상 디스플레이(Xvfb)의 일반 Chrome
+BROWSER_MODE = 'desktop'
+BROWSER_WINDOW_SIZE = (1920, 1080)  # 서버 모드 창(가상 화면) 크기
+BROWSER_PROFILE_DIR = None          # Chrome 사용자 데이터 폴더 ({worker}는 작업자 번호, None이면 매번 임시 프로필)
+SESSION_COOKIES_PATH = "naver_session.json"   # python main.py login으로 저장한 로그인 쿠키 (서버 모드에서 불러옴)
+CAPTCHA_HANDOFF_DIR = "captcha_handoff"       # 서버 모드 캡차 스크린샷 저장 위치
+CAPTCHA_HANDOFF_WEBHOOK = None      # 캡차 발생 시 JSON을 POST할 주소 (Slack/Discord 웹훅 등, None이면 알림 없음)
+CAPTCHA_HANDOFF_WAIT = 0            # 알림 후 원격 해결(VNC 등)을 기다리는 시간 (초, 0이면 바로 captcha 실패로 기록)
+
+# 장시간 실행 안정화 설정 (store_watchdog.py 참고)
+STORE_DEADLINE = 300                # 스토어 1건 처리 제한 시간 (초) - 초과 시 브라우저 재시작 후 재시도
+BROWSER_RECYCLE_EVERY = 300         # N개 스토어마다 브라우저 재시작 (0이면 사용 안 함)
+BROWSER_RECYCLE_MEMORY_MB = 3000    # Chrome 프로세스 메모리 합계가 넘으면 재시작 (psutil 필요, 0이면 사용 안 함)
+BROWSER_MEMORY_CHECK_EVERY = 10     # 메모리 확인 주기 (스토어 수)
+
+# 영업 상태 일괄 확인 설정 (liveness_sweep.py 참고, python main.py sweep)
+SWEEP_TABS = 8                      # 동시에 여는 탭 수
+SWEEP_LOAD_TIMEOUT = 20             # 탭 하나의 로드 제한 시간 (초) - 넘으면 판정 보류 (기록 안 함)
+SWEEP_SAVE_EVERY = 100              # 영업종료 N건마다 CSV 저장
+
+# 메모리 추적 설정 (memory_telemetry.py 참고, run --memory로 사용)
+MEMORY_SAMPLE_EVERY = 25            # N개 스토어마다 Python/Chrome 메모리 샘플
+MEMORY_TRACE_FRAMES = 1             # tracemalloc 할당 위치 프레임 수 (0이면 힙 추적 안 함 - 오버헤드 없음)
+MEMORY_TOP_SITES = 10               # 실행 종료 시 보고할 할당 위치 수
+MEMORY_GROWTH_WARN_MB = 50          # 100개 스토어당 이만큼 늘면 증가 추세 경고
+MEMORY_TREND_MIN_SAMPLES = 4        # 추세 계산에 필요한 최소 샘플 수
+MEMORY_LOG_PATH = "memory_telemetry.csv"   # 샘플 기록 (None이면 기록 안 함)
+
+# 연락처 변경 이력 설정 (history.py 참고)
+HISTORY_ENABLED = True              # 수집 중 값이 바뀐 스토어를 이력 DB에 추가
+HISTORY_DB_NAME = "contact_history.sqlite3"   # 대상 CSV와 같은 폴더에 생성
+
+# 페이지 기록/재생 설정 (page_corpus.py 참고)
+PAGE_CORPUS_DIR = "page_corpus"     # run --record 저장 위치 / replay 기본 대상
+REPLAY_WORKERS = None               # 재생 작업 프로세스 수 (None이면 CPU 코어 수)
 
 # 캡차 관련 설정
 CAPTCHA_MAX_RETRIES = 3
 CAPTCHA_DETECTION_DELAY = 2
+CAPTCHA_EVENT_MODE = True  # DevTools 타깃 이벤트로 캡차 탭 감지 (False면 창 핸들 폴링)
+
+# 실패 재시도 설정 (failures.py 참고)
+RETRY_MAX_ATTEMPTS = 3      # 한 실행 안에서 스토어당 최대 재시도 횟수
+RETRY_BASE_DELAY = 10       # 첫 재시도 대기 (초), 이후 2배씩 증가
+RETRY_MAX_DELAY = 120       # 재시도 대기 상한 (초)
+
+# 페이지 상태 판정 설정 (page_state.py 참고)
+PAGE_STATE_BUTTON_WAIT = BROWSER_WAIT_TIME  # 로드가 끝난 뒤 판매자 정보 버튼을 기다리는 시간 (초) - 없으면 영업 종료 (sweep도 사용)
+PAGE_STATE_LOAD_TIMEOUT = 5         # 문서 로드가 끝나길 기다리는 최대 시간 (초) - 넘으면 timeout 오류로 재시도
+PAGE_STATE_POLL_INTERVAL = 0.1      # 판정이 확정될 때까지 프로브 반복 간격 (초)
+
+# 존재하지 않는 페이지(404) 판단 문구 (페이지 제목/본문 앞부분에서 검색)
+NOT_FOUND_MARKERS = [
+    '페이지를 찾을 수 없습니다',
+    '존재하지 않는 스토어',
+    '운영중이지 않은 스토어',
+    '404 Not Found'
+]
 
 # 캡차 관련 선택자 (HTML 분석 결과 반영)
 CAPTCHA_SELECTORS = [
@@ -65,6 +122,18 @@ SELLER_INFO_SELECTORS = {
         '.value'
     ]
 }
+SELLER_INFO_MAX_CONTAINERS = 10  # 선택자마다 확인할 최대 컨테이너 수 (팝업 행 수보다 넉넉하게, 넘으면 다음 선택자로 나머지 필드 보완)
+
+# 실행 중 다시 불러오는 설정 파일 (live_config.py 참고)
+# - 선택자/키워드/대기 시간만 덮어씀 (없으면 이 파일의 값 사용, None이면 감시 안 함)
+LIVE_CONFIG_PATH = "live_config.json"
+
+# 선택자 적중률 설정 (selector_stats.py 참고)
+SELECTOR_STATS_PATH = "selector_stats.json"   # 실행 간 유지되는 적중률 기록 (None이면 저장 안 함)
+SELECTOR_STATS_DECAY = 0.98                   # 기록할 때마다 이전 관측에 곱하는 감쇠 (최근 결과 우선)
+SELECTOR_STATS_SAVE_EVERY = 50                # N번 기록마다 파일 저장
+SELECTOR_TRUSTED_RATE = 0.6                   # 적중률이 이 이상이었던 선택자가 밀려나면 경고
+SELECTOR_TRUSTED_MIN_ATTEMPTS = 20            # 적중률 최고치 기록에 필요한 최소 (감쇠) 시도 수
 
 # 전화번호 관련 키워드
 PHONE_KEYWORDS = [
@@ -78,18 +147,214 @@ EMAIL_KEYWORDS = [
     '이메일', '메일', '전자메일'
 ]
 
+# 판매자 정보 필드 추출 규칙 (라벨 키워드 → 결과 키 / 저장 컬럼 / 정규화 방식)
+# - 위에 있는 규칙이 우선 (예: '이메일 주소'는 주소가 아닌 이메일로 처리)
+# - 모든 규칙은 시작 시 하나의 정규식으로 컴파일되어 라벨당 1회만 매칭
+# - normalizer: 'phone' | 'email' | 'business_number' | 'text'
+FIELD_RULES = [
+    {
+        'field': '전화번호',
+        'column': '최신화 전화번호',
+        'keywords': PHONE_KEYWORDS,
+        'normalizer': 'phone',
+        'ignore_case': False
+    },
+    {
+        'field': '이메일',
+        'column': '최신화 이메일',
+        'keywords': EMAIL_KEYWORDS,
+        'normalizer': 'email',
+        'ignore_case': True
+    },
+    {
+        'field': '사업자번호',
+        'column': '최신화 사업자번호',
+        'keywords': ['사업자등록번호', '사업자번호'],
+        'normalizer': 'business_number',
+        'ignore_case': False
+    },
+    {
+        'field': '상호명',
+        'column': '최신화 상호명',
+        'keywords': ['상호명', '상호'],
+        'normalizer': 'text',
+        'ignore_case': False
+    },
+    {
+        'field': '대표자명',
+        'column': '최신화 대표자명',
+        'keywords': ['대표자명', '대표자', '대표'],
+        'normalizer': 'text',
+        'ignore_case': False
+    },
+    {
+        'field': '주소',
+        'column': '최신화 주소',
+        'keywords': ['사업장 소재지', '사업장소재지', '소재지', '주소'],
+        'normalizer': 'text',
+        'ignore_case': False
+    }
+]
+
+# 네트워크 응답 기반 추출 설정 (network_capture.py 참고)
+# - 판매자 정보 버튼 클릭 후 팝업을 채우는 JSON 응답을 성능 로그에서 찾아 바로 파싱
+# - 응답에서 못 찾은 필드는 기존 DOM 추출로 채움
+# - 응답 형식이 확인된 뒤 켜서 사용 (기본은 DOM 추출만)
+NETWORK_CAPTURE_MODE = False
+NETWORK_CAPTURE_TIMEOUT = 3         # 클릭 후 응답 대기 최대 시간 (초)
+NETWORK_CAPTURE_MAX_MISSES = 5      # 연속 N개 스토어에서 응답을 못 찾으면 DOM 추출만 사용
+SELLER_INFO_RESPONSE_PATTERNS = [   # 판매자 정보 응답 URL 정규식 (대소문자 무시)
+    r'seller',
+    r'business',
+    r'/channels?/'
+]
+
+# JSON 응답의 마지막 키 → 필드 규칙 (FIELD_RULES와 같은 형식, 위에 있는 규칙 우선)
+# - 키 이름 전체가 같을 때만 매칭 ('exact') - 'representativeImage', 'telecomCarrier' 등이 잡히지 않도록
+# - 전화번호는 국내 번호 체계에 맞는 값만 사용 ('verified_phone')
+NETWORK_FIELD_RULES = [
+    {
+        'field': '이메일',
+        'column': '최신화 이메일',
+        'keywords': ['email', 'emailAddress', 'sellerEmail', 'representativeEmail'],
+        'normalizer': 'email',
+        'ignore_case': True,
+        'exact': True
+    },
+    {
+        'field': '전화번호',
+        'column': '최신화 전화번호',
+        'keywords': ['telNo', 'telephoneNo', 'telephoneNumber', 'phoneNo', 'phoneNumber', 'contactNumber',
+                     'representativeTelNo', 'customerServiceTelNo', 'csTelNo'],
+        'normalizer': 'verified_phone',
+        'ignore_case': True,
+        'exact': True
+    },
+    {
+        'field': '사업자번호',
+        'column': '최신화 사업자번호',
+        'keywords': ['businessRegistrationNumber', 'businessRegistrationNo', 'businessNumber', 'businessNo',
+                     'bizNo', 'bizRegNo'],
+        'normalizer': 'business_number',
+        'ignore_case': True,
+        'exact': True
+    },
+    {
+        'field': '대표자명',
+        'column': '최신화 대표자명',
+        'keywords': ['representativeName', 'representName', 'ceoName'],
+        'normalizer': 'text',
+        'ignore_case': True,
+        'exact': True
+    },
+    {
+        'field': '상호명',
+        'column': '최신화 상호명',
+        'keywords': ['businessName', 'companyName', 'tradeName', 'corporationName'],
+        'normalizer': 'text',
+        'ignore_case': True,
+        'exact': True
+    },
+    {
+        'field': '주소',
+        'column': '최신화 주소',
+        'keywords': ['businessAddress', 'fullAddress', 'roadAddress', 'address'],
+        'normalizer': 'text',
+        'ignore_case': True,
+        'exact': True
+    }
+]
+
 # 로깅 설정
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 LOG_LEVEL = 'INFO'
+LOG_JSON_PATH = None         # JSON lines 로그 파일 (None이면 기록 안 함, --log-json으로 지정 가능)
 
 # 엑셀 컬럼명
 COLUMNS = {
+    'STORE_KEY': '고유번호',
     'COMPANY_NAME': '입점사명',
     'STORE_URL': '온라인 쇼핑몰 URL',
+    'ORIGINAL_PHONE': '전화번호',
+    'ORIGINAL_EMAIL': '이메일주소',
     'UPDATED_PHONE': '최신화 전화번호',
-    'UPDATED_EMAIL': '최신화 이메일'
+    'UPDATED_EMAIL': '최신화 이메일',
+    'UPDATED_AT': '최신화 일시',
+    'PENDING_REASON': '최신화 대기',
+    'STATUS': '상태',
+    'GRADE': '등급',
+    'REGISTERED_AT': '등록일'
+}
+
+# 처리 순서 정책 (scheduler.py 참고, 앞에 있는 정책이 우선)
+# - 'bottom_up': 아래에서 위로 (기존 방식)
+# - 'oldest_verified': 최신화한 지 오래된 항목 먼저 (미확인 항목 최우선)
+# - 'active_grade': 상태 Y / 높은 등급 먼저
+# - 'recent_registered': 최근 등록된 입점사 먼저
+# - 'errors_last': 이전에 에러가 난 항목은 나중에
+SCHEDULING_POLICIES = ['bottom_up']
+
+# 신규 export 가져오기 시 최신화 대기 사유
+PENDING_REASONS = {
+    'NEW': '신규',
+    'URL_CHANGED': 'URL 변경'
+}
+
+# 등급 우선순위 (높을수록 먼저)
+GRADE_PRIORITY = {
+    'diamond': 5,
+    'platinum': 4,
+    'gold': 3,
+    'silver': 2,
+    'bronze': 1
 }
 
+# 분산 처리(샤드) 설정
+SHARD_SUFFIX = "_shard{index}of{count}"  # 결과 파일명: <원본>_shard1of4.csv
+
+# 연락처 변경 리포트 설정
+REPORT_SUFFIX = "_report"  # 결과 파일명: <원본>_report.csv
+REPORT_CATEGORIES = {
+    'CHANGED': '변경',
+    'UNCHANGED': '동일',
+    'CLOSED': '영업종료',
+    'ERROR': '오류',
+    'PENDING': '미처리'
+}
+
+# 진행 현황(status) 구분 - 수집기 필터와 같은 기준
+STATUS_CATEGORIES = {
+    'PENDING': '미처리',
+    'DONE': '완료',
+    'CLOSED': '영업종료',
+    'ERROR': '오류',
+    'PERMANENT': '영구 실패'
+}
+
+# 쇼핑몰 URL → 플랫폼 구분 (위에서부터 먼저 일치하는 항목, 없으면 '기타')
+PLATFORM_PATTERNS = [
+    ('스마트스토어', r'smartstore.naver.com'),      # 수집기 필터와 같은 패턴 ('naver,com' 같은 오타 URL 포함)
+    ('네이버 기타', r'naver\.(?:com|me)'),
+    ('쿠팡', r'coupang\.com'),
+    ('에이블리', r'a-bly\.com'),
+    ('카카오', r'kakao\.com'),
+    ('인스타그램', r'instagram\.com'),
+    ('알리익스프레스', r'aliexpress\.com')
+]
+
+# HTTP 스토어프론트 어댑터 설정 (storefronts.py 참고)
+# - 네이버 외 URL(자체 쇼핑몰 등)은 브라우저 없이 정적 HTML에서 판매자 정보 추출
+HTTP_WORKERS = 16                   # 동시 요청 작업 스레드 수
+HTTP_TIMEOUT = 10                   # 연결/응답 대기 제한 (초)
+HTTP_RETRIES = 1                    # 연결 실패/5xx 재시도 횟수
+HTTP_POOL_MAXSIZE = 2               # 호스트당 유지할 연결 수
+HTTP_MAX_BYTES = 3 * 1024 * 1024    # 페이지당 읽을 최대 크기 (바이트)
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+)
+HTTP_SKIP_HOSTS = ['example.com', 'xxx.com', 'test.com']   # export의 자리표시 주소 (요청하지 않음)
+
 # 디버깅 설정
 DEBUG_MODE = True
 VERBOSE_LOGGING = True
\ No newline at end of file
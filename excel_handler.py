@@ -3,22 +3,44 @@
 CSV 파일 처리 모듈 (엑셀 → CSV 변경)
 """
 
+import contextlib
+import os
 import pandas as pd
 import logging
 from datetime import datetime
-from config import EXCEL_FILE_PATH, COLUMNS
+from config import EXCEL_FILE_PATH, COLUMNS, FIELD_RULES, HISTORY_ENABLED
+from scheduler import order_stores
+from sharding import apply_results, ensure_text_column, extract_results
+from failures import FailureKind, format_error, never_retry_mask
+from normalization import normalize_phone_series, normalize_email_series
+from structured_log import say, detail
 
 logger = logging.getLogger(__name__)
 
+def completed_mask(phone, email):
+    """최신화 완료 행 마스크 (전화번호/이메일 모두 있고 에러가 아님)"""
+    return (
+        phone.notna() & email.notna() &
+        (phone.astype(str).str.strip() != '') &
+        (email.astype(str).str.strip() != '') &
+        (~phone.astype(str).str.startswith('ERROR', na=False))
+    )
+
 class ExcelHandler:
     """CSV 파일 처리 클래스 (이름은 유지, 실제로는 CSV 처리)"""
     
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, output_path=None):
         self.file_path = file_path or EXCEL_FILE_PATH
         # 확장자를 CSV로 변경
         if self.file_path.endswith('.xlsx'):
             self.file_path = self.file_path.replace('.xlsx', '.csv')
+        # 결과 전용 파일 (샤드 모드: 원본은 읽기만 하고 처리한 행만 저장)
+        self.output_path = str(output_path) if output_path else None
+        self.touched = set()
         self.df = None
+        self.history = None     # 연락처 변경 이력 (첫 기록 시 열림)
+        self._batch_depth = 0   # batch() 안에서는 저장을 블록 끝으로 미룸
+        self._batch_dirty = False
     
     def load_data(self):
         """CSV 파일 직접 로드"""
@@ -26,20 +48,63 @@ class ExcelHandler:
             # CSV 파일만 읽기
             self.df = pd.read_csv(self.file_path, encoding='utf-8')
             logger.info(f"CSV 파일 로드 완료: {len(self.df)}개 행")
-            print(f"📁 CSV 파일 로드: {self.file_path} ({len(self.df)}개 행)")
+            say(f"📁 CSV 파일 로드: {self.file_path} ({len(self.df)}개 행)")
+            
+            # 이전 결과 파일이 있으면 이어서 처리
+            if self.output_path and os.path.exists(self.output_path):
+                results = pd.read_csv(self.output_path, encoding='utf-8', dtype=str)
+                applied, _ = apply_results(self.df, results)
+                done_mask = self.df[COLUMNS['STORE_KEY']].astype(str).isin(results[COLUMNS['STORE_KEY']])
+                self.touched.update(self.df.index[done_mask])
+                say(f"📁 이전 결과 반영: {self.output_path} ({applied}개 행)")
+
+            self.normalize_contacts()
             return True
         except FileNotFoundError:
             logger.error(f"CSV 파일을 찾을 수 없음: {self.file_path}")
-            print(f"❌ CSV 파일을 찾을 수 없습니다: {self.file_path}")
-            print(f"   현재 경로에 {self.file_path} 파일이 있는지 확인해주세요.")
+            say(f"❌ CSV 파일을 찾을 수 없습니다: {self.file_path}")
+            say(f"   현재 경로에 {self.file_path} 파일이 있는지 확인해주세요.")
             raise
         except Exception as e:
             logger.error(f"CSV 파일 로드 실패: {e}")
-            print(f"❌ CSV 파일 로드 실패: {e}")
+            say(f"❌ CSV 파일 로드 실패: {e}")
             raise
     
-    def filter_naver_stores(self):
-        """네이버 스마트스토어만 필터링 (영업종료 및 최신화 완료 제외)"""
+    def normalize_contacts(self):
+        """최신화 전화번호·이메일을 표준 형식으로 통일 (컬럼 단위 벡터 연산)
+
+        원본(전화번호/이메일주소)은 내선 번호 등 정보가 빠지지 않도록 건드리지 않는다
+        (비교할 때만 report.py에서 표준 형식 키로 변환). 형식을 알 수 없는 값과
+        영업종료/ERROR 표시는 그대로 둔다.
+        """
+        targets = [
+            (COLUMNS['UPDATED_PHONE'], normalize_phone_series),
+            (COLUMNS['UPDATED_EMAIL'], normalize_email_series)
+        ]
+        changed = 0
+        for column, normalize in targets:
+            if column not in self.df.columns:
+                continue
+            values = self.df[column]
+            text = values.astype(str)
+            marked = text.str.startswith('영업종료') | text.str.startswith('ERROR')
+            canonical = normalize(values)
+            mask = canonical.notna() & ~marked & (canonical != text)
+            if mask.any():
+                self.df[column] = values.where(~mask, canonical)
+                changed += int(mask.sum())
+
+        if changed:
+            logger.info(f"전화번호/이메일 표준 형식 변환: {changed}개 값")
+        return changed
+
+    def filter_naver_stores(self, policies=None, pending_only=False, captcha_only=False):
+        """네이버 스마트스토어만 필터링 (영업종료 및 최신화 완료 제외, 정책 순으로 정렬)
+        
+        pending_only: 새 export 가져오기에서 대기 표시된 행(신규/URL 변경)만 처리
+        captcha_only: 캡차로 실패한 행(ERROR[captcha])만 처리 (서버 작업자가 남긴 스토어)
+        반환되는 DataFrame의 인덱스는 원본 행 인덱스를 유지한다.
+        """
         try:
             # 네이버 스마트스토어 URL만 필터링
             naver_stores = self.df[
@@ -47,7 +112,7 @@ class ExcelHandler:
             ].copy()
             
             total_naver_stores = len(naver_stores)
-            print(f"🔍 전체 네이버 스토어 {total_naver_stores}개 발견")
+            say(f"🔍 전체 네이버 스토어 {total_naver_stores}개 발견")
             
             # 영업종료 항목 확인
             phone_col = COLUMNS['UPDATED_PHONE']
@@ -56,11 +121,11 @@ class ExcelHandler:
                 closed_stores = naver_stores[closed_mask]
                 
                 if len(closed_stores) > 0:
-                    print(f"🔍 영업종료 표기된 스토어 {len(closed_stores)}개 발견")
+                    say(f"🔍 영업종료 표기된 스토어 {len(closed_stores)}개 발견")
                     for idx, row in closed_stores.head(3).iterrows():
                         store_name = row.get(COLUMNS['COMPANY_NAME'], 'Unknown')
                         phone_value = row.get(phone_col, 'None')
-                        print(f"   - {store_name}: {phone_value}")
+                        detail(f"   - {store_name}: {phone_value}")
             
             # 1. 영업종료로 표기된 항목 제외
             before_closed_filter = len(naver_stores)
@@ -71,19 +136,36 @@ class ExcelHandler:
             
             # 2. 이미 최신화된 항목 제외
             before_completed_filter = len(naver_stores)
-            completed_mask = (
-                (naver_stores[COLUMNS['UPDATED_PHONE']].notna() & 
-                 naver_stores[COLUMNS['UPDATED_EMAIL']].notna()) &
-                (naver_stores[COLUMNS['UPDATED_PHONE']].astype(str).str.strip() != '') &
-                (naver_stores[COLUMNS['UPDATED_EMAIL']].astype(str).str.strip() != '') &
-                (~naver_stores[COLUMNS['UPDATED_PHONE']].astype(str).str.startswith('ERROR', na=False))
+            completed = completed_mask(
+                naver_stores[COLUMNS['UPDATED_PHONE']], naver_stores[COLUMNS['UPDATED_EMAIL']]
             )
             
-            naver_stores = naver_stores[~completed_mask]
+            naver_stores = naver_stores[~completed]
             completed_filtered_count = before_completed_filter - len(naver_stores)
             
-            # 아래에서 위로 처리하기 위해 역순으로 정렬
-            naver_stores = naver_stores.iloc[::-1].reset_index(drop=True)
+            # 영구 실패(404 등)로 기록된 항목 제외 - 재시도해도 소용없음
+            permanent_mask = never_retry_mask(naver_stores[COLUMNS['UPDATED_PHONE']])
+            naver_stores = naver_stores[~permanent_mask]
+            permanent_filtered_count = int(permanent_mask.sum())
+            
+            # 3. 대기 표시된 행만 (증분 처리)
+            if pending_only:
+                pending_col = COLUMNS['PENDING_REASON']
+                if pending_col in naver_stores.columns:
+                    naver_stores = naver_stores[naver_stores[pending_col].notna()]
+                else:
+                    naver_stores = naver_stores.iloc[0:0]
+                logger.info(f"대기 표시된 항목만 처리: {len(naver_stores)}개")
+            
+            if captcha_only:
+                captcha_marker = f"ERROR[{FailureKind.CAPTCHA_ABANDONED}]"
+                naver_stores = naver_stores[
+                    naver_stores[COLUMNS['UPDATED_PHONE']].astype(str).str.startswith(captcha_marker, na=False)
+                ]
+                logger.info(f"캡차 실패 항목만 처리: {len(naver_stores)}개")
+            
+            # 스케줄링 정책 순으로 정렬 (기본: 아래에서 위로)
+            naver_stores = order_stores(naver_stores, policies)
             
             remaining_count = len(naver_stores)
             
@@ -93,7 +175,9 @@ class ExcelHandler:
                 logger.info(f"영업종료 제외: {closed_filtered_count}개")
             if completed_filtered_count > 0:
                 logger.info(f"이미 최신화 완료: {completed_filtered_count}개 (건너뜀)")
-            logger.info(f"처리할 네이버 스토어: {remaining_count}개 (아래에서 위로)")
+            if permanent_filtered_count > 0:
+                logger.info(f"영구 실패 제외: {permanent_filtered_count}개")
+            logger.info(f"처리할 네이버 스토어: {remaining_count}개")
             
             return naver_stores, remaining_count
             
@@ -101,28 +185,56 @@ class ExcelHandler:
             logger.error(f"네이버 스토어 필터링 실패: {e}")
             raise
     
-    def mark_as_closed(self, store_info):
+    def filter_http_stores(self, platforms, pending_only=False):
+        """HTTP 어댑터가 있는 플랫폼의 스토어 (네이버 필터와 같은 기준으로 영업종료/최신화 완료/영구 실패 제외)"""
+        from status import classify_platforms
+
+        phone = self.df[COLUMNS['UPDATED_PHONE']]
+        in_platform = classify_platforms(self.df[COLUMNS['STORE_URL']]).isin(platforms)
+        closed = phone.astype(str).str.startswith('영업종료', na=False)
+        mask = (
+            in_platform & ~closed
+            & ~completed_mask(phone, self.df[COLUMNS['UPDATED_EMAIL']])
+            & ~never_retry_mask(phone)
+        )
+        if pending_only:
+            pending_col = COLUMNS['PENDING_REASON']
+            mask &= self.df[pending_col].notna() if pending_col in self.df.columns else False
+        
+        stores = self.df[mask]
+        say(f"🌐 HTTP 어댑터 대상 {int(in_platform.sum())}개 중 처리할 스토어 {len(stores)}개")
+        return stores
+    
+    def filter_sweep_stores(self):
+        """영업 상태 일괄 확인 대상 - 영업종료로 표기되지 않은 네이버 스토어 전체 (최신화 완료/오류 행 포함)"""
+        naver = self.df[COLUMNS['STORE_URL']].str.contains('smartstore.naver.com', na=False)
+        closed = self.df[COLUMNS['UPDATED_PHONE']].astype(str).str.startswith('영업종료', na=False)
+        stores = self.df[naver & ~closed]
+        say(f"🔍 전체 네이버 스토어 {int(naver.sum())}개 중 영업 상태 확인 대상 {len(stores)}개 "
+            f"(영업종료 표기 {int((naver & closed).sum())}개 제외)")
+        return stores
+    
+    def mark_as_closed(self, task):
         """스토어를 영업 종료로 표기 (CSV 실시간 저장)"""
         try:
-            store_name = store_info[COLUMNS['COMPANY_NAME']]
-            
-            # 인덱스 찾기
-            mask = self.df[COLUMNS['COMPANY_NAME']] == store_name
-            indices = self.df[mask].index
+            store_name = task.name
+            idx = self._find_index(task)
             
-            if len(indices) > 0:
-                idx = indices[0]
+            if idx is not None:
                 
                 # 현재 날짜
                 current_date = datetime.now().strftime('%Y%m%d')
                 closed_mark = f"영업종료_{current_date}"
                 
                 # 업데이트
+                ensure_text_column(self.df, COLUMNS['UPDATED_PHONE'])
                 before_value = self.df.loc[idx, COLUMNS['UPDATED_PHONE']]
                 self.df.loc[idx, COLUMNS['UPDATED_PHONE']] = closed_mark
+                self._stamp(idx)
+                self._record_history(idx)
                 after_value = self.df.loc[idx, COLUMNS['UPDATED_PHONE']]
                 
-                print(f"   📝 {before_value} → {after_value}")
+                detail(f"   📝 {before_value} → {after_value}")
                 
                 # 즉시 저장
                 saved_file = self.save()
@@ -140,30 +252,27 @@ class ExcelHandler:
             logger.error(f"영업종료 표기 실패: {e}")
             return False
     
-    def update_seller_info(self, store_info, seller_info):
+    def update_seller_info(self, task, seller_info):
         """판매자 정보 업데이트 (CSV 실시간 저장)"""
         try:
-            store_name = store_info[COLUMNS['COMPANY_NAME']]
+            store_name = task.name
+            idx = self._find_index(task)
             
-            # 인덱스 찾기
-            mask = self.df[COLUMNS['COMPANY_NAME']] == store_name
-            indices = self.df[mask].index
-            
-            if len(indices) > 0:
-                idx = indices[0]
+            if idx is not None:
                 
-                # 최신화 정보 업데이트
+                # 최신화 정보 업데이트 (FIELD_RULES의 필드 → 컬럼 매핑)
                 updated_fields = []
-                if '전화번호' in seller_info and seller_info['전화번호']:
-                    self.df.loc[idx, COLUMNS['UPDATED_PHONE']] = seller_info['전화번호']
-                    updated_fields.append('전화번호')
-                    
-                if '이메일' in seller_info and seller_info['이메일']:
-                    self.df.loc[idx, COLUMNS['UPDATED_EMAIL']] = seller_info['이메일']
-                    updated_fields.append('이메일')
+                for rule in FIELD_RULES:
+                    value = seller_info.get(rule['field'])
+                    if value:
+                        ensure_text_column(self.df, rule['column'])
+                        self.df.loc[idx, rule['column']] = value
+                        updated_fields.append(rule['field'])
                 
                 # 즉시 저장
                 if updated_fields:
+                    self._stamp(idx)
+                    self._record_history(idx)
                     saved_file = self.save()
                     if saved_file:
                         logger.info(f"✅ 실시간 업데이트 완료: {store_name} ({', '.join(updated_fields)})")
@@ -182,37 +291,93 @@ class ExcelHandler:
             logger.error(f"정보 업데이트 실패: {e}")
             return False
     
-    def log_error(self, store_info, error_msg):
-        """에러 정보를 CSV에 기록 (실시간 저장)"""
+    def log_error(self, task, error_msg, kind=FailureKind.UNKNOWN):
+        """에러 정보를 CSV에 기록 (실시간 저장, 'ERROR[유형]: 메시지' 형식)"""
         try:
-            store_name = store_info[COLUMNS['COMPANY_NAME']]
-            mask = self.df[COLUMNS['COMPANY_NAME']] == store_name
-            indices = self.df[mask].index
+            store_name = task.name
+            idx = self._find_index(task)
             
-            if len(indices) > 0:
-                idx = indices[0]
+            if idx is not None:
                 
                 if COLUMNS['UPDATED_PHONE'] in self.df.columns:
-                    self.df.loc[idx, COLUMNS['UPDATED_PHONE']] = f"ERROR: {error_msg}"
+                    ensure_text_column(self.df, COLUMNS['UPDATED_PHONE'])
+                    self.df.loc[idx, COLUMNS['UPDATED_PHONE']] = format_error(kind, error_msg)
+                    self._stamp(idx, settled=False)
                 
                 # 즉시 저장
                 self.save()
-                logger.info(f"에러 정보 실시간 저장: {store_name} - {error_msg}")
+                logger.info(f"에러 정보 실시간 저장: {store_name} - [{kind}] {error_msg}")
                 
         except Exception as e:
             logger.error(f"에러 로그 기록 실패: {e}")
     
+    def _find_index(self, task):
+        """작업 레코드의 원본 행 인덱스 (없으면 None)"""
+        return task.row if task.row in self.df.index else None
+    
+    def _stamp(self, idx, settled=True):
+        """최신화 일시 기록 (settled: 수집/영업종료로 처리가 끝난 행 - 대기 표시 해제)
+
+        오류 기록은 settled=False로 호출해 대기 표시를 남긴다 (run --pending-only로 다시 처리).
+        """
+        ensure_text_column(self.df, COLUMNS['UPDATED_AT'])
+        self.df.loc[idx, COLUMNS['UPDATED_AT']] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if settled and COLUMNS['PENDING_REASON'] in self.df.columns:
+            self.df.loc[idx, COLUMNS['PENDING_REASON']] = None
+        self.touched.add(idx)
+    
+    def _record_history(self, idx):
+        """행의 최신화 값이 이전 기록과 다르면 이력 DB에 추가 (실패해도 수집은 계속)"""
+        if not HISTORY_ENABLED:
+            return
+        try:
+            from history import ContactHistory, HISTORY_COLUMNS, get_history_path
+            
+            if self.history is None:
+                self.history = ContactHistory(get_history_path(self.file_path))
+            row = self.df.loc[idx]
+            self.history.record(
+                row.get(COLUMNS['STORE_KEY']),
+                {column: row.get(column) for column in HISTORY_COLUMNS},
+                row.get(COLUMNS['UPDATED_AT'])
+            )
+        except Exception as e:
+            logger.warning(f"연락처 이력 기록 실패: {e}")
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """with 블록 안의 갱신은 블록이 끝날 때 한 번만 저장 (여러 건을 한꺼번에 반영할 때)"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_dirty:
+                self._batch_dirty = False
+                self.save()
+    
     def save(self):
         """CSV 파일 저장 (매우 빠름)"""
+        if self._batch_depth:
+            self._batch_dirty = True
+            return self.output_path or self.file_path
         try:
+            # 결과 전용 파일이 지정된 경우 처리한 행의 결과 컬럼만 저장
+            if self.output_path:
+                extract_results(self.df, sorted(self.touched)).to_csv(
+                    self.output_path, index=False, encoding='utf-8'
+                )
+                logger.debug(f"💾 결과 파일 저장 완료: {self.output_path}")
+                return self.output_path
+            
             # CSV로 저장 (UTF-8 인코딩)
             self.df.to_csv(self.file_path, index=False, encoding='utf-8')
-            logger.info(f"💾 CSV 파일 저장 완료: {self.file_path}")
+            logger.debug(f"💾 CSV 파일 저장 완료: {self.file_path}")
             return self.file_path
             
         except Exception as e:
             logger.error(f"❌ CSV 저장 실패: {e}")
-            print(f"   ❌ CSV 저장 실패: {e}")
+            say(f"   ❌ CSV 저장 실패: {e}")
             return None
     
     def get_dataframe(self):
@@ -0,0 +1,140 @@
+# failures.py
+"""
+실패 분류 및 재시도 큐 모듈
+"""
+
+import heapq
+import itertools
+import re
+import time
+
+from config import RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+
+
+class FailureKind:
+    """실패 유형 (CSV에는 'ERROR[유형]: 메시지' 형식으로 기록)"""
+    TRANSIENT_NETWORK = 'network'       # 일시적인 네트워크 오류
+    TIMEOUT = 'timeout'                 # 페이지/요소 대기 시간 초과
+    CAPTCHA_ABANDONED = 'captcha'       # 캡차 건너뜀/시간 초과
+    SELECTOR_MISSING = 'selector'       # 정보 영역/선택자를 찾지 못함
+    PERMANENT = 'permanent'             # 404 등 다시 시도해도 소용없는 실패
+    UNKNOWN = 'unknown'
+
+
+# 같은 실행 안에서 지수 백오프로 재시도하는 유형
+# - 캡차는 건너뛴 스토어를 다시 띄우지 않도록 제외 (다음 실행이나 run --captcha-only로 처리)
+RETRY_IN_RUN = {
+    FailureKind.TRANSIENT_NETWORK,
+    FailureKind.TIMEOUT,
+    FailureKind.UNKNOWN
+}
+
+# 다음 실행에서도 다시 처리하지 않는 유형
+NEVER_RETRY = {FailureKind.PERMANENT}
+
+_NETWORK_PATTERN = re.compile(
+    r'net::ERR_|ERR_CONNECTION|ERR_NAME_NOT_RESOLVED|ERR_INTERNET_DISCONNECTED|connection (?:refused|reset)',
+    re.IGNORECASE
+)
+# HTTP 상태 404 또는 404 판정 문구 (단어 경계 - 다른 숫자 안의 404는 무시)
+_NOT_FOUND_PATTERN = re.compile(r'\b404\b|페이지 없음|찾을 수 없')
+# 404 판정 전에 지우는 부분: chromedriver 스택 추적, URL, 16진수 주소
+_NOISE_PATTERN = re.compile(r'(?:Stacktrace|Backtrace):.*|\S+://\S+|0x[0-9a-f]+(?:\+\d+)?', re.IGNORECASE | re.DOTALL)
+_MARKER_PATTERN = re.compile(r'^ERROR\[(\w+)\]')
+
+
+class PageNotFoundError(RuntimeError):
+    """존재하지 않는 페이지 (NOT_FOUND_MARKERS 프로브 판정) - 영구 실패"""
+
+
+def classify_exception(exc):
+    """예외 → 실패 유형 (네트워크/시간 초과를 먼저 확인, 404는 명시적인 신호만 영구 실패)
+
+    >>> from selenium.common.exceptions import WebDriverException
+    >>> classify_exception(WebDriverException(
+    ...     "net::ERR_CONNECTION_RESET GetHandleVerifier [0x00007FF6C8404C12+31410]"))
+    'network'
+    >>> classify_exception(RuntimeError("ERR_INTERNET_DISCONNECTED at https://smartstore.naver.com/shop404"))
+    'network'
+    >>> classify_exception(RuntimeError("Message: unknown error at https://smartstore.naver.com/shop404"))
+    'unknown'
+    >>> classify_exception(PageNotFoundError("페이지 없음 (404)"))
+    'permanent'
+    >>> classify_exception(RuntimeError("HTTP 404 Not Found"))
+    'permanent'
+    """
+    from selenium.common.exceptions import (
+        TimeoutException, NoSuchElementException, WebDriverException
+    )
+
+    if isinstance(exc, TimeoutException):
+        return FailureKind.TIMEOUT
+    if isinstance(exc, NoSuchElementException):
+        return FailureKind.SELECTOR_MISSING
+    if isinstance(exc, PageNotFoundError):
+        return FailureKind.PERMANENT
+
+    message = str(exc)
+    if _NETWORK_PATTERN.search(message):
+        return FailureKind.TRANSIENT_NETWORK
+    if isinstance(exc, WebDriverException) and 'timeout' in message.lower():
+        return FailureKind.TIMEOUT
+    if _NOT_FOUND_PATTERN.search(_NOISE_PATTERN.sub(' ', message)):
+        return FailureKind.PERMANENT
+    return FailureKind.UNKNOWN
+
+
+def format_error(kind, message):
+    """CSV 기록용 에러 문자열"""
+    return f"ERROR[{kind}]: {message}"
+
+
+def parse_error_kind(value):
+    """CSV 에러 문자열 → 실패 유형 (이전 형식 'ERROR: ...'는 UNKNOWN)"""
+    if not isinstance(value, str) or not value.startswith('ERROR'):
+        return None
+    match = _MARKER_PATTERN.match(value)
+    return match.group(1) if match else FailureKind.UNKNOWN
+
+
+def never_retry_mask(series):
+    """다시 처리하지 않을 에러 행 마스크 (벡터 연산)"""
+    markers = tuple(f"ERROR[{kind}]" for kind in NEVER_RETRY)
+    return series.astype(str).str.startswith(markers, na=False)
+
+
+class RetryQueue:
+    """지수 백오프 재시도 큐 (준비 시각 순으로 꺼냄)"""
+
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempts = {}
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, task, kind):
+        """재시도 대상이면 큐에 넣고 True 반환"""
+        if kind not in RETRY_IN_RUN:
+            return False
+
+        attempt = self.attempts.get(task.row, 0) + 1
+        if attempt > self.max_attempts:
+            return False
+
+        self.attempts[task.row] = attempt
+        delay = min(self.base_delay * (2 ** (attempt - 1)), self.max_delay)
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), task, kind))
+        return True
+
+    def pop(self, sleep=time.sleep):
+        """다음 재시도 작업 반환 (준비 시각까지 대기)"""
+        ready_at, _, task, kind = heapq.heappop(self._heap)
+        wait = ready_at - time.monotonic()
+        if wait > 0:
+            sleep(wait)
+        return task, kind, self.attempts[task.row]
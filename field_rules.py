@@ -0,0 +1,164 @@
+# field_rules.py
+"""
+판매자 정보 필드 추출 규칙 모듈 (config.FIELD_RULES → 단일 정규식 매처)
+"""
+
+import re
+
+from config import FIELD_RULES
+from normalization import normalize_phone, normalize_email
+
+# 전화번호 정리용 정규식 (모듈 로드 시 1회 컴파일)
+_PHONE_NOISE = ('잘못된 번호 신고', '인증')
+_WHITESPACE_RE = re.compile(r'\s+')
+_PHONE_CHARS_RE = re.compile(r'[^\d\-\(\)\s]')
+_BUSINESS_NUMBER_RE = re.compile(r'(\d{3})-?(\d{2})-?(\d{5})')
+
+
+def clean_phone_number(value):
+    """전화번호 정리 (국내 번호 체계면 표준 하이픈 형식, 아니면 숫자/하이픈/괄호/공백만 남김)"""
+    if not value:
+        return None
+
+    for noise in _PHONE_NOISE:
+        value = value.replace(noise, '')
+    cleaned = _WHITESPACE_RE.sub(' ', value.strip())
+    cleaned = _PHONE_CHARS_RE.sub('', cleaned).strip()
+
+    return normalize_phone(cleaned) or cleaned or None
+
+
+def clean_verified_phone(value):
+    """전화번호 정리 (국내 번호 체계가 아니면 None - 출처를 믿을 수 없는 값용)"""
+    return normalize_phone(value)
+
+
+def clean_email(value):
+    """이메일 정리 (문자열 안의 첫 번째 유효한 주소, 소문자 표준 형식)"""
+    if not value or '@' not in value:
+        return None
+
+    return normalize_email(value)
+
+
+def clean_business_number(value):
+    """사업자번호 정리 (000-00-00000 형식)"""
+    if not value:
+        return None
+
+    match = _BUSINESS_NUMBER_RE.search(value)
+    return '-'.join(match.groups()) if match else None
+
+
+def clean_text(value):
+    """일반 텍스트 정리 (공백 정리, 첫 줄만 사용)"""
+    if not value:
+        return None
+
+    first_line = value.strip().split('\n', 1)[0]
+    cleaned = _WHITESPACE_RE.sub(' ', first_line).strip()
+    return cleaned or None
+
+
+NORMALIZERS = {
+    'phone': clean_phone_number,
+    'verified_phone': clean_verified_phone,
+    'email': clean_email,
+    'business_number': clean_business_number,
+    'text': clean_text
+}
+
+
+def rules_with_keywords(field_keywords, rules=None):
+    """규칙 사본의 라벨 키워드 교체 ({필드: [키워드]}, 없는 필드는 기존 키워드 유지)"""
+    return [
+        dict(rule, keywords=list(field_keywords.get(rule['field'], rule['keywords'])))
+        for rule in (rules if rules is not None else FIELD_RULES)
+    ]
+
+
+class FieldMatcher:
+    """라벨 → 필드 매처 (모든 규칙을 하나의 정규식으로 컴파일)"""
+
+    def __init__(self, rules=None):
+        self.rules = list(rules if rules is not None else FIELD_RULES)
+        self.fields = [rule['field'] for rule in self.rules]
+        self.columns = {rule['field']: rule['column'] for rule in self.rules}
+        self._normalizers = {
+            rule['field']: NORMALIZERS[rule.get('normalizer', 'text')]
+            for rule in self.rules
+        }
+        self._group_to_field = {}
+        self._pattern = self._compile()
+
+    def _compile(self):
+        """규칙 순서대로 우선순위를 가지는 단일 정규식 생성
+
+        각 대안을 '^.*?(키워드...)' 형태로 두어 라벨 어디에 키워드가 있든
+        앞에 있는 규칙이 먼저 매칭되도록 한다 (기존 if/elif 순서와 동일).
+        'exact': True인 규칙은 라벨 전체가 키워드와 같을 때만 매칭한다.
+        """
+        alternatives = []
+        for index, rule in enumerate(self.rules):
+            group = f"f{index}"
+            self._group_to_field[group] = rule['field']
+
+            keywords = sorted(set(rule['keywords']), key=len, reverse=True)
+            body = '|'.join(re.escape(keyword) for keyword in keywords)
+            if rule.get('ignore_case'):
+                body = f"(?i:{body})"
+            if rule.get('exact'):
+                alternatives.append(f"(?P<{group}>{body})\\Z")
+            else:
+                alternatives.append(f".*?(?P<{group}>{body})")
+
+        return re.compile('^(?:' + '|'.join(alternatives) + ')', re.DOTALL)
+
+    def match(self, label):
+        """라벨에 해당하는 필드명 반환 (없으면 None)"""
+        if not label:
+            return None
+
+        match = self._pattern.match(label)
+        return self._group_to_field[match.lastgroup] if match else None
+
+    def normalize(self, field, value):
+        """필드별 정규화 적용"""
+        return self._normalizers[field](value)
+
+    def is_complete(self, info):
+        """모든 필드를 찾았는지 확인"""
+        return len(info) >= len(self.fields)
+
+    def apply(self, pairs, info=None):
+        """라벨/값 쌍을 한 번만 순회하며 필드 추출 (이미 찾은 필드는 유지)"""
+        info = {} if info is None else info
+
+        for label, value in pairs:
+            label = label.strip() if label else ''
+            value = value.strip() if value else ''
+            if not label or not value:
+                continue
+
+            field = self.match(label)
+            if field is None or field in info:
+                continue
+
+            normalized = self.normalize(field, value)
+            if normalized:
+                info[field] = normalized
+                if self.is_complete(info):
+                    break
+
+        return info
+
+    def parse_text(self, text, info=None):
+        """'라벨: 값' 형식 텍스트에서 필드 추출"""
+        pairs = (
+            line.split(':', 1) for line in text.split('\n') if ':' in line
+        )
+        return self.apply(pairs, info)
+
+
+# 기본 규칙으로 1회 컴파일된 매처
+DEFAULT_MATCHER = FieldMatcher()
@@ -0,0 +1,240 @@
+# history.py
+"""
+연락처 변경 이력 모듈 (값이 바뀔 때만 추가하는 SQLite 이력 저장소)
+"""
+
+import logging
+import os
+import pathlib
+import sqlite3
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from config import COLUMNS, HISTORY_DB_NAME
+from sharding import RESULT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# 이력으로 남기는 값 (최신화 결과 컬럼, 일시 제외)
+HISTORY_COLUMNS = [c for c in RESULT_COLUMNS if c != COLUMNS['UPDATED_AT']]
+TABLE = 'contact_history'
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _clean_value(value):
+    """저장할 값 (빈 값/에러는 None - 에러는 연락처 상태가 아니므로 이력에 남기지 않음)"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    text = str(value).strip()
+    if not text or text.startswith('ERROR') or text.lower() == 'nan':
+        return None
+    return text
+
+
+def get_history_path(file_path):
+    """대상 CSV와 같은 폴더의 이력 DB 경로"""
+    return pathlib.Path(file_path).with_name(HISTORY_DB_NAME)
+
+
+class ContactHistory:
+    """고유번호별 연락처 이력 (append-only)
+
+    - 스토어의 값이 마지막 기록과 다를 때만 한 행을 추가한다.
+    - (고유번호, 일시)가 기본 키인 WITHOUT ROWID 테이블이라 스토어별 이력이
+      붙어서 저장되고, 일시 인덱스로 시점/기간 조회를 한다.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self._ensure_schema()
+
+    def close(self):
+        self.conn.close()
+
+    def _ensure_schema(self):
+        value_columns = ''.join(f", {_quote(c)} TEXT" for c in HISTORY_COLUMNS)
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            f"store_key TEXT NOT NULL, recorded_at TEXT NOT NULL, source TEXT{value_columns}, "
+            f"PRIMARY KEY (store_key, recorded_at)) WITHOUT ROWID"
+        )
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE}_recorded_at ON {TABLE} (recorded_at)")
+
+        # FIELD_RULES에 필드가 추가되면 컬럼도 추가 (기존 행은 NULL)
+        existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({TABLE})")}
+        for column in HISTORY_COLUMNS:
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {_quote(column)} TEXT")
+        self.conn.commit()
+
+    def _select_columns(self, alias=''):
+        prefix = f"{alias}." if alias else ''
+        return ', '.join(
+            [f"{prefix}store_key", f"{prefix}recorded_at", f"{prefix}source"]
+            + [f"{prefix}{_quote(c)}" for c in HISTORY_COLUMNS]
+        )
+
+    def _insert(self, rows):
+        placeholders = ', '.join('?' * (3 + len(HISTORY_COLUMNS)))
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO {TABLE} ({self._select_columns()}) VALUES ({placeholders})", rows
+        )
+        self.conn.commit()
+
+    def latest(self, store_key):
+        """스토어의 마지막 기록 (일시, 값 튜플) 또는 None"""
+        row = self.conn.execute(
+            f"SELECT recorded_at, {', '.join(_quote(c) for c in HISTORY_COLUMNS)} FROM {TABLE} "
+            f"WHERE store_key = ? ORDER BY recorded_at DESC LIMIT 1",
+            (str(store_key),)
+        ).fetchone()
+        return (row[0], tuple(row[1:])) if row else None
+
+    def record(self, store_key, values, recorded_at=None, source='run'):
+        """값이 마지막 기록과 다르면 추가 → 추가 여부 반환
+
+        values: 컬럼명 → 값 (HISTORY_COLUMNS 기준, 없는 컬럼은 빈 값)
+        """
+        recorded_at = recorded_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        snapshot = tuple(_clean_value(values.get(c)) for c in HISTORY_COLUMNS)
+        if not any(snapshot):
+            return False
+
+        last = self.latest(store_key)
+        if last and (last[1] == snapshot or last[0] >= recorded_at):
+            return False
+
+        self._insert([(str(store_key), recorded_at, source) + snapshot])
+        return True
+
+    def _latest_frame(self):
+        """스토어별 마지막 기록 전체 (일괄 비교용)"""
+        return pd.read_sql_query(
+            f"SELECT {self._select_columns('h')} FROM {TABLE} h "
+            f"JOIN (SELECT store_key, MAX(recorded_at) AS last_at FROM {TABLE} GROUP BY store_key) l "
+            f"ON h.store_key = l.store_key AND h.recorded_at = l.last_at",
+            self.conn, dtype=str
+        )
+
+    def record_frame(self, df, default_at=None, source='ingest'):
+        """CSV 스냅샷(DataFrame)에서 바뀐 스토어만 한 번에 추가 → 추가한 행 수
+
+        각 행의 일시는 '최신화 일시'(없으면 default_at)를 사용하며,
+        마지막 기록보다 이전 일시의 행은 추가하지 않는다 (append-only).
+        """
+        key = COLUMNS['STORE_KEY']
+        snapshot = df.reindex(columns=[key, COLUMNS['UPDATED_AT']] + HISTORY_COLUMNS).copy()
+        snapshot[key] = snapshot[key].astype(str)
+        values = snapshot[HISTORY_COLUMNS].astype(object).map(_clean_value)
+        snapshot[HISTORY_COLUMNS] = values
+        snapshot['recorded_at'] = snapshot[COLUMNS['UPDATED_AT']].where(
+            snapshot[COLUMNS['UPDATED_AT']].notna(), default_at
+        )
+        snapshot = snapshot[values.notna().any(axis=1) & snapshot['recorded_at'].notna()]
+        snapshot = snapshot.drop_duplicates(key, keep='last')
+
+        latest = self._latest_frame().set_index('store_key')
+        previous = latest.reindex(snapshot[key].to_numpy())
+
+        # 빈 값끼리는 같은 값으로 비교
+        current_values = snapshot[HISTORY_COLUMNS].to_numpy(dtype=object)
+        differs = (
+            snapshot[HISTORY_COLUMNS].fillna('').to_numpy(dtype=object)
+            != previous[HISTORY_COLUMNS].fillna('').to_numpy(dtype=object)
+        ).any(axis=1)
+        is_new = previous['recorded_at'].isna().to_numpy()
+        is_later = snapshot['recorded_at'].to_numpy(dtype=object) > previous['recorded_at'].fillna('').to_numpy(dtype=object)
+        take = is_new | (is_later & differs)
+
+        rows = [
+            (k, at, source) + tuple(v)
+            for k, at, v in zip(
+                snapshot[key].to_numpy()[take], snapshot['recorded_at'].to_numpy()[take], current_values[take]
+            )
+        ]
+        self._insert(rows)
+        return len(rows)
+
+    def history_of(self, store_key):
+        """스토어 한 곳의 전체 이력"""
+        return pd.read_sql_query(
+            f"SELECT {self._select_columns()} FROM {TABLE} WHERE store_key = ? ORDER BY recorded_at",
+            self.conn, params=(str(store_key),)
+        )
+
+    def as_of(self, when):
+        """특정 시점의 스토어별 연락처 (그 시점까지의 마지막 기록)"""
+        return pd.read_sql_query(
+            f"SELECT {self._select_columns('h')} FROM {TABLE} h "
+            f"JOIN (SELECT store_key, MAX(recorded_at) AS last_at FROM {TABLE} "
+            f"WHERE recorded_at <= ? GROUP BY store_key) l "
+            f"ON h.store_key = l.store_key AND h.recorded_at = l.last_at ORDER BY h.store_key",
+            self.conn, params=(when,)
+        )
+
+    def changed_since(self, since):
+        """since 이후 값이 바뀐 기록 (이전 값 포함, 처음 기록된 스토어는 제외)"""
+        previous = ', '.join(
+            f"LAG({_quote(c)}) OVER w AS {_quote('이전 ' + c)}" for c in HISTORY_COLUMNS
+        )
+        return pd.read_sql_query(
+            f"SELECT * FROM ("
+            f"SELECT {self._select_columns()}, LAG(recorded_at) OVER w AS previous_at, {previous} "
+            f"FROM {TABLE} WHERE store_key IN (SELECT store_key FROM {TABLE} WHERE recorded_at > ?) "
+            f"WINDOW w AS (PARTITION BY store_key ORDER BY recorded_at)"
+            f") WHERE recorded_at > ? AND previous_at IS NOT NULL ORDER BY recorded_at",
+            self.conn, params=(since, since)
+        )
+
+    def stats(self):
+        rows, stores, first, last = self.conn.execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT store_key), MIN(recorded_at), MAX(recorded_at) FROM {TABLE}"
+        ).fetchone()
+        return {
+            'rows': rows, 'stores': stores, 'first': first, 'last': last,
+            'size_kb': round(os.path.getsize(self.db_path) / 1024, 1)
+        }
+
+
+def _print_frame(df, output_path, label):
+    if output_path:
+        df.to_csv(output_path, index=False, encoding='utf-8')
+        print(f"💾 {label} 저장: {output_path} ({len(df)}개 행)")
+    else:
+        print(df.to_string(index=False) if len(df) else f"({label} 없음)")
+
+
+def run_history(args):
+    """history 하위 명령 실행"""
+    db_path = args.db or get_history_path(args.file)
+    history = ContactHistory(db_path)
+    start_time = time.perf_counter()
+
+    try:
+        if args.action == 'ingest':
+            for path in args.snapshots or [args.file]:
+                df = pd.read_csv(
+                    path, encoding='utf-8', dtype=str,
+                    usecols=lambda c: c in [COLUMNS['STORE_KEY'], COLUMNS['UPDATED_AT']] + HISTORY_COLUMNS
+                )
+                default_at = args.at or datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d %H:%M:%S')
+                added = history.record_frame(df, default_at, source=os.path.basename(path))
+                print(f"📥 {path}: {added}개 변경 기록 추가")
+        elif args.action == 'show':
+            _print_frame(history.history_of(args.store_key), args.output, f"{args.store_key} 이력")
+        elif args.action == 'asof':
+            _print_frame(history.as_of(args.when), args.output, f"{args.when} 시점 연락처")
+        elif args.action == 'changed':
+            _print_frame(history.changed_since(args.since), args.output, f"{args.since} 이후 변경")
+
+        stats = history.stats()
+        print(f"🗂️ 이력 DB: {db_path} - {stats['rows']}개 기록 / {stats['stores']}개 스토어 / "
+              f"{stats['size_kb']}KB ({time.perf_counter() - start_time:.2f}초)")
+    finally:
+        history.close()
@@ -0,0 +1,116 @@
+# incremental.py
+"""
+증분 처리 모듈 (새 export ↔ 이전 스냅샷 비교, 최신화 결과 이월)
+"""
+
+import logging
+import time
+
+import pandas as pd
+
+from config import EXCEL_FILE_PATH, COLUMNS, PENDING_REASONS
+from sharding import RESULT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url_column(series):
+    """URL 비교용 정규화 (스킴/www/끝 슬래시 제거, 소문자)"""
+    return (
+        series.fillna('').astype(str).str.strip().str.lower()
+        .str.replace(r'^https?://', '', regex=True)
+        .str.replace(r'^www\.', '', regex=True)
+        .str.rstrip('/')
+    )
+
+
+def carry_over_results(new_df, previous_df):
+    """이전 스냅샷의 최신화 결과를 새 export에 이월하고 대기 사유 표시
+
+    - 이전에 있던 고유번호 + URL 동일: 최신화 결과 이월
+    - 신규 고유번호: '신규'로 대기 표시
+    - URL 변경: 결과를 이월하지 않고 'URL 변경'으로 대기 표시
+    - 이전 import의 대기 표시가 남아 있고 아직 결과가 없으면 그 사유를 유지
+
+    Returns:
+        dict: 구분별 건수
+    """
+    key = COLUMNS['STORE_KEY']
+    url = COLUMNS['STORE_URL']
+
+    previous = previous_df.drop_duplicates(key, keep='last').copy()
+    previous[key] = previous[key].astype(str)
+    previous = previous.set_index(key)
+
+    new_keys = new_df[key].astype(str)
+    matched = previous.reindex(new_keys.to_numpy())
+    matched.index = new_df.index
+
+    is_new = ~new_keys.isin(previous.index)
+    url_changed = ~is_new & (normalize_url_column(new_df[url]) != normalize_url_column(matched[url]))
+    carry = ~is_new & ~url_changed
+
+    for column in RESULT_COLUMNS:
+        if column not in matched.columns:
+            continue
+        values = matched[column].where(carry)
+        if column in new_df.columns:
+            values = values.where(carry, new_df[column])
+        new_df[column] = values.astype(object)
+
+    # 이전 import에서 대기 표시된 뒤 아직 처리되지 않은 행은 대기 사유 유지 (새 사유가 있으면 새 사유 우선)
+    pending_col = COLUMNS['PENDING_REASON']
+    previous_reason = matched[pending_col] if pending_col in matched.columns else pd.Series(None, index=new_df.index)
+    unprocessed = matched.reindex(columns=RESULT_COLUMNS).isna().all(axis=1)
+    still_pending = carry & previous_reason.notna() & unprocessed
+
+    reason = previous_reason.where(still_pending).astype(object)
+    reason[is_new] = PENDING_REASONS['NEW']
+    reason[url_changed] = PENDING_REASONS['URL_CHANGED']
+    new_df[pending_col] = reason
+
+    return {
+        'carried': int((carry & matched.reindex(columns=RESULT_COLUMNS).notna().any(axis=1)).sum()),
+        'new': int(is_new.sum()),
+        'url_changed': int(url_changed.sum()),
+        'still_pending': int(still_pending.sum()),
+        'removed': int((~previous.index.isin(new_keys)).sum())
+    }
+
+
+def import_export(new_path, previous_path=None, output_path=None):
+    """새 export를 가져와 이전 결과를 이월한 뒤 저장"""
+    previous_path = previous_path or EXCEL_FILE_PATH
+    output_path = output_path or new_path
+
+    start_time = time.perf_counter()
+
+    new_df = pd.read_csv(new_path, encoding='utf-8')
+    previous_df = pd.read_csv(
+        previous_path,
+        encoding='utf-8',
+        usecols=lambda column: column in RESULT_COLUMNS or column in (
+            COLUMNS['STORE_KEY'], COLUMNS['STORE_URL'], COLUMNS['PENDING_REASON']
+        ),
+        dtype=str
+    )
+
+    counts = carry_over_results(new_df, previous_df)
+    new_df.to_csv(output_path, index=False, encoding='utf-8')
+
+    elapsed = time.perf_counter() - start_time
+    pending = counts['new'] + counts['url_changed'] + counts['still_pending']
+
+    print("📥 새 export 가져오기")
+    print(f"   이전 스냅샷: {previous_path} ({len(previous_df)}개 행)")
+    print(f"   새 export: {new_path} ({len(new_df)}개 행)")
+    print(f"   결과 이월: {counts['carried']}개")
+    print(f"   신규 입점사: {counts['new']}개")
+    print(f"   URL 변경: {counts['url_changed']}개")
+    print(f"   이전 대기 유지 (미처리): {counts['still_pending']}개")
+    print(f"   새 export에서 빠진 입점사: {counts['removed']}개")
+    print(f"💾 저장: {output_path} ({elapsed:.2f}초)")
+    print(f"▶️ 변경분만 처리: python main.py --file {output_path} run --pending-only ({pending}개 대기)")
+    logger.info(f"새 export 가져오기 완료: {output_path} (대기 {pending}개)")
+
+    return counts
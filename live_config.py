@@ -0,0 +1,220 @@
+# live_config.py
+"""
+실행 중 다시 불러오는 설정 모듈 (선택자/키워드/대기 시간)
+
+config.py의 값이 기본값이고, LIVE_CONFIG_PATH(JSON) 파일에 적은 항목만 덮어쓴다.
+수집기는 스토어를 처리하기 전마다 파일 수정 시각을 확인해 바뀌었으면 다시 읽고,
+파일 전체가 검증을 통과한 경우에만 한 번에 적용한다. 잘못된 편집은 경고만 남기고
+직전 설정으로 계속 진행한다 (파일을 지우면 config.py 기본값으로 돌아감).
+
+    python main.py config --init     현재 기본값으로 파일 생성
+    python main.py config            파일 검증 (적용될 값 출력)
+"""
+
+import copy
+import json
+import logging
+import os
+
+import config
+from config import FIELD_RULES, LIVE_CONFIG_PATH
+from field_rules import FieldMatcher, rules_with_keywords
+from structured_log import say
+
+logger = logging.getLogger(__name__)
+
+
+def _strings(value, allow_empty=True):
+    if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+        raise ValueError("빈 문자열이 없는 문자열 목록이어야 합니다")
+    if not value and not allow_empty:
+        raise ValueError("하나 이상 필요합니다")
+    return list(value)
+
+
+def _css_list(value, allow_empty=True):
+    from cssselect import GenericTranslator, SelectorError
+
+    selectors = _strings(value, allow_empty)
+    for selector in selectors:
+        try:
+            GenericTranslator().css_to_xpath(selector)
+        except SelectorError as e:
+            raise ValueError(f"잘못된 CSS 선택자 '{selector}': {e}")
+    return selectors
+
+
+def _xpath(value):
+    from lxml import etree
+
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("XPath 문자열이어야 합니다")
+    try:
+        etree.XPath(value)
+    except etree.XPathSyntaxError as e:
+        raise ValueError(f"잘못된 XPath: {e}")
+    return value
+
+
+def _seconds(value, positive=False):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError("초 단위 숫자여야 합니다")
+    if value < 0 or (positive and value == 0):
+        raise ValueError("0보다 커야 합니다" if positive else "0 이상이어야 합니다")
+    return value
+
+
+def _seller_info_selectors(value):
+    keys = ('DL_CONTAINERS', 'LABELS', 'VALUES')
+    if not isinstance(value, dict) or set(value) != set(keys):
+        raise ValueError(f"{', '.join(keys)} 항목만 가진 객체여야 합니다")
+    selectors = {key: _css_list(value[key], allow_empty=False) for key in keys}
+    if len(selectors['LABELS']) != len(selectors['VALUES']):
+        raise ValueError("LABELS와 VALUES는 같은 위치끼리 짝이므로 개수가 같아야 합니다")
+    return selectors
+
+
+def _field_keywords(value):
+    fields = [rule['field'] for rule in FIELD_RULES]
+    if not isinstance(value, dict):
+        raise ValueError("{필드: [키워드]} 객체여야 합니다")
+    unknown = [field for field in value if field not in fields]
+    if unknown:
+        raise ValueError(f"FIELD_RULES에 없는 필드: {', '.join(unknown)} (필드 추가는 config.py에서)")
+    keywords = {field: _strings(words, allow_empty=False) for field, words in value.items()}
+    FieldMatcher(rules_with_keywords(keywords))    # 정규식 컴파일 확인
+    return keywords
+
+
+# 실행 중 바꿀 수 있는 항목 → 검증 함수 (검증된 값 반환, 잘못되면 ValueError)
+LIVE_SETTINGS = {
+    'SELLER_INFO_BUTTON_XPATH': _xpath,
+    'CAPTCHA_SELECTORS': _css_list,
+    'CAPTCHA_CLOSE_SELECTORS': _css_list,
+    'NOT_FOUND_MARKERS': _strings,
+    'SELLER_INFO_SELECTORS': _seller_info_selectors,
+    'FIELD_KEYWORDS': _field_keywords,       # FIELD_RULES 필드별 라벨 키워드
+    'INTER_STORE_DELAY': _seconds,
+    'NAVIGATION_DELAY': _seconds,
+    'PAGE_STATE_BUTTON_WAIT': _seconds,
+    'PAGE_STATE_LOAD_TIMEOUT': lambda value: _seconds(value, positive=True),
+    'PAGE_STATE_POLL_INTERVAL': lambda value: _seconds(value, positive=True)
+}
+
+
+def default_settings():
+    """config.py 기본값 (FIELD_KEYWORDS는 FIELD_RULES의 키워드)"""
+    settings = {
+        name: copy.deepcopy(getattr(config, name))
+        for name in LIVE_SETTINGS if name != 'FIELD_KEYWORDS'
+    }
+    settings['FIELD_KEYWORDS'] = {rule['field']: list(rule['keywords']) for rule in FIELD_RULES}
+    return settings
+
+
+def validate(data):
+    """파일 내용 → (기본값에 덮어쓴 전체 설정, 오류 목록)"""
+    if not isinstance(data, dict):
+        return None, ["최상위는 {항목: 값} 객체여야 합니다"]
+
+    settings = default_settings()
+    errors = []
+    for name, value in data.items():
+        if name not in LIVE_SETTINGS:
+            errors.append(f"{name}: 알 수 없는 항목 (오타이거나 실행 중 바꿀 수 없는 설정)")
+            continue
+        try:
+            settings[name] = LIVE_SETTINGS[name](value)
+        except ValueError as e:
+            errors.append(f"{name}: {e}")
+    return settings, errors
+
+
+def read_settings(path):
+    """설정 파일 읽기 + 검증 → (전체 설정, 오류 목록)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return None, [f"파일을 읽을 수 없음: {e}"]
+    return validate(data)
+
+
+class LiveConfig:
+    """설정 파일 감시 (스토어 사이에 poll 호출)"""
+
+    def __init__(self, path=LIVE_CONFIG_PATH):
+        self.path = path
+        self.settings = default_settings()  # 현재 적용 중인 전체 설정
+        self.reloads = 0
+        self.rejected = 0
+        self._mtime = None                  # 마지막으로 확인한 파일 수정 시각 (파일 없으면 None)
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self):
+        """파일이 바뀌었으면 다시 읽기 → 새로 적용할 전체 설정 (바뀐 값이 없거나 거부되면 None)"""
+        if not self.path:
+            return None
+        mtime = self._file_mtime()
+        if mtime == self._mtime:
+            return None
+        self._mtime = mtime
+
+        if mtime is None:
+            settings, errors = default_settings(), []
+        else:
+            settings, errors = read_settings(self.path)
+        if errors:
+            self.rejected += 1
+            logger.warning(f"설정 파일 거부 - 직전 설정 유지 ({self.path}):")
+            for error in errors:
+                logger.warning(f"   {error}")
+            return None
+
+        changed = [name for name in LIVE_SETTINGS if settings[name] != self.settings[name]]
+        self.settings = settings
+        if not changed:
+            return None
+        self.reloads += 1
+        say(f"🔄 설정 다시 불러옴 ({self.path}): {', '.join(changed)}", changed=changed)
+        return settings
+
+
+def init_live_config(path=LIVE_CONFIG_PATH, force=False):
+    """현재 기본값으로 설정 파일 생성"""
+    if os.path.exists(path) and not force:
+        print(f"❌ 이미 있음: {path} (덮어쓰려면 --force)")
+        return False
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(default_settings(), f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f"✅ 설정 파일 생성: {path}")
+    print("   필요한 항목만 남기고 수정하면 실행 중인 수집기가 다음 스토어부터 적용합니다.")
+    return True
+
+
+def check_live_config(path=LIVE_CONFIG_PATH):
+    """설정 파일 검증 결과 출력 (기본값과 다른 항목)"""
+    if not os.path.exists(path):
+        print(f"ℹ️ 설정 파일 없음: {path} - config.py 기본값 사용")
+        return True
+    settings, errors = read_settings(path)
+    if errors:
+        print(f"❌ 설정 파일 오류 ({path}) - 수집기는 이 편집을 적용하지 않습니다:")
+        for error in errors:
+            print(f"   {error}")
+        return False
+
+    defaults = default_settings()
+    changed = [name for name in LIVE_SETTINGS if settings[name] != defaults[name]]
+    print(f"✅ 설정 파일 정상: {path}")
+    if not changed:
+        print("   기본값과 다른 항목 없음")
+    for name in changed:
+        print(f"   {name} = {json.dumps(settings[name], ensure_ascii=False)}")
+    return True
@@ -0,0 +1,237 @@
+# liveness_sweep.py
+"""
+영업 상태 일괄 확인 모듈 (판매자 정보 버튼 유무만 판정, 클릭하지 않음)
+
+전체 수집 흐름(버튼 클릭 → 판매자 정보 팝업)을 거치지 않고 스토어 페이지에서
+판매자 정보 버튼 또는 종료 문구만 확인한다. 버튼을 누르지 않으므로 캡차가
+나오지 않는다. 가벼운 로드(로드 완료 대기 없음, 이미지 차단)의 Chrome 하나에서
+탭 여러 개를 동시에 불러오고, 탭을 돌아가며 page_state 프로브로 판정한다.
+
+    open      판매자 정보 버튼 있음
+    closed    로드 후 PAGE_STATE_BUTTON_WAIT 동안 버튼 없음, 또는 종료 문구 → 영업종료_YYYYMMDD
+    unknown   캡차/로드 시간 초과/접속 오류/다른 페이지로 이동 → 기록하지 않음
+"""
+
+import logging
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from config import (
+    SWEEP_TABS, SWEEP_LOAD_TIMEOUT, SWEEP_SAVE_EVERY, PAGE_STATE_BUTTON_WAIT, PAGE_STATE_POLL_INTERVAL
+)
+from page_state import PROBE_SCRIPT, PageState, ProbeResult
+from structured_log import say, detail
+
+logger = logging.getLogger(__name__)
+
+
+class Liveness:
+    """영업 상태 판정 값"""
+    OPEN = 'open'
+    CLOSED = 'closed'
+    UNKNOWN = 'unknown'
+
+
+# 이동 전 문서 표시 - 새 문서가 열리면 window 객체가 바뀌어 사라진다 (이전 스토어 페이지를 판정하지 않도록)
+STALE_FLAG = '__livenessSweepStale'
+NAVIGATE_SCRIPT = f"window.{STALE_FLAG} = true; window.location.assign(arguments[0]);"
+SWEEP_PROBE_SCRIPT = f"if (window.{STALE_FLAG}) {{ return {{ready_state: 'loading'}}; }}\n" + PROBE_SCRIPT
+
+
+def _full_url(url):
+    return url if url.startswith(('http://', 'https://')) else 'https://' + url
+
+
+class _Tab:
+    """탭 1개의 현재 작업"""
+
+    __slots__ = ('handle', 'task', 'url', 'started', 'loaded_at')
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.task = None
+        self.url = None
+        self.started = None
+        self.loaded_at = None       # 버튼 없이 로드가 끝난 것을 처음 본 시각
+
+
+class LivenessSweep:
+    """탭 여러 개를 돌아가며 스토어 영업 상태 판정 (WebDriver 세션 1개, 스레드 없음)"""
+
+    def __init__(self, browser_handler, tabs=SWEEP_TABS, button_wait=PAGE_STATE_BUTTON_WAIT,
+                 load_timeout=SWEEP_LOAD_TIMEOUT, poll=PAGE_STATE_POLL_INTERVAL):
+        self.browser_handler = browser_handler      # lightweight=True로 만든 BrowserHandler
+        self.tabs = max(1, tabs)
+        self.button_wait = button_wait
+        self.load_timeout = load_timeout
+        self.poll = poll
+        self.stats = Counter()
+        self.unknown_reasons = Counter()
+
+    @property
+    def driver(self):
+        return self.browser_handler.driver
+
+    def _open_tabs(self):
+        handles = [self.browser_handler.main_window]
+        while len(handles) < self.tabs:
+            self.driver.switch_to.new_window('tab')
+            handles.append(self.driver.current_window_handle)
+        return handles
+
+    def _load(self, tab, task):
+        """탭에서 스토어 페이지 이동 시작 (로드를 기다리지 않음)"""
+        tab.task = task
+        tab.url = _full_url(task.url)
+        tab.started = time.monotonic()
+        tab.loaded_at = None
+        self.driver.switch_to.window(tab.handle)
+        self.driver.execute_script(NAVIGATE_SCRIPT, tab.url)
+
+    def _probe(self, tab):
+        self.driver.switch_to.window(tab.handle)
+        raw = self.driver.execute_script(SWEEP_PROBE_SCRIPT, *self.browser_handler.probe_selectors)
+        return ProbeResult(raw if isinstance(raw, dict) else {'ready_state': 'loading'})
+
+    def _verdict(self, tab, result, now):
+        """프로브 결과 → (판정, 사유) (더 기다려야 하면 None)"""
+        if result.state == PageState.READY:
+            return Liveness.OPEN, "판매자 정보 버튼 있음"
+        if result.state == PageState.CAPTCHA:
+            return Liveness.UNKNOWN, "캡차"
+        if result.state in (PageState.CLOSED, PageState.NOT_FOUND):
+            # 접속 오류 페이지나 로그인 등 다른 사이트로 이동한 경우는 영업 종료로 보지 않음
+            if result.url.startswith('chrome-error:'):
+                return Liveness.UNKNOWN, "접속 오류"
+            if urlparse(result.url).netloc != urlparse(tab.url).netloc:
+                return Liveness.UNKNOWN, "다른 페이지로 이동"
+            if result.state == PageState.NOT_FOUND:
+                return Liveness.CLOSED, f"종료 문구: {result.not_found}"
+            tab.loaded_at = tab.loaded_at or now
+            if now - tab.loaded_at >= self.button_wait:
+                return Liveness.CLOSED, "판매자 정보 버튼 없음"
+            return None     # 로드는 끝남 - 버튼 대기 중 (로드 시간 초과와 무관)
+        if now - tab.started >= self.load_timeout:
+            return Liveness.UNKNOWN, "로드 시간 초과"
+        return None
+
+    def _settle(self, tab, verdict, reason, on_result):
+        self.stats[verdict] += 1
+        if verdict == Liveness.UNKNOWN:
+            self.unknown_reasons[reason] += 1
+        on_result(tab.task, verdict, reason)
+
+    def run(self, tasks, on_result):
+        """tasks 판정 → 스토어마다 on_result(task, 판정, 사유) 호출
+
+        판정이 난 탭에 바로 다음 스토어를 불러오므로 항상 tabs개가 동시에 로드된다.
+        """
+        pending = iter(tasks)
+        active = []
+        for handle in self._open_tabs():
+            active.append(_Tab(handle))
+
+        def load_next(tab):
+            """다음 스토어를 탭에 불러오기 (남은 스토어가 없거나 탭이 죽으면 탭 제외)"""
+            for task in pending:
+                try:
+                    self._load(tab, task)
+                    return
+                except Exception as e:
+                    self._settle(tab, Liveness.UNKNOWN, f"탭 오류: {type(e).__name__}", on_result)
+                    logger.warning(f"탭 이동 실패 - 탭 제외: {e}")
+                    break
+            active.remove(tab)
+
+        for tab in list(active):
+            load_next(tab)
+
+        while active:
+            now = time.monotonic()
+            settled = False
+            for tab in list(active):
+                try:
+                    verdict = self._verdict(tab, self._probe(tab), now)
+                except Exception as e:   # 렌더러 종료 등 - 이 스토어는 보류
+                    verdict = (Liveness.UNKNOWN, f"탭 오류: {type(e).__name__}")
+                if verdict is None:
+                    continue
+                settled = True
+                self._settle(tab, *verdict, on_result)
+                load_next(tab)
+            if not settled:
+                time.sleep(self.poll)
+        return self.stats
+
+
+def run_sweep(file_path=None, tabs=SWEEP_TABS, limit=None, browser_mode=None, dry_run=False):
+    """네이버 스토어 영업 상태 일괄 확인 → 영업종료 표기 (dry_run이면 판정만)"""
+    from browser_handler import BrowserHandler
+    from excel_handler import ExcelHandler
+    from live_config import LiveConfig
+    from selector_stats import SelectorStats
+    from tasks import build_tasks
+
+    excel_handler = ExcelHandler(file_path)
+    excel_handler.load_data()
+    tasks = build_tasks(excel_handler.filter_sweep_stores())
+    if limit:
+        tasks = tasks[:limit]
+    if not tasks:
+        say("❌ 확인할 네이버 스토어가 없습니다.")
+        return None
+
+    handler = BrowserHandler(selector_stats=SelectorStats(), mode=browser_mode, lightweight=True)
+    settings = LiveConfig().poll()      # 편집한 버튼/종료 문구 선택자가 있으면 같이 사용
+    if settings:
+        handler.apply_settings(settings)
+    sweep = LivenessSweep(handler, tabs, button_wait=handler.button_wait)
+    to_mark = []
+
+    def flush():
+        """모아 둔 영업종료를 한 번에 저장"""
+        with excel_handler.batch():
+            for task in to_mark:
+                excel_handler.mark_as_closed(task)
+        to_mark.clear()
+
+    started = time.perf_counter()
+    last_report = started
+
+    def on_result(task, verdict, reason):
+        nonlocal last_report
+        detail(f"   {verdict}: {task.name} - {reason}", store_key=task.store_key, liveness=verdict)
+        if verdict == Liveness.CLOSED and not dry_run:
+            to_mark.append(task)
+            if len(to_mark) >= SWEEP_SAVE_EVERY:
+                flush()
+        if time.perf_counter() - last_report >= 5:
+            last_report = time.perf_counter()
+            say(f"   진행: {sum(sweep.stats.values())}/{len(tasks)} (영업종료 {sweep.stats[Liveness.CLOSED]})")
+
+    say(f"🔎 영업 상태 확인: {len(tasks)}개 (탭 {sweep.tabs}개, {handler.mode}"
+        + (", 기록 안 함)" if dry_run else ")"))
+    try:
+        handler.setup_driver()
+        sweep.run(tasks, on_result)
+    except KeyboardInterrupt:
+        say("\n⏹️ 사용자에 의해 중단됨")
+    finally:
+        if to_mark:
+            flush()
+        handler.close_driver()
+
+    elapsed = time.perf_counter() - started
+    done = sum(sweep.stats.values())
+    say("=" * 60)
+    say("📊 영업 상태 확인 결과")
+    say(f"확인: {done}개 (영업 중 {sweep.stats[Liveness.OPEN]} / 영업종료 {sweep.stats[Liveness.CLOSED]}"
+        f" / 보류 {sweep.stats[Liveness.UNKNOWN]})")
+    for reason, count in sweep.unknown_reasons.most_common():
+        say(f"   보류 - {reason}: {count}개")
+    say(f"소요 시간: {elapsed:.1f}초 ({done / elapsed if elapsed else 0:.1f} 스토어/초)")
+    if not dry_run:
+        say(f"최종 파일: {excel_handler.file_path}")
+    say("=" * 60)
+    return sweep.stats
@@ -1,27 +1,284 @@
 # main.py
 """
 네이버 판매자 정보 수집기 메인 실행 파일
+
+사용법:
+    python main.py                # 판매자 정보 수집 (기본)
+    python main.py run --schedule errors_last,active_grade
+                                  # 처리 순서 정책 지정
+    python main.py run --shard 1/4
+                                  # 4개 노드 중 1번 샤드만 처리
+    python main.py merge *_shard*of4.csv
+                                  # 샤드 결과를 원본에 병합
+    python main.py --file sellers_250711.csv import sellers_250801.csv
+                                  # 새 export에 이전 결과 이월 (신규/URL 변경만 대기)
+    python main.py --file sellers_250801.csv run --pending-only
+                                  # 대기 표시된 행만 처리
+    python main.py report         # 연락처 변경 리포트 생성
+    python main.py status --json  # 진행 현황 (Chrome 없이 1초 이내)
+    python main.py history changed --since 2025-08-01
+                                  # 연락처 변경 이력 조회 (ingest/show/asof/changed/stats)
+    python main.py run --record   # 처리한 페이지를 page_corpus/에 기록
+    python main.py replay         # 기록된 페이지로 추출 로직 오프라인 검증
+    python main.py run --http     # 네이버 외 스토어(자체 쇼핑몰 등)도 HTTP로 동시에 처리
+    python main.py http           # 네이버 외 스토어만 HTTP로 처리 (Chrome 불필요)
+    python main.py sweep --tabs 8 # 버튼 유무만 확인해 영업종료 일괄 표기 (클릭 없음 - 캡차 없음)
+    python main.py login          # 데스크톱에서 로그인 후 쿠키 저장 (서버 작업자용 naver_session.json)
+    python main.py run --browser-mode xvfb --shard 1/4
+                                  # 서버 무인 실행 (캡차는 스크린샷/웹훅 알림 후 captcha 실패로 남김)
+    python main.py run --captcha-only
+                                  # 데스크톱에서 캡차 실패 행만 처리
+    python main.py config --init  # 실행 중 다시 불러오는 설정 파일 생성 (live_config.json)
+    python main.py replay --config live_config.json
+                                  # 편집한 선택자/키워드를 적용 전에 코퍼스로 검증
+    python main.py bench --limit 500
+                                  # 가짜 드라이버로 처리 속도 측정 (Chrome 불필요)
+    python main.py --profile prof/run bench
+                                  # 어떤 명령이든 CPU 프로파일링 (prof/run.folded, prof/run.txt)
+    python main.py --log-json run.jsonl --quiet run
+                                  # 스토어/단계 필드가 붙은 JSON lines 로그, 콘솔은 경고만
 """
 
-import logging
-from config import LOG_FORMAT, LOG_LEVEL, EXCEL_FILE_PATH
-from collector import NaverSellerInfoCollector
+import argparse
+import os
+from config import (
+    EXCEL_FILE_PATH, PAGE_CORPUS_DIR, LOG_JSON_PATH, LIVE_CONFIG_PATH, HTTP_WORKERS,
+    BROWSER_MODE, BROWSER_PROFILE_DIR, SESSION_COOKIES_PATH, SWEEP_TABS
+)
+
+def setup_logging(json_path=None, quiet=False):
+    """로깅 설정 (큐 기반 백그라운드 출력, json_path면 JSON lines 기록)"""
+    from structured_log import setup_logging as setup_structured_logging
+
+    setup_structured_logging(json_path, quiet)
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="네이버 판매자 정보 수집기")
+    parser.add_argument('--file', default=EXCEL_FILE_PATH, help='대상 CSV 파일 경로')
+    parser.add_argument('--profile', metavar='PREFIX', help='CPU 프로파일을 <PREFIX>.* 파일로 저장')
+    parser.add_argument('--profile-mode', choices=['sample', 'cprofile'], default='sample',
+                        help='sample: 플레임그래프용 .folded (기본) / cprofile: pstats용 .prof')
+    parser.add_argument('--log-json', default=LOG_JSON_PATH, metavar='PATH',
+                        help='스토어 고유번호/처리 단계가 포함된 JSON lines 로그를 PATH에 추가')
+    parser.add_argument('--quiet', action='store_true', help='콘솔에는 경고 이상만 출력 (진행 메시지 생략)')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='판매자 정보 수집 (기본)')
+    run_parser.add_argument('--schedule', help='처리 순서 정책 (쉼표 구분, 예: errors_last,active_grade)')
+    run_parser.add_argument('--shard', help='이 노드가 처리할 샤드 (예: 1/4) - 결과는 <원본>_shard1of4.csv에 저장')
+    run_parser.add_argument('--pending-only', action='store_true', help='import에서 대기 표시된 행(신규/URL 변경)만 처리')
+    run_parser.add_argument('--record', nargs='?', const=PAGE_CORPUS_DIR, metavar='DIR',
+                            help=f'처리한 페이지 HTML과 추출 결과를 코퍼스로 기록 (기본: {PAGE_CORPUS_DIR})')
+    run_parser.add_argument('--http', action='store_true',
+                            help='네이버 외 스토어(자체 쇼핑몰 등)를 HTTP 어댑터로 동시에 처리')
+    run_parser.add_argument('--memory', action='store_true',
+                            help='N개 스토어마다 Python/Chrome 메모리 샘플, 종료 시 증가 추세/할당 위치 보고')
+    run_parser.add_argument('--browser-mode', choices=['desktop', 'headless', 'xvfb'], default=BROWSER_MODE,
+                            help=f'desktop: Chrome 창 / headless·xvfb: 서버 무인 실행 (기본: {BROWSER_MODE})')
+    run_parser.add_argument('--profile-dir', default=BROWSER_PROFILE_DIR, metavar='DIR',
+                            help='Chrome 사용자 데이터 폴더 ({worker}는 샤드 번호로 치환, 기본: 임시 프로필)')
+    run_parser.add_argument('--captcha-only', action='store_true',
+                            help='캡차로 실패한 행(ERROR[captcha])만 처리 - 서버 작업자가 남긴 캡차를 데스크톱에서 처리')
+
+    sweep_parser = subparsers.add_parser('sweep', help='판매자 정보 버튼 유무만 확인해 영업종료 일괄 표기 (여러 탭, 클릭 없음)')
+    sweep_parser.add_argument('--tabs', type=int, default=SWEEP_TABS, help=f'동시에 불러올 탭 수 (기본: {SWEEP_TABS})')
+    sweep_parser.add_argument('--limit', type=int, help='확인할 최대 스토어 수')
+    sweep_parser.add_argument('--browser-mode', choices=['desktop', 'headless', 'xvfb'], default=BROWSER_MODE,
+                              help=f'브라우저 실행 방식 (기본: {BROWSER_MODE})')
+    sweep_parser.add_argument('--dry-run', action='store_true', help='판정만 출력하고 CSV에 기록하지 않음')
+
+    login_parser = subparsers.add_parser('login', help='데스크톱 Chrome에서 로그인 후 쿠키 파일 저장 (서버 모드용)')
+    login_parser.add_argument('--output', default=SESSION_COOKIES_PATH, help=f'쿠키 파일 경로 (기본: {SESSION_COOKIES_PATH})')
+
+    import_parser = subparsers.add_parser('import', help='새 export에 이전 스냅샷(--file)의 최신화 결과 이월')
+    import_parser.add_argument('new_export', help='새 export CSV 경로')
+    import_parser.add_argument('--output', help='저장 경로 (기본: 새 export 덮어쓰기)')
+
+    merge_parser = subparsers.add_parser('merge', help='샤드 결과 파일을 원본 CSV에 병합')
+    merge_parser.add_argument('shards', nargs='+', help='샤드 결과 CSV 경로들')
+    merge_parser.add_argument('--output', help='병합 결과 저장 경로 (기본: 원본 덮어쓰기)')
+
+    report_parser = subparsers.add_parser('report', help='연락처 변경 리포트 생성')
+    report_parser.add_argument('--output', help='리포트 CSV 경로 (기본: <원본>_report.csv)')
+    report_parser.add_argument('--include-pending', action='store_true', help='미처리 행도 리포트에 포함')
+
+    status_parser = subparsers.add_parser('status', help='진행 현황 (플랫폼별 미처리/완료/영업종료/오류, 최근 처리량)')
+    status_parser.add_argument('--json', action='store_true', help='JSON으로 출력 (cron/대시보드용)')
+    status_parser.add_argument('--no-shards', action='store_true', help='병합 전 샤드 결과 파일을 반영하지 않음')
+
+    history_parser = subparsers.add_parser('history', help='연락처 변경 이력 (값이 바뀐 경우만 기록)')
+    history_parser.add_argument('--db', help='이력 DB 경로 (기본: 대상 CSV 폴더의 contact_history.sqlite3)')
+    history_parser.add_argument('--output', help='조회 결과를 CSV로 저장')
+    history_actions = history_parser.add_subparsers(dest='action', required=True)
+    ingest_parser = history_actions.add_parser('ingest', help='CSV 스냅샷의 최신화 결과를 이력에 추가 (기본: --file)')
+    ingest_parser.add_argument('snapshots', nargs='*', help='CSV 스냅샷 경로들 (오래된 것부터)')
+    ingest_parser.add_argument('--at', help="최신화 일시가 없는 행에 쓸 일시 (기본: 파일 수정 시각)")
+    show_parser = history_actions.add_parser('show', help='스토어 한 곳의 이력')
+    show_parser.add_argument('store_key', help='고유번호')
+    asof_parser = history_actions.add_parser('asof', help='특정 시점의 연락처')
+    asof_parser.add_argument('when', help="시점 (예: '2025-08-01 00:00:00')")
+    changed_parser = history_actions.add_parser('changed', help='특정 시점 이후 바뀐 연락처')
+    changed_parser.add_argument('--since', required=True, help="기준 시점 (예: 2025-08-01)")
+    history_actions.add_parser('stats', help='이력 DB 요약')
 
-def setup_logging():
-    """로깅 설정"""
-    logging.basicConfig(
-        level=getattr(logging, LOG_LEVEL),
-        format=LOG_FORMAT
+    replay_parser = subparsers.add_parser('replay', help='기록된 코퍼스로 정보 추출을 오프라인 재생 (정확도/속도)')
+    replay_parser.add_argument('corpus', nargs='?', default=PAGE_CORPUS_DIR, help=f'코퍼스 폴더 (기본: {PAGE_CORPUS_DIR})')
+    replay_parser.add_argument('--workers', type=int, help='작업 프로세스 수 (기본: CPU 코어 수)')
+    replay_parser.add_argument('--limit', type=int, help='재생할 최대 페이지 수')
+    replay_parser.add_argument('--config', metavar='PATH', help='이 설정 파일(live_config)의 선택자/키워드로 재생')
+
+    http_parser = subparsers.add_parser('http', help='네이버 외 스토어만 HTTP 어댑터로 처리 (브라우저/로그인 없음)')
+    http_parser.add_argument('--workers', type=int, default=HTTP_WORKERS, help=f'동시 요청 수 (기본: {HTTP_WORKERS})')
+    http_parser.add_argument('--limit', type=int, help='처리할 최대 스토어 수')
+    http_parser.add_argument('--pending-only', action='store_true', help='import에서 대기 표시된 행만 처리')
+    http_parser.add_argument('--fixture', metavar='HTML', help='로컬 HTML 파일에 어댑터만 적용해 추출 결과 출력')
+
+    config_parser = subparsers.add_parser('config', help='실행 중 다시 불러오는 설정 파일 검증/생성 (선택자/키워드/대기 시간)')
+    config_parser.add_argument('path', nargs='?', default=LIVE_CONFIG_PATH, help=f'설정 파일 경로 (기본: {LIVE_CONFIG_PATH})')
+    config_parser.add_argument('--init', action='store_true', help='현재 config.py 값으로 파일 생성')
+    config_parser.add_argument('--force', action='store_true', help='--init 시 기존 파일 덮어쓰기')
+
+    bench_parser = subparsers.add_parser('bench', help='가짜 드라이버로 수집 파이프라인 처리 속도 측정')
+    bench_parser.add_argument('--limit', type=int, help='앞에서부터 사용할 행 수 (기본: 전체)')
+    bench_parser.add_argument('--closed-ratio', type=float, default=0.0, help='영업종료 페이지 비율 (0~1)')
+    bench_parser.add_argument('--verbose', action='store_true', help='스토어별 진행 출력 표시')
+    bench_parser.add_argument('--record', metavar='DIR', help='가짜 페이지를 코퍼스로 기록 (replay 점검용)')
+    bench_parser.add_argument('--memory', action='store_true', help='메모리 추적을 켜고 실행 (run --memory와 동일)')
+
+    return parser.parse_args(argv)
+
+def run_collector(args):
+    """판매자 정보 수집 실행"""
+    # selenium/Chrome은 수집 시에만 필요하므로 여기서 import
+    from collector import NaverSellerInfoCollector
+
+    from sharding import parse_shard
+
+    shard = parse_shard(args.shard) if getattr(args, 'shard', None) else None
+    recorder = None
+    if getattr(args, 'record', None):
+        from page_corpus import PageRecorder
+        recorder = PageRecorder(args.record)
+    collector = NaverSellerInfoCollector(
+        args.file, getattr(args, 'schedule', None), shard, getattr(args, 'pending_only', False),
+        recorder=recorder, memory=getattr(args, 'memory', False), http_stores=getattr(args, 'http', False),
+        browser_mode=getattr(args, 'browser_mode', None), profile_dir=getattr(args, 'profile_dir', BROWSER_PROFILE_DIR),
+        captcha_only=getattr(args, 'captcha_only', False)
     )
+    collector.run()
+
+def run_sweep(args):
+    """영업 상태 일괄 확인 실행"""
+    import liveness_sweep
+
+    liveness_sweep.run_sweep(args.file, args.tabs, args.limit, args.browser_mode, args.dry_run)
+
+def run_login(args):
+    """데스크톱 로그인 쿠키 저장"""
+    import server_mode
+
+    server_mode.export_login_session(args.output)
 
-def main():
+def run_report(args):
+    """연락처 변경 리포트 실행"""
+    import report
+
+    report.run_report(args.file, args.output, args.include_pending)
+
+def run_merge(args):
+    """샤드 결과 병합 실행"""
+    import sharding
+
+    sharding.merge_shards(args.shards, args.file, args.output)
+
+def run_import(args):
+    """새 export 가져오기 실행"""
+    import incremental
+
+    incremental.import_export(args.new_export, args.file, args.output)
+
+def run_status(args):
+    """진행 현황 출력"""
+    import status
+
+    status.run_status(args.file, args.json, not args.no_shards)
+
+def run_history(args):
+    """연락처 변경 이력 명령 실행"""
+    import history
+
+    history.run_history(args)
+
+def run_replay(args):
+    """코퍼스 오프라인 재생 실행"""
+    import page_corpus
+
+    page_corpus.run_replay(args.corpus, args.workers, args.limit, config_path=args.config)
+
+def run_http(args):
+    """네이버 외 스토어 HTTP 어댑터 처리"""
+    import storefronts
+
+    if args.fixture:
+        seller_info = storefronts.extract_fixture(args.fixture)
+        print(f"📋 {args.fixture}: {seller_info or '추출된 정보 없음'}")
+        return
+    storefronts.run_http_stores(args.file, args.workers, args.limit, args.pending_only)
+
+def run_config(args):
+    """설정 파일 검증/생성"""
+    import live_config
+
+    if args.init:
+        live_config.init_live_config(args.path, args.force)
+    else:
+        live_config.check_live_config(args.path)
+
+def run_bench(args):
+    """가짜 드라이버 벤치마크 실행"""
+    import benchmark
+
+    recorder = None
+    if args.record:
+        from page_corpus import PageRecorder
+        recorder = PageRecorder(args.record)
+    benchmark.run_benchmark(args.file, args.limit, args.closed_ratio, args.verbose, recorder, args.memory)
+
+COMMANDS = {
+    'run': run_collector,
+    'sweep': run_sweep,
+    'login': run_login,
+    'report': run_report,
+    'merge': run_merge,
+    'import': run_import,
+    'status': run_status,
+    'history': run_history,
+    'replay': run_replay,
+    'bench': run_bench,
+    'config': run_config,
+    'http': run_http
+}
+
+def main(argv=None):
     """메인 함수"""
+    args = parse_args(argv)
+
     # 로깅 설정
-    setup_logging()
+    setup_logging(args.log_json, args.quiet)
     
-    # 수집기 실행
-    collector = NaverSellerInfoCollector(EXCEL_FILE_PATH)
-    collector.run()
+    command = COMMANDS[args.command or 'run']
+    if not args.profile:
+        command(args)
+        return
+
+    from profiling import profile_run
+
+    profile_dir = os.path.dirname(args.profile)
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+    with profile_run(args.profile, args.profile_mode):
+        command(args)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,214 @@
+# memory_telemetry.py
+"""
+메모리 추적 모듈 (Python 힙/프로세스 + Chrome/chromedriver 프로세스 트리)
+
+N개 스토어마다 한 번씩 샘플을 남기고 증가 추세(100개 스토어당 MB)를 계산해
+경고하며, 실행이 끝나면 시작 시점 대비 가장 많이 늘어난 할당 위치를 보고한다.
+Chrome 추세는 브라우저 재시작 이후 샘플로만 계산한다.
+"""
+
+import csv
+import logging
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from config import (
+    MEMORY_SAMPLE_EVERY, MEMORY_TRACE_FRAMES, MEMORY_TOP_SITES,
+    MEMORY_GROWTH_WARN_MB, MEMORY_TREND_MIN_SAMPLES, MEMORY_LOG_PATH
+)
+from structured_log import say
+
+try:
+    import psutil
+except ImportError:  # 프로세스 메모리(RSS)는 기록하지 않음
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+SAMPLE_COLUMNS = [
+    'stores', 'elapsed', 'since_restart', 'python_rss_mb', 'traced_mb', 'traced_peak_mb',
+    'dataframe_mb', 'chrome_mb', 'driver_mb', 'chrome_processes', 'tabs'
+]
+
+# 추세를 계산하는 값 → 표시 이름
+TREND_SERIES = {
+    'python_rss_mb': 'Python RSS',
+    'traced_mb': 'Python 힙 (tracemalloc)',
+    'dataframe_mb': 'DataFrame',
+    'chrome_mb': 'Chrome',
+    'driver_mb': 'chromedriver'
+}
+BROWSER_SERIES = ('chrome_mb', 'driver_mb')
+
+# 할당 위치 보고에서 제외 (추적 자체/임포트 비용)
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+]
+
+
+def growth_per_100(stores, values):
+    """스토어 수 대비 값의 기울기 (100개 스토어당 증가량, 샘플이 부족하면 None)"""
+    points = [(s, v) for s, v in zip(stores, values) if v is not None]
+    if len(points) < max(2, MEMORY_TREND_MIN_SAMPLES) or points[-1][0] == points[0][0]:
+        return None
+    x, y = np.array(points, dtype=float).T
+    return float(np.polyfit(x, y, 1)[0] * 100)
+
+
+class MemoryTelemetry:
+    """스토어 처리 중 메모리 샘플링 및 추세/할당 위치 보고"""
+
+    def __init__(self, browser_handler=None, dataframe_getter=None, every=MEMORY_SAMPLE_EVERY,
+                 log_path=MEMORY_LOG_PATH, trace_frames=MEMORY_TRACE_FRAMES):
+        self.browser_handler = browser_handler
+        self.dataframe_getter = dataframe_getter    # 현재 DataFrame을 돌려주는 함수 (없으면 기록 안 함)
+        self.every = every
+        self.log_path = log_path
+        self.trace_frames = trace_frames
+        self.samples = []
+        self.warned = set()
+        self.started_at = None
+        self._baseline = None
+        self._started_tracing = False
+        self._last_stores = 0
+
+    def start(self):
+        """추적 시작 (tracemalloc 기준 스냅샷 + 첫 샘플)"""
+        if self.trace_frames and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+        if tracemalloc.is_tracing():
+            self._baseline = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        self.started_at = time.perf_counter()
+        if self.log_path:
+            with open(self.log_path, 'w', newline='', encoding='utf-8') as f:
+                csv.DictWriter(f, fieldnames=SAMPLE_COLUMNS).writeheader()
+        say(f"🧠 메모리 추적 시작 ({self.every}개 스토어마다 샘플"
+            + (f", 기록: {self.log_path})" if self.log_path else ")"))
+        self.sample(0, 0)
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def maybe_sample(self, stores, since_restart):
+        """every개 스토어마다 샘플"""
+        if self.every and stores - self._last_stores >= self.every:
+            self.sample(stores, since_restart)
+
+    def _browser_memory(self):
+        if self.browser_handler is None:
+            return {}
+        try:
+            return self.browser_handler.browser_memory_breakdown()
+        except Exception as e:
+            logger.debug(f"Chrome 메모리 확인 실패: {e}")
+            return {}
+
+    def _dataframe_mb(self):
+        if self.dataframe_getter is None:
+            return None
+        df = self.dataframe_getter()
+        return None if df is None else round(df.memory_usage(deep=True).sum() / MB, 1)
+
+    def sample(self, stores, since_restart):
+        """샘플 1개 기록 후 추세 확인"""
+        self._last_stores = stores
+        traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (None, None)
+        browser = self._browser_memory()
+        row = {
+            'stores': stores,
+            'elapsed': round(time.perf_counter() - self.started_at, 1),
+            'since_restart': since_restart,
+            'python_rss_mb': round(psutil.Process().memory_info().rss / MB, 1) if psutil else None,
+            'traced_mb': None if traced is None else round(traced / MB, 1),
+            'traced_peak_mb': None if peak is None else round(peak / MB, 1),
+            'dataframe_mb': self._dataframe_mb(),
+            'chrome_mb': browser.get('chrome_mb'),
+            'driver_mb': browser.get('driver_mb'),
+            'chrome_processes': browser.get('processes'),
+            'tabs': browser.get('tabs')
+        }
+        self.samples.append(row)
+        if self.log_path:
+            with open(self.log_path, 'a', newline='', encoding='utf-8') as f:
+                csv.DictWriter(f, fieldnames=SAMPLE_COLUMNS).writerow(row)
+
+        say(f"🧠 메모리 ({stores}개 처리): Python {row['python_rss_mb']}MB"
+            f" (힙 {row['traced_mb']}MB) / Chrome {row['chrome_mb']}MB"
+            f" ({row['chrome_processes']}개 프로세스, 탭 {row['tabs']}개)",
+            level=logging.DEBUG, **row)
+        self._check_trends()
+        return row
+
+    def _series(self, column):
+        """값 목록 (Chrome 값은 마지막 브라우저 재시작 이후 샘플만)"""
+        samples = self.samples
+        if column in BROWSER_SERIES:
+            start = 0
+            for i in range(1, len(samples)):
+                if samples[i]['since_restart'] < samples[i - 1]['since_restart']:
+                    start = i
+            samples = samples[start:]
+        return [s['stores'] for s in samples], [s[column] for s in samples]
+
+    def trends(self):
+        """값별 100개 스토어당 증가량 (MB)"""
+        return {column: growth_per_100(*self._series(column)) for column in TREND_SERIES}
+
+    def _check_trends(self):
+        for column, slope in self.trends().items():
+            if slope is None or slope < MEMORY_GROWTH_WARN_MB or column in self.warned:
+                continue
+            self.warned.add(column)
+            logger.warning(
+                f"메모리 증가 추세: {TREND_SERIES[column]} 100개 스토어당 +{slope:.1f}MB "
+                f"(기준 {MEMORY_GROWTH_WARN_MB}MB)"
+            )
+
+    def top_allocations(self, limit=MEMORY_TOP_SITES):
+        """시작 시점 대비 가장 많이 늘어난 할당 위치 [(위치, 증가 KB, 증가 개수)]"""
+        if self._baseline is None or not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        stats = snapshot.compare_to(self._baseline, 'lineno')
+        return [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             round(stat.size_diff / 1024, 1), stat.count_diff)
+            for stat in stats[:limit] if stat.size_diff > 0
+        ]
+
+    def report(self, stores=None, since_restart=0):
+        """실행 종료 보고 (마지막 샘플 + 추세 + 할당 위치) → dict"""
+        if stores is not None and stores != self._last_stores:
+            self.sample(stores, since_restart)
+        first, last = self.samples[0], self.samples[-1]
+        trends = self.trends()
+        allocations = self.top_allocations()
+
+        say("🧠 메모리 보고")
+        for column, name in TREND_SERIES.items():
+            if last[column] is None:
+                continue
+            slope = trends[column]
+            trend = '' if slope is None else f" (100개당 {slope:+.1f}MB{' ⚠️' if column in self.warned else ''})"
+            say(f"   {name}: {first[column]}MB → {last[column]}MB{trend}")
+        if last['traced_peak_mb'] is not None:
+            say(f"   Python 힙 최대: {last['traced_peak_mb']}MB")
+        if allocations:
+            say(f"   늘어난 할당 위치 상위 {len(allocations)}개:")
+            for site, size_kb, count in allocations:
+                say(f"     +{size_kb}KB ({count:+d}개) {site}")
+        if self.log_path:
+            say(f"   샘플 {len(self.samples)}개: {os.path.abspath(self.log_path)}")
+        self.stop()
+        return {'samples': self.samples, 'trends': trends, 'allocations': allocations}
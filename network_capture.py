@@ -0,0 +1,136 @@
+# network_capture.py
+"""
+네트워크 응답 기반 판매자 정보 추출 모듈 (팝업을 채우는 백엔드 JSON 응답을 직접 파싱)
+"""
+
+import base64
+import json
+import logging
+import re
+import time
+
+from config import (
+    NETWORK_FIELD_RULES, SELLER_INFO_RESPONSE_PATTERNS,
+    NETWORK_CAPTURE_TIMEOUT, NETWORK_CAPTURE_MAX_MISSES
+)
+from field_rules import FieldMatcher
+
+logger = logging.getLogger(__name__)
+
+# 판매자 정보 응답 URL 패턴 (모듈 로드 시 1회 컴파일)
+_RESPONSE_URL_RE = re.compile('|'.join(SELLER_INFO_RESPONSE_PATTERNS), re.IGNORECASE)
+_POLL_INTERVAL = 0.1
+
+NETWORK_MATCHER = FieldMatcher(NETWORK_FIELD_RULES)
+
+
+def iter_json_pairs(data, path=''):
+    """JSON → ('상위키.키', 값) 쌍 (문자열/숫자 값만, 리스트 인덱스는 경로에서 생략)"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from iter_json_pairs(value, f"{path}.{key}" if path else str(key))
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_json_pairs(item, path)
+    elif isinstance(data, (str, int, float)) and not isinstance(data, bool) and path:
+        yield path, str(data)
+
+
+def parse_seller_response(body, info=None, matcher=NETWORK_MATCHER):
+    """응답 본문(JSON 문자열) → 판매자 정보 dict (JSON이 아니면 그대로 반환)
+
+    키 경로의 마지막 키만 규칙과 비교한다.
+
+    >>> parse_seller_response('{"representativeImage": {"imageUrl": "https://x/y.png"}, '
+    ...                       '"telecomCarrier": "SKT 12", "addressBook": "none"}')
+    {}
+    >>> parse_seller_response('{"seller": {"representativeName": "홍길동", "telNo": "0212345678", '
+    ...                       '"csTelNo": "12"}}')
+    {'대표자명': '홍길동', '전화번호': '02-1234-5678'}
+    """
+    info = {} if info is None else info
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):
+        return info
+    pairs = ((path.rsplit('.', 1)[-1], value) for path, value in iter_json_pairs(data))
+    return matcher.apply(pairs, info)
+
+
+class NetworkCapture:
+    """Chrome 성능 로그(Network 이벤트)에서 판매자 정보 응답을 찾아 파싱
+
+    드라이버는 goog:loggingPrefs {'performance': 'ALL'}로 생성되어 있어야 한다.
+    연속으로 응답을 찾지 못하면 (응답 URL이 바뀐 경우 등) 스스로 비활성화되어
+    DOM 추출만 사용한다.
+    """
+
+    def __init__(self, driver, timeout=NETWORK_CAPTURE_TIMEOUT, max_misses=NETWORK_CAPTURE_MAX_MISSES):
+        self.driver = driver
+        self.timeout = timeout
+        self.max_misses = max_misses
+        self.misses = 0
+        self.enabled = True
+
+    def begin(self):
+        """버튼 클릭 직전 호출 - 이전 페이지의 로그를 비움"""
+        if not self.enabled:
+            return
+        try:
+            self.driver.get_log('performance')
+        except Exception as e:
+            logger.warning(f"성능 로그를 읽을 수 없어 네트워크 추출 비활성화: {e}")
+            self.enabled = False
+
+    def _read_events(self):
+        """성능 로그 → (method, params) 목록"""
+        events = []
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            events.append((message.get('method'), message.get('params', {})))
+        return events
+
+    def _response_body(self, request_id):
+        result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        return body
+
+    def collect(self):
+        """클릭 이후 판매자 정보 응답을 기다려 파싱 → dict (못 찾으면 {})"""
+        if not self.enabled:
+            return {}
+
+        info = {}
+        candidates = set()      # URL 패턴이 맞는 JSON 응답의 requestId
+        deadline = time.monotonic() + self.timeout
+
+        try:
+            while time.monotonic() < deadline:
+                for method, params in self._read_events():
+                    if method == 'Network.responseReceived':
+                        response = params.get('response', {})
+                        if 'json' in response.get('mimeType', '') and _RESPONSE_URL_RE.search(response.get('url', '')):
+                            candidates.add(params.get('requestId'))
+                    elif method == 'Network.loadingFinished' and params.get('requestId') in candidates:
+                        candidates.discard(params['requestId'])
+                        parse_seller_response(self._response_body(params['requestId']), info)
+
+                if '전화번호' in info or '이메일' in info:
+                    break
+                time.sleep(_POLL_INTERVAL)
+        except Exception as e:
+            logger.warning(f"네트워크 응답 추출 오류: {e}")
+
+        if info:
+            self.misses = 0
+        else:
+            self.misses += 1
+            if self.max_misses and self.misses >= self.max_misses:
+                logger.warning(f"{self.misses}개 스토어 연속으로 판매자 정보 응답 없음 - DOM 추출로 전환")
+                self.enabled = False
+        return info
@@ -0,0 +1,120 @@
+# normalization.py
+"""
+전화번호/이메일 정규화 모듈 (컬럼 단위 벡터 연산 + 단일 값용 함수)
+
+전화번호는 국내 번호 체계에 맞는 경우 하이픈 형식 하나로 통일한다.
+    010-1234-5678 / 011-123-4567     휴대폰
+    02-123-4567 / 031-1234-5678       지역번호
+    070-1234-5678 / 080-123-4567      인터넷전화 / 수신자부담
+    0507-1234-5678 / 0505-300-2015    안심번호 (050X)
+    1588-1234                         대표번호 (15xx/16xx/18xx)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# 셀 안의 첫 번째 전화번호 후보 (구분자 포함)
+_PHONE_CANDIDATE = r'(\+?\(?\d[\d\s\-\.\(\)]{6,}\d)'
+
+# 숫자만 남긴 번호 → (국번, 중간, 끝) - 위에서부터 먼저 맞는 형식
+_PHONE_FORMATS = [
+    ('mobile', r'(01[016789])(\d{3,4})(\d{4})'),
+    ('landline', r'(02)(\d{3,4})(\d{4})'),
+    ('landline', r'(0[3-6][1-5])(\d{3,4})(\d{4})'),
+    ('safe', r'(050\d)(\d{3,4})(\d{4})'),
+    ('voip', r'(070)(\d{4})(\d{4})'),
+    ('tollfree', r'(080)(\d{3,4})(\d{4})'),
+    ('representative', r'(1[5689]\d{2})()(\d{4})')
+]
+PHONE_TYPES = list(dict.fromkeys(kind for kind, _ in _PHONE_FORMATS))
+
+# 형식마다 그룹 3개 (대표번호는 중간 그룹이 빈 문자열)
+_PHONE_DIGITS = '^(?:' + '|'.join(pattern for _, pattern in _PHONE_FORMATS) + ')$'
+_PHONE_DIGITS_RE = re.compile(_PHONE_DIGITS)
+_PHONE_CANDIDATE_RE = re.compile(_PHONE_CANDIDATE)
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# 이메일: 로컬 파트 + 점으로 구분된 도메인 라벨 + 2자 이상 영문 TLD
+_EMAIL = r'([a-z0-9!#$%&\'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&\'*+/=?^_`{|}~-]+)*@(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,})'
+_EMAIL_RE = re.compile(_EMAIL)
+
+# 국내 형식(0으로 시작)으로 되돌릴 앞부분
+# - +82 10-..., +82 (0)2-... 국가번호
+# - 엑셀/CSV에서 숫자로 읽혀 앞의 0이 빠진 번호 (1012345678 → 010..., 21234567 → 02...)
+_LEADING_ZERO = r'^(?:820?(?=[1-9]\d{7,10}$)|(?=(?:1[016789]\d{7,8}|2\d{7,8}|[3-6][1-5]\d{7,8}|70\d{8})$))'
+_LEADING_ZERO_RE = re.compile(_LEADING_ZERO)
+
+
+def _restore_leading_zero(digits):
+    """국가번호/빠진 0 → 국내 형식 (벡터 연산)"""
+    return digits.str.replace(_LEADING_ZERO, '0', regex=True)
+
+
+def normalize_phone_series(series, keep_invalid=False):
+    """전화번호 컬럼 → 표준 하이픈 형식 (국내 번호 체계가 아니면 결측)
+
+    keep_invalid=True면 형식을 알 수 없는 값은 숫자만 남겨 반환한다
+    (원본 ↔ 최신화 비교처럼 같은 값끼리만 같으면 되는 경우).
+    """
+    text = series.astype(object).where(series.notna(), '').astype(str)
+    candidate = text.str.extract(_PHONE_CANDIDATE, expand=False).fillna('')
+    digits = _restore_leading_zero(candidate.str.replace(r'\D', '', regex=True))
+
+    parts = digits.str.extract(_PHONE_DIGITS, expand=True)
+
+    result = pd.Series(None, index=series.index, dtype=object)
+    for i in range(len(_PHONE_FORMATS)):
+        head, middle, tail = parts[3 * i], parts[3 * i + 1], parts[3 * i + 2]
+        matched = head.notna() & result.isna()
+        joined = head + np.where(middle.fillna('') != '', '-' + middle.fillna(''), '') + '-' + tail
+        result = result.where(~matched, joined)
+
+    if keep_invalid:
+        result = result.where(result.notna(), digits.where(digits != '', None))
+    return result
+
+
+def phone_type_series(series):
+    """전화번호 컬럼 → 번호 종류 (mobile/landline/safe/voip/tollfree/representative, 아니면 None)"""
+    canonical = normalize_phone_series(series)
+    digits = canonical.fillna('').str.replace('-', '', regex=False)
+    conditions = [digits.str.fullmatch(pattern) for _, pattern in _PHONE_FORMATS]
+    return pd.Series(
+        np.select(conditions, [kind for kind, _ in _PHONE_FORMATS], default=None), index=series.index
+    ).where(canonical.notna(), None)
+
+
+def normalize_email_series(series):
+    """이메일 컬럼 → 소문자 표준 형식 (문자열 안의 첫 번째 유효한 주소, 없으면 결측)"""
+    text = series.astype(object).where(series.notna(), '').astype(str).str.strip().str.lower()
+    return text.str.extract(_EMAIL, expand=False)
+
+
+def normalize_phone(value):
+    """전화번호 1개 → 표준 하이픈 형식 (국내 번호 체계가 아니면 None)"""
+    if not value:
+        return None
+    candidate = _PHONE_CANDIDATE_RE.search(str(value))
+    if not candidate:
+        return None
+    digits = _LEADING_ZERO_RE.sub('0', _NON_DIGIT_RE.sub('', candidate.group(1)), count=1)
+
+    match = _PHONE_DIGITS_RE.match(digits)
+    if not match:
+        return None
+    groups = match.groups()
+    for i in range(0, len(groups), 3):
+        head, middle, tail = groups[i:i + 3]
+        if head is not None:
+            return f"{head}-{middle}-{tail}" if middle else f"{head}-{tail}"
+    return None
+
+
+def normalize_email(value):
+    """이메일 1개 → 소문자 표준 형식 (유효한 주소가 없으면 None)"""
+    if not value:
+        return None
+    match = _EMAIL_RE.search(str(value).strip().lower())
+    return match.group(1) if match else None
@@ -0,0 +1,239 @@
+# page_corpus.py
+"""
+스토어 페이지 기록/재생 모듈 (선택자 변경을 브라우저 없이 오프라인으로 검증)
+"""
+
+import glob
+import gzip
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from config import PAGE_CORPUS_DIR, REPLAY_WORKERS
+
+logger = logging.getLogger(__name__)
+
+RECORD_SUFFIX = '.json.gz'
+
+# innerText처럼 줄을 나누는 블록 요소
+_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'footer',
+    'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+    'ol', 'p', 'section', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul'
+}
+_SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+_SPACES = re.compile(r'[ \t\r\f\v\xa0]+')
+
+
+class PageRecorder:
+    """처리한 스토어의 페이지 HTML(판매자 정보 팝업 포함)과 실제 추출 결과를 코퍼스로 저장
+
+    스토어 1건당 <코퍼스>/<고유번호>.json.gz 파일 하나 (같은 스토어는 덮어씀).
+    팝업이 열린 뒤의 페이지를 저장하므로 버튼과 팝업이 한 스냅샷에 들어 있다.
+    """
+
+    def __init__(self, corpus_dir=None):
+        self.corpus_dir = corpus_dir or PAGE_CORPUS_DIR
+        os.makedirs(self.corpus_dir, exist_ok=True)
+        self.recorded_count = 0
+
+    def record_path(self, task):
+        key = task.store_key if task.store_key is not None else zlib.crc32(str(task.url).encode('utf-8'))
+        return os.path.join(self.corpus_dir, f"{key}{RECORD_SUFFIX}")
+
+    def record(self, task, html, seller_info=None, closed=False):
+        """스냅샷 1건 저장 (기록 실패는 수집을 멈추지 않음)"""
+        try:
+            record = {
+                'store_key': task.store_key,
+                'name': task.name,
+                'url': task.url,
+                'recorded_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'html': html or '',
+                'closed': closed,
+                'seller_info': seller_info or {}
+            }
+            with gzip.open(self.record_path(task), 'wt', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False)
+            self.recorded_count += 1
+            return True
+        except Exception as e:
+            logger.warning(f"페이지 기록 실패: {e}")
+            return False
+
+
+def load_record(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_records(corpus_dir=None):
+    return sorted(glob.glob(os.path.join(corpus_dir or PAGE_CORPUS_DIR, f"*{RECORD_SUFFIX}")))
+
+
+class HtmlElement:
+    """lxml 요소를 WebElement처럼 사용 (text, find_element(s))"""
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        return _inner_text(self.node)
+
+    def find_elements(self, by, selector):
+        return [HtmlElement(n) for n in _select(self.node, by, selector)]
+
+    def find_element(self, by, selector):
+        from selenium.common.exceptions import NoSuchElementException
+
+        found = _select(self.node, by, selector)
+        if not found:
+            raise NoSuchElementException(selector)
+        return HtmlElement(found[0])
+
+
+class HtmlDriver(HtmlElement):
+    """저장된 HTML을 WebDriver처럼 사용하는 재생용 드라이버 (선택자 검색만 지원)"""
+
+    def __init__(self, html):
+        import lxml.html
+
+        super().__init__(lxml.html.document_fromstring(html or '<html><body></body></html>'))
+
+
+def _select(node, by, selector):
+    """By 종류별 검색 (CSS는 cssselect로 XPath 변환)"""
+    from selenium.webdriver.common.by import By
+
+    if by == By.CSS_SELECTOR:
+        return node.cssselect(selector)
+    if by == By.XPATH:
+        xpath = selector if node.getparent() is None or selector.startswith('.') else '.' + selector
+        return [n for n in node.xpath(xpath) if hasattr(n, 'tag')]
+    if by == By.TAG_NAME:
+        return list(node.iter(selector))
+    raise ValueError(f"재생 모드에서 지원하지 않는 검색 방식: {by}")
+
+
+def _inner_text(node):
+    """브라우저 innerText 근사값 (블록 요소마다 줄바꿈, 공백 정리)"""
+    parts = []
+
+    def walk(element):
+        tag = element.tag if isinstance(element.tag, str) else ''
+        if tag in _SKIP_TAGS:
+            return
+        block = tag in _BLOCK_TAGS
+        if block:
+            parts.append('\n')
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append('\n')
+
+    walk(node)
+    lines = (_SPACES.sub(' ', line).strip() for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def replay_record(path, settings=None):
+    """기록 1건을 현재 선택자/필드 규칙으로 다시 추출 → 비교 결과 dict (작업 프로세스에서 실행)
+
+    settings(live_config 전체 설정)를 주면 config.py 대신 그 선택자/키워드로 추출한다.
+    """
+    from browser_handler import BrowserHandler
+    from page_state import probe_page
+    from selector_stats import SelectorStats
+
+    record = load_record(path)
+    handler = BrowserHandler(selector_stats=SelectorStats())    # 기록마다 설정 순서로 (결과 재현성)
+    handler.driver = HtmlDriver(record['html'])
+    if settings:
+        handler.apply_settings(settings)
+
+    # 수집기와 같은 페이지 상태 판정 → 팝업 선택자/필드 규칙으로 추출 (작업 프로세스의 진행 출력은 버림)
+    logging.disable(logging.INFO)
+    try:
+        closed = probe_page(handler.driver, selectors=handler.probe_selectors).button is None
+        seller_info = {} if closed else handler.extract_seller_info()
+    finally:
+        logging.disable(logging.NOTSET)
+
+    expected = record.get('seller_info') or {}
+    fields = set(expected) | set(seller_info)
+    return {
+        'path': path,
+        'name': record.get('name'),
+        'closed_ok': closed == bool(record.get('closed')),
+        'expected_fields': len(expected),
+        'matched_fields': sum(1 for f in expected if seller_info.get(f) == expected[f]),
+        'diff': {f: (expected.get(f), seller_info.get(f)) for f in fields if expected.get(f) != seller_info.get(f)}
+    }
+
+
+def run_replay(corpus_dir=None, workers=None, limit=None, show=10, config_path=None):
+    """코퍼스 전체를 병렬로 재생하고 정확도/처리 속도 출력
+
+    config_path(live_config 설정 파일)를 주면 실행 중인 수집기에 적용하기 전에
+    편집한 선택자/키워드를 코퍼스로 검증한다.
+    """
+    settings = None
+    if config_path:
+        from live_config import read_settings
+
+        settings, errors = read_settings(config_path)
+        if errors:
+            print(f"❌ 설정 파일 오류 ({config_path}):")
+            for error in errors:
+                print(f"   {error}")
+            return None
+
+    paths = list_records(corpus_dir)
+    if limit:
+        paths = paths[:limit]
+    if not paths:
+        print(f"❌ 재생할 기록이 없습니다: {corpus_dir or PAGE_CORPUS_DIR}")
+        return None
+
+    workers = workers or REPLAY_WORKERS or os.cpu_count()
+    print(f"▶️ 코퍼스 재생: {len(paths)}개 페이지 (작업 프로세스 {workers}개)"
+          + (f" - 설정: {config_path}" if settings else ""))
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(partial(replay_record, settings=settings), paths, chunksize=max(1, len(paths) // (workers * 4))))
+    elapsed = time.perf_counter() - started
+
+    closed_ok = sum(r['closed_ok'] for r in results)
+    expected_fields = sum(r['expected_fields'] for r in results)
+    matched_fields = sum(r['matched_fields'] for r in results)
+    exact = sum(1 for r in results if r['closed_ok'] and not r['diff'])
+    mismatches = [r for r in results if not r['closed_ok'] or r['diff']]
+
+    print("="*60)
+    print("📊 재생 결과")
+    print(f"페이지: {len(results)}개")
+    print(f"완전 일치: {exact}개 ({exact / len(results) * 100:.1f}%)")
+    print(f"영업 상태 판정 일치: {closed_ok}개 ({closed_ok / len(results) * 100:.1f}%)")
+    if expected_fields:
+        print(f"필드 일치: {matched_fields}/{expected_fields} ({matched_fields / expected_fields * 100:.1f}%)")
+    print(f"소요 시간: {elapsed:.2f}초 ({len(results) / elapsed:.1f} 페이지/초)")
+    for r in mismatches[:show]:
+        print(f"   ❌ {r['name']} ({os.path.basename(r['path'])})"
+              + ("" if r['closed_ok'] else " 영업 상태 불일치")
+              + "".join(f"\n      {f}: 기록 {old!r} → 재생 {new!r}" for f, (old, new) in r['diff'].items()))
+    if len(mismatches) > show:
+        print(f"   ... 외 {len(mismatches) - show}개")
+    print("="*60)
+    return results
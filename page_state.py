@@ -0,0 +1,166 @@
+# page_state.py
+"""
+페이지 상태 판정 모듈 (설정된 선택자 전체를 스크립트 1회 실행으로 확인)
+
+판매자 정보 버튼 XPath, CAPTCHA_SELECTORS, CAPTCHA_CLOSE_SELECTORS,
+NOT_FOUND_MARKERS를 브라우저 안에서 한 번에 평가하고 하나의 판정을 돌려준다.
+
+    ready      판매자 정보 버튼 있음
+    captcha    캡차 요소가 보임 (숨겨진 요소는 제외)
+    closed     로드가 끝났는데 버튼 없음 (영업 종료)
+    not_found  존재하지 않는 페이지 (404)
+    loading    문서 로드가 아직 끝나지 않음
+"""
+
+import time
+
+from config import (
+    SELLER_INFO_BUTTON_XPATH, CAPTCHA_SELECTORS, CAPTCHA_CLOSE_SELECTORS, NOT_FOUND_MARKERS,
+    PAGE_STATE_BUTTON_WAIT, PAGE_STATE_LOAD_TIMEOUT, PAGE_STATE_POLL_INTERVAL
+)
+
+
+class PageState:
+    """페이지 판정 값"""
+    READY = 'ready'
+    CAPTCHA = 'captcha'
+    CLOSED = 'closed'
+    NOT_FOUND = 'not_found'
+    LOADING = 'loading'
+
+
+# 더 기다려도 바뀌지 않는 판정
+SETTLED_STATES = (PageState.READY, PageState.CAPTCHA, PageState.NOT_FOUND)
+
+# 프로브 선택자 기본값 (스크립트 인자 순서: 버튼 XPath, 캡차, 캡차 닫기, 404 문구)
+DEFAULT_PROBE_SELECTORS = (SELLER_INFO_BUTTON_XPATH, CAPTCHA_SELECTORS, CAPTCHA_CLOSE_SELECTORS, NOT_FOUND_MARKERS)
+
+# 스크립트 식별용 표시 (가짜 드라이버가 같은 응답을 흉내낼 때 사용)
+PROBE_MARKER = '/* page-state-probe */'
+
+PROBE_SCRIPT = PROBE_MARKER + """
+const [buttonXPath, captchaSelectors, closeSelectors, notFoundMarkers] = arguments;
+const visible = (element) => element.offsetParent !== null || element.getClientRects().length > 0;
+const matches = (selectors, visibleOnly) => {
+    const found = [];
+    for (const selector of selectors) {
+        let element = null;
+        try { element = document.querySelector(selector); } catch (e) {}
+        if (element && (!visibleOnly || visible(element))) found.push([selector, element]);
+    }
+    return found;
+};
+let button = null;
+try {
+    button = document.evaluate(buttonXPath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+} catch (e) {}
+const head = document.title + '\\n' + (document.body ? document.body.innerText.slice(0, 500) : '');
+return {
+    ready_state: document.readyState,
+    url: location.href,
+    head: head,
+    button: button,
+    captcha: matches(captchaSelectors, true),   // 숨겨진 캡차 틀은 무시
+    close: matches(closeSelectors),
+    not_found: notFoundMarkers.find((marker) => head.includes(marker)) || null
+};
+"""
+
+
+class ProbeResult:
+    """프로브 1회 결과 (판정 + 매칭된 요소)"""
+
+    __slots__ = ('state', 'ready_state', 'url', 'button', 'captcha', 'close', 'not_found', 'probes')
+
+    def __init__(self, raw, probes=1):
+        self.ready_state = raw.get('ready_state') or 'complete'
+        self.url = raw.get('url') or ''
+        self.button = raw.get('button')                     # 판매자 정보 버튼 요소 (없으면 None)
+        self.captcha = dict(raw.get('captcha') or [])       # 선택자 → 요소
+        self.close = dict(raw.get('close') or [])           # 캡차 닫기 선택자 → 요소
+        self.not_found = raw.get('not_found')               # 일치한 404 문구
+        self.probes = probes                                # 판정까지 실행한 프로브 횟수
+        self.state = classify(self)
+
+    def __repr__(self):
+        return f"ProbeResult(state={self.state!r}, captcha={list(self.captcha)}, probes={self.probes})"
+
+
+def classify(result):
+    """프로브 결과 → 판정 (404 > 캡차 > 버튼 > 로딩 > 영업 종료 순)"""
+    if result.not_found:
+        return PageState.NOT_FOUND
+    if result.captcha:
+        return PageState.CAPTCHA
+    if result.button is not None:
+        return PageState.READY
+    if result.ready_state != 'complete':
+        return PageState.LOADING
+    return PageState.CLOSED
+
+
+def _first(driver, by, selector):
+    try:
+        found = driver.find_elements(by, selector)
+    except Exception:
+        return None
+    return found[0] if found else None
+
+
+def _probe_by_queries(driver, selectors=DEFAULT_PROBE_SELECTORS):
+    """스크립트를 실행할 수 없는 드라이버용 (저장된 HTML 재생 등) - 선택자별로 검색"""
+    from selenium.webdriver.common.by import By
+
+    button_xpath, captcha_selectors, close_selectors, not_found_markers = selectors
+
+    title = _first(driver, By.TAG_NAME, 'title')
+    body = _first(driver, By.TAG_NAME, 'body')
+    head = (title.text if title else '') + '\n' + (body.text[:500] if body else '')
+    captcha = [(s, e) for s in captcha_selectors for e in [_first(driver, By.CSS_SELECTOR, s)] if e is not None]
+    close = [(s, e) for s in close_selectors for e in [_first(driver, By.CSS_SELECTOR, s)] if e is not None]
+    return {
+        'button': _first(driver, By.XPATH, button_xpath),
+        'head': head,
+        'captcha': captcha,
+        'close': close,
+        'not_found': next((m for m in not_found_markers if m in head), None)
+    }
+
+
+def probe_page(driver, probes=1, selectors=DEFAULT_PROBE_SELECTORS):
+    """현재 페이지 상태를 한 번 판정 (WebDriver 호출 1회)"""
+    raw = None
+    if hasattr(driver, 'execute_script'):
+        raw = driver.execute_script(PROBE_SCRIPT, *selectors)
+    if not isinstance(raw, dict):
+        raw = _probe_by_queries(driver, selectors)
+    return ProbeResult(raw, probes)
+
+
+def wait_for_page_state(driver, button_wait=PAGE_STATE_BUTTON_WAIT, load_timeout=PAGE_STATE_LOAD_TIMEOUT,
+                        poll=PAGE_STATE_POLL_INTERVAL, selectors=DEFAULT_PROBE_SELECTORS):
+    """판정이 확정될 때까지 프로브 반복
+
+    ready/captcha/not_found는 즉시 반환한다. 로드가 끝났는데 버튼이 없으면
+    로드 완료를 처음 본 시점부터 button_wait 동안 버튼이 나타나길 기다린 뒤
+    closed, 로드가 load_timeout 안에 끝나지 않으면 loading을 반환한다.
+    selectors는 DEFAULT_PROBE_SELECTORS와 같은 순서의
+    (버튼 XPath, 캡차, 캡차 닫기, 404 문구) 튜플이다.
+    """
+    started = time.monotonic()
+    loaded_at = None        # 버튼 없이 로드가 끝난 것을 처음 본 시각
+    probes = 1
+    result = probe_page(driver, probes, selectors)
+    while result.state not in SETTLED_STATES:
+        now = time.monotonic()
+        if result.state == PageState.CLOSED:
+            if loaded_at is None:
+                loaded_at = now
+            if now - loaded_at >= button_wait:
+                break
+        elif now - started >= load_timeout:
+            break
+        time.sleep(poll)
+        probes += 1
+        result = probe_page(driver, probes, selectors)
+    return result
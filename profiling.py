@@ -0,0 +1,148 @@
+# profiling.py
+"""
+CPU 프로파일링 모듈 (함수별 리포트 + 플레임그래프용 collapsed stack 출력)
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('sample', 'cprofile')
+DEFAULT_SAMPLE_INTERVAL = 0.005    # 샘플링 간격 (초)
+REPORT_TOP = 40                    # 리포트에 출력할 함수 수
+
+
+def _frame_label(frame):
+    """프레임 → 'file.py:function' 라벨"""
+    code = frame.f_code
+    filename = code.co_filename.replace('\\', '/').rsplit('/', 1)[-1]
+    return f"{filename}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """대상 스레드의 콜스택을 일정 간격으로 수집하는 샘플링 프로파일러
+
+    결정적 프로파일러(cProfile)와 달리 함수 호출마다 훅이 걸리지 않아
+    실제 수집 속도에 거의 영향을 주지 않는다. 대기(sleep/WebDriver 응답)
+    시간도 스택에 그대로 잡히므로 벽시계 기준으로 어디서 시간을 쓰는지 보인다.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks = Counter()        # (루트 → 말단 라벨 튜플) → 샘플 수
+        self.sample_count = 0
+        self.elapsed = 0.0
+        self._running = False
+        self._thread = None
+        self._started_at = None
+
+    def start(self):
+        self._running = True
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.elapsed = time.perf_counter() - self._started_at
+
+    def _sample_loop(self):
+        while self._running:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += 1
+                self.sample_count += 1
+            time.sleep(self.interval)
+
+    def write_folded(self, path):
+        """collapsed stack 형식 ('a;b;c 샘플수') - flamegraph.pl / speedscope에서 바로 열림"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def function_stats(self):
+        """함수별 (자체 샘플 수, 누적 샘플 수)"""
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+        return self_counts, total_counts
+
+    def format_report(self, top=REPORT_TOP):
+        """함수별 리포트 문자열 (누적 비율 순)"""
+        self_counts, total_counts = self.function_stats()
+        total = self.sample_count or 1
+        lines = [
+            f"샘플링 프로파일: {self.sample_count}개 샘플 / {self.elapsed:.1f}초 (간격 {self.interval * 1000:.0f}ms)",
+            "",
+            f"{'누적%':>7} {'자체%':>7} {'누적샘플':>8}  함수"
+        ]
+        for label, count in total_counts.most_common(top):
+            lines.append(
+                f"{count / total * 100:6.1f}% {self_counts[label] / total * 100:6.1f}% {count:8d}  {label}"
+            )
+        return '\n'.join(lines) + '\n'
+
+
+def _write_cprofile_report(profiler, path, top=REPORT_TOP):
+    """cProfile 결과 → 누적/자체 시간 순 함수별 리포트"""
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer).strip_dirs()
+    stats.sort_stats('cumulative').print_stats(top)
+    stats.sort_stats('tottime').print_stats(top)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(buffer.getvalue())
+
+
+@contextmanager
+def profile_run(prefix, mode='sample', interval=DEFAULT_SAMPLE_INTERVAL):
+    """with 블록 실행을 프로파일링하고 <prefix>.* 파일로 저장
+
+    - sample:   <prefix>.folded (플레임그래프), <prefix>.txt (함수별 리포트)
+    - cprofile: <prefix>.prof (pstats/snakeviz), <prefix>.txt (함수별 리포트)
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"알 수 없는 프로파일 모드: {mode} (사용 가능: {', '.join(PROFILE_MODES)})")
+
+    report_path = f"{prefix}.txt"
+
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{prefix}.prof")
+            _write_cprofile_report(profiler, report_path)
+            print(f"📈 프로파일 저장: {prefix}.prof, {report_path}")
+        return
+
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.write_folded(f"{prefix}.folded")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(profiler.format_report())
+        print(f"📈 프로파일 저장: {prefix}.folded, {report_path} ({profiler.sample_count}개 샘플)")
@@ -0,0 +1,134 @@
+# report.py
+"""
+연락처 변경 리포트 모듈 (원본 전화번호/이메일 ↔ 최신화 컬럼 벡터 비교)
+"""
+
+import logging
+import pathlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import EXCEL_FILE_PATH, COLUMNS, REPORT_SUFFIX, REPORT_CATEGORIES
+from normalization import normalize_phone_series, normalize_email_series
+
+logger = logging.getLogger(__name__)
+
+# 리포트에 필요한 컬럼만 읽음
+REPORT_COLUMNS = [
+    COLUMNS['STORE_KEY'],
+    COLUMNS['COMPANY_NAME'],
+    COLUMNS['STORE_URL'],
+    COLUMNS['ORIGINAL_PHONE'],
+    COLUMNS['ORIGINAL_EMAIL'],
+    COLUMNS['UPDATED_PHONE'],
+    COLUMNS['UPDATED_EMAIL']
+]
+
+CATEGORY_COLUMN = '변경 구분'
+PHONE_CHANGED_COLUMN = '전화번호 변경'
+EMAIL_CHANGED_COLUMN = '이메일 변경'
+
+
+def normalize_phone_column(series):
+    """전화번호 컬럼 정규화 (표준 하이픈 형식, 형식을 모르면 숫자만, 빈 값은 '')"""
+    return normalize_phone_series(series, keep_invalid=True).fillna('')
+
+
+def normalize_email_column(series):
+    """이메일 컬럼 정규화 (유효한 주소는 표준 형식, 아니면 공백 제거 + 소문자, 빈 값은 '')"""
+    fallback = series.fillna('').astype(str).str.strip().str.lower()
+    return normalize_email_series(series).fillna(fallback)
+
+
+def classify_contacts(df):
+    """행별 변경 구분 계산 (벡터 연산만 사용)
+
+    Returns:
+        DataFrame: 변경 구분 / 전화번호 변경 / 이메일 변경 컬럼
+    """
+    updated_phone_raw = df[COLUMNS['UPDATED_PHONE']].fillna('').astype(str).str.strip()
+    updated_email_raw = df[COLUMNS['UPDATED_EMAIL']].fillna('').astype(str).str.strip()
+
+    closed = updated_phone_raw.str.startswith('영업종료')
+    error = updated_phone_raw.str.startswith('ERROR')
+    status_mark = closed | error
+
+    original_phone = normalize_phone_column(df[COLUMNS['ORIGINAL_PHONE']])
+    original_email = normalize_email_column(df[COLUMNS['ORIGINAL_EMAIL']])
+    updated_phone = normalize_phone_column(updated_phone_raw.where(~status_mark, ''))
+    updated_email = normalize_email_column(updated_email_raw)
+
+    has_phone = updated_phone != ''
+    has_email = updated_email != ''
+
+    # 최신화 값이 있는 컬럼만 비교
+    phone_changed = has_phone & (updated_phone != original_phone)
+    email_changed = has_email & (updated_email != original_email)
+    processed = ~status_mark & (has_phone | has_email)
+
+    category = np.select(
+        [closed, error, processed & (phone_changed | email_changed), processed],
+        [
+            REPORT_CATEGORIES['CLOSED'],
+            REPORT_CATEGORIES['ERROR'],
+            REPORT_CATEGORIES['CHANGED'],
+            REPORT_CATEGORIES['UNCHANGED']
+        ],
+        default=REPORT_CATEGORIES['PENDING']
+    )
+
+    return pd.DataFrame({
+        CATEGORY_COLUMN: category,
+        PHONE_CHANGED_COLUMN: phone_changed.to_numpy(),
+        EMAIL_CHANGED_COLUMN: email_changed.to_numpy()
+    }, index=df.index)
+
+
+def build_contact_report(df):
+    """리포트 데이터프레임과 구분별 건수 반환"""
+    df = df.reindex(columns=REPORT_COLUMNS)
+    report = pd.concat([df, classify_contacts(df)], axis=1)
+
+    counts = report[CATEGORY_COLUMN].value_counts().reindex(
+        list(REPORT_CATEGORIES.values()), fill_value=0
+    )
+    return report, counts
+
+
+def get_report_path(file_path):
+    """리포트 파일 경로 (<원본>_report.csv)"""
+    path = pathlib.Path(file_path)
+    return path.with_name(f"{path.stem}{REPORT_SUFFIX}.csv")
+
+
+def run_report(file_path=None, output_path=None, include_pending=False):
+    """연락처 변경 리포트 생성 및 저장"""
+    file_path = file_path or EXCEL_FILE_PATH
+    output_path = output_path or get_report_path(file_path)
+
+    start_time = time.perf_counter()
+
+    df = pd.read_csv(
+        file_path,
+        encoding='utf-8',
+        usecols=lambda column: column in REPORT_COLUMNS,
+        dtype=str
+    )
+    report, counts = build_contact_report(df)
+
+    if not include_pending:
+        report = report[report[CATEGORY_COLUMN] != REPORT_CATEGORIES['PENDING']]
+    report.to_csv(output_path, index=False, encoding='utf-8')
+
+    elapsed = time.perf_counter() - start_time
+
+    print("📊 연락처 변경 리포트")
+    print(f"   대상 파일: {file_path} ({len(df)}개 행)")
+    for category, count in counts.items():
+        print(f"   {category}: {count}개")
+    print(f"💾 리포트 저장: {output_path} ({len(report)}개 행, {elapsed:.2f}초)")
+    logger.info(f"연락처 변경 리포트 저장: {output_path}")
+
+    return counts
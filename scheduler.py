@@ -0,0 +1,103 @@
+# scheduler.py
+"""
+처리 순서 스케줄러 모듈 (정책별 점수 → 작업 큐 정렬)
+"""
+
+import logging
+
+import pandas as pd
+
+from config import COLUMNS, SCHEDULING_POLICIES, GRADE_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+# 정책 이름 → 점수 함수 (점수가 높을수록 먼저 처리)
+POLICIES = {}
+
+
+def register_policy(name):
+    """스케줄링 정책 등록 데코레이터
+
+    점수 함수는 작업 대상 DataFrame을 받아 같은 인덱스의 숫자형 Series를 반환한다.
+    """
+    def decorator(func):
+        POLICIES[name] = func
+        return func
+    return decorator
+
+
+def _column(df, key):
+    """컬럼이 없으면 빈 Series 반환"""
+    column = COLUMNS[key]
+    if column in df.columns:
+        return df[column]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _timestamp_score(series):
+    """일시 컬럼 → 정렬용 숫자 (파싱 불가/빈 값은 NaN)"""
+    parsed = pd.to_datetime(series, errors='coerce')
+    return (parsed - pd.Timestamp(0)).dt.total_seconds()
+
+
+@register_policy('bottom_up')
+def bottom_up(df):
+    """아래에서 위로 (기존 방식)"""
+    return pd.Series(range(len(df)), index=df.index, dtype=float)
+
+
+@register_policy('oldest_verified')
+def oldest_verified(df):
+    """최신화한 지 오래된 항목 먼저 (최신화 기록이 없으면 최우선)"""
+    score = -_timestamp_score(_column(df, 'UPDATED_AT'))
+    return score.fillna(float('inf'))
+
+
+@register_policy('active_grade')
+def active_grade(df):
+    """상태 Y 먼저, 그다음 높은 등급 먼저"""
+    active = _column(df, 'STATUS').astype(str).str.strip().str.upper().eq('Y')
+    grade = _column(df, 'GRADE').astype(str).str.strip().str.lower().map(GRADE_PRIORITY).fillna(0)
+    return active.astype(float) * 10 + grade
+
+
+@register_policy('recent_registered')
+def recent_registered(df):
+    """최근 등록된 입점사 먼저 (등록일이 없으면 마지막)"""
+    return _timestamp_score(_column(df, 'REGISTERED_AT')).fillna(float('-inf'))
+
+
+@register_policy('errors_last')
+def errors_last(df):
+    """이전에 에러가 난 항목은 나중에"""
+    errored = _column(df, 'UPDATED_PHONE').astype(str).str.startswith('ERROR', na=False)
+    return (~errored).astype(float)
+
+
+def parse_policies(value):
+    """'a,b' 문자열 또는 리스트 → 정책 이름 리스트 (알 수 없는 정책은 에러)"""
+    if value is None:
+        return list(SCHEDULING_POLICIES)
+    if isinstance(value, str):
+        value = [name.strip() for name in value.split(',') if name.strip()]
+
+    unknown = [name for name in value if name not in POLICIES]
+    if unknown:
+        raise ValueError(f"알 수 없는 스케줄링 정책: {', '.join(unknown)} (사용 가능: {', '.join(POLICIES)})")
+    return list(value)
+
+
+def order_stores(df, policies=None):
+    """정책 점수 순으로 작업 큐 정렬 (앞의 정책 우선, 동점은 아래에서 위로, 원본 인덱스 유지)"""
+    policies = parse_policies(policies)
+
+    scores = pd.DataFrame(index=df.index)
+    for position, name in enumerate(policies):
+        scores[f"p{position}"] = POLICIES[name](df)
+    if 'bottom_up' not in policies:
+        scores['tiebreak'] = bottom_up(df)
+
+    order = scores.sort_values(list(scores.columns), ascending=False, kind='stable').index
+    logger.info(f"처리 순서 정책: {' > '.join(policies)}")
+
+    return df.loc[order]
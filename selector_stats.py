@@ -0,0 +1,136 @@
+# selector_stats.py
+"""
+선택자 적중률 통계 모듈 (최근 적중률 순으로 시도 순서 결정, 실행 간 유지)
+
+후보(컨테이너 선택자, 라벨/값 레이아웃 등)마다 시도/적중 횟수를 지수 감쇠로
+누적한다. 최근 적중률이 높은 후보부터 시도하므로 마크업이 바뀌어도 몇 번의
+실패 후에는 새로 맞는 후보가 맨 앞으로 온다. 잘 맞던 후보가 다른 후보에게
+맨 앞자리를 내주거나, 맨 앞 후보의 적중률이 최고치보다 크게 떨어지면
+(모든 후보가 함께 안 맞는 경우 - 마크업 변경 가능성) 경고한다.
+
+샤드 작업자는 작업자별 파일(selector_stats.2.json)에 저장해 서로 덮어쓰지 않는다.
+작업자 파일이 아직 없으면 공용 파일에서 시작한다.
+"""
+
+import json
+import logging
+import os
+
+from config import (
+    SELECTOR_STATS_PATH, SELECTOR_STATS_DECAY, SELECTOR_STATS_SAVE_EVERY,
+    SELECTOR_TRUSTED_RATE, SELECTOR_TRUSTED_MIN_ATTEMPTS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def stats_path(path, worker=None):
+    """작업자별 통계 파일 경로 (selector_stats.json → selector_stats.2.json, 작업자 없으면 그대로)"""
+    if not path or worker is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{worker}{ext}"
+
+
+class SelectorStats:
+    """그룹별 후보 적중률 (그룹 예: 'container', 'layout')"""
+
+    def __init__(self, path=None, decay=SELECTOR_STATS_DECAY):
+        self.path = path
+        self.decay = decay
+        self.stats = {}         # 'group' → {'후보': {'attempts', 'hits', 'peak'}}
+        self.leaders = {}       # 'group' → 마지막으로 맨 앞이었던 후보
+        self.collapsed = set()  # 적중률 급락을 이미 경고한 그룹 (회복하면 해제)
+        self._unsaved = 0
+
+    @classmethod
+    def load(cls, path=SELECTOR_STATS_PATH, worker=None):
+        """저장된 통계 불러오기 (작업자 파일 → 공용 파일 순, 없거나 깨졌으면 빈 통계)"""
+        stats = cls(stats_path(path, worker))
+        for source in dict.fromkeys([stats.path, path]):
+            if not source or not os.path.exists(source):
+                continue
+            try:
+                with open(source, encoding='utf-8') as f:
+                    stats.stats = json.load(f)
+                break
+            except (OSError, ValueError) as e:
+                logger.warning(f"선택자 통계 불러오기 실패 ({source}): {e}")
+        return stats
+
+    def save(self):
+        if not self.path or not self._unsaved:
+            return
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"     # 같은 파일을 쓰는 다른 프로세스와 겹치지 않도록
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+        except OSError as e:
+            logger.warning(f"선택자 통계 저장 실패: {e}")
+
+    def rate(self, group, candidate):
+        """최근 적중률 (관측이 없으면 0.5 - 라플라스 보정)"""
+        entry = self.stats.get(group, {}).get(candidate)
+        if not entry:
+            return 0.5
+        return (entry['hits'] + 1) / (entry['attempts'] + 2)
+
+    def order(self, group, candidates):
+        """적중률 높은 순으로 정렬 (같으면 설정 순서 유지)"""
+        ordered = sorted(candidates, key=lambda c: -self.rate(group, c))
+        if ordered:
+            self._check_leader(group, ordered[0])
+        return ordered
+
+    def record(self, group, candidate, hit):
+        """시도 결과 기록 (이전 관측은 decay만큼 감쇠)"""
+        entry = self.stats.setdefault(group, {}).setdefault(
+            candidate, {'attempts': 0.0, 'hits': 0.0, 'peak': 0.0}
+        )
+        entry['attempts'] = entry['attempts'] * self.decay + 1
+        entry['hits'] = entry['hits'] * self.decay + (1 if hit else 0)
+        if entry['attempts'] >= SELECTOR_TRUSTED_MIN_ATTEMPTS:
+            entry['peak'] = max(entry['peak'], entry['hits'] / entry['attempts'])
+
+        self._unsaved += 1
+        if SELECTOR_STATS_SAVE_EVERY and self._unsaved >= SELECTOR_STATS_SAVE_EVERY:
+            self.save()
+
+    def _check_leader(self, group, leader):
+        """잘 맞던 후보가 맨 앞자리를 내주거나, 맨 앞 후보의 적중률이 최고치 대비 급락하면 경고"""
+        previous = self.leaders.get(group)
+        self.leaders[group] = leader
+        if previous is not None and previous != leader:
+            entry = self.stats.get(group, {}).get(previous)
+            if entry and entry['peak'] >= SELECTOR_TRUSTED_RATE:
+                logger.warning(
+                    f"선택자 교체: [{group}] {previous} (최고 {entry['peak']:.0%} → "
+                    f"{self.rate(group, previous):.0%}) 대신 {leader} 우선 (마크업 변경 가능성)"
+                )
+
+        # 모든 후보가 함께 안 맞으면 맨 앞자리는 그대로라 교체 경고가 나오지 않음
+        entry = self.stats.get(group, {}).get(leader)
+        if not entry or entry['peak'] < SELECTOR_TRUSTED_RATE:
+            return
+        rate = self.rate(group, leader)
+        if rate < entry['peak'] * SELECTOR_TRUSTED_RATE:
+            if group not in self.collapsed:
+                self.collapsed.add(group)
+                logger.warning(
+                    f"선택자 적중률 급락: [{group}] {leader} (최고 {entry['peak']:.0%} → {rate:.0%}) "
+                    f"- 다른 후보도 맞지 않음 (마크업 변경 가능성)"
+                )
+        else:
+            self.collapsed.discard(group)
+
+    def summary(self):
+        """그룹별 (후보, 최근 적중률, 감쇠 시도 수) - 적중률 순"""
+        return {
+            group: [
+                (candidate, round(self.rate(group, candidate), 3), round(entry['attempts'], 1))
+                for candidate, entry in sorted(entries.items(), key=lambda item: -self.rate(group, item[0]))
+            ]
+            for group, entries in self.stats.items()
+        }
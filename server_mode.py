@@ -0,0 +1,236 @@
+# server_mode.py
+"""
+서버(무인) 실행 모듈 - 창 없는 Chrome/가상 디스플레이, 로그인 세션 파일, 캡차 원격 알림
+
+    desktop   화면에 Chrome 창 (콘솔에서 로그인/캡차 처리, 기본)
+    headless  창 없는 Chrome (--headless=new)
+    xvfb      가상 디스플레이(Xvfb)의 일반 Chrome (headless가 차단될 때)
+
+서버 모드(headless/xvfb)는 콘솔 입력을 기다리지 않는다. 로그인은 데스크톱에서
+`python main.py login`으로 저장한 쿠키 파일을 불러오고, 캡차가 나오면 스크린샷을
+저장하고 웹훅으로 알린 뒤 CAPTCHA_HANDOFF_WAIT 동안만 기다렸다가 captcha 실패로
+남긴다. 남은 캡차 스토어는 데스크톱에서 `run --captcha-only`로 처리한다.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import signal
+import subprocess
+import time
+from datetime import datetime
+
+from config import (
+    BROWSER_WINDOW_SIZE, SESSION_COOKIES_PATH, CAPTCHA_HANDOFF_DIR, CAPTCHA_HANDOFF_WEBHOOK
+)
+from structured_log import say, flush as flush_logs
+
+logger = logging.getLogger(__name__)
+
+BROWSER_MODES = ('desktop', 'headless', 'xvfb')
+SERVER_MODES = ('headless', 'xvfb')
+
+# 네이버 로그인 쿠키 (없으면 로그인되지 않은 세션)
+AUTH_COOKIES = ('NID_AUT', 'NID_SES')
+
+XVFB_START_TIMEOUT = 10     # Xvfb가 디스플레이 번호를 알려줄 때까지 대기 (초)
+WEBHOOK_TIMEOUT = 5
+
+
+def chrome_arguments(mode, window_size=BROWSER_WINDOW_SIZE):
+    """모드별 추가 Chrome 인자 (headless 자체는 uc.Chrome(headless=True)가 처리)"""
+    if mode not in BROWSER_MODES:
+        raise ValueError(f"알 수 없는 브라우저 모드: {mode} (사용 가능: {', '.join(BROWSER_MODES)})")
+    if mode == 'desktop':
+        return []
+    width, height = window_size
+    return [
+        f"--window-size={width},{height}",
+        "--disable-gpu",                # 서버에는 GPU가 없음 (소프트웨어 렌더링)
+        "--no-default-browser-check",
+        "--password-store=basic"        # 키링 잠금 해제 창 방지
+    ]
+
+
+def profile_path(template, worker=None):
+    """BROWSER_PROFILE_DIR 템플릿 → 작업자별 절대 경로 (None이면 None - 임시 프로필)"""
+    if not template:
+        return None
+    path = os.path.abspath(template.format(worker=worker if worker is not None else 0))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class VirtualDisplay:
+    """Xvfb 가상 디스플레이 (빈 디스플레이 번호를 Xvfb가 직접 고름 - 작업자 여러 개 동시 실행 가능)"""
+
+    def __init__(self, size=BROWSER_WINDOW_SIZE, depth=24):
+        self.size = size
+        self.depth = depth
+        self.process = None
+        self.display = None
+        self._previous = None
+
+    def start(self):
+        binary = shutil.which('Xvfb')
+        if not binary:
+            raise RuntimeError("Xvfb가 설치되어 있지 않습니다 (apt install xvfb) - headless 모드를 사용하세요")
+
+        read_fd, write_fd = os.pipe()
+        width, height = self.size
+        try:
+            self.process = subprocess.Popen(
+                [binary, '-displayfd', str(write_fd), '-screen', '0', f'{width}x{height}x{self.depth}',
+                 '-nolisten', 'tcp'],
+                pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True      # Ctrl+C가 Xvfb에 먼저 전달되지 않도록
+            )
+        finally:
+            os.close(write_fd)
+
+        number = self._read_display_number(read_fd)
+        if number is None:
+            self.stop()
+            raise RuntimeError("Xvfb 시작 실패 (디스플레이 번호를 받지 못함)")
+
+        self.display = f":{number}"
+        self._previous = os.environ.get('DISPLAY')
+        os.environ['DISPLAY'] = self.display
+        say(f"🖥️ 가상 디스플레이 시작: {self.display} ({width}x{height})")
+        return self
+
+    def _read_display_number(self, read_fd):
+        """-displayfd로 받은 디스플레이 번호 (Xvfb가 종료되거나 시간 초과면 None)"""
+        import select
+
+        data = b''
+        deadline = time.monotonic() + XVFB_START_TIMEOUT
+        with os.fdopen(read_fd, 'rb', buffering=0) as pipe:
+            while b'\n' not in data:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([pipe], [], [], remaining)[0]:
+                    return None
+                chunk = pipe.read(16)
+                if not chunk:       # Xvfb 종료
+                    return None
+                data += chunk
+        match = re.match(rb'\s*(\d+)', data)
+        return int(match.group(1)) if match else None
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+        if self.display and os.environ.get('DISPLAY') == self.display:
+            if self._previous is None:
+                os.environ.pop('DISPLAY', None)
+            else:
+                os.environ['DISPLAY'] = self._previous
+        self.display = None
+
+
+def save_session_file(cookies, path=SESSION_COOKIES_PATH):
+    """로그인 쿠키 파일 저장 (본인만 읽기 가능 - 로그인 정보와 같음)"""
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'saved_at': datetime.now().isoformat(timespec='seconds'), 'cookies': cookies}, f,
+                  ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_session_file(path=SESSION_COOKIES_PATH):
+    """로그인 쿠키 파일 → 쿠키 목록 (없거나 깨졌으면 빈 목록)"""
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('cookies') or []
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"로그인 쿠키 파일을 읽을 수 없음 ({path}): {e}")
+        return []
+
+
+def session_expiry(cookies):
+    """로그인 쿠키 상태 → (로그인 쿠키 있음, 가장 이른 만료 시각 또는 None)"""
+    auth = [cookie for cookie in cookies if cookie.get('name') in AUTH_COOKIES]
+    expires = [cookie['expires'] for cookie in auth if (cookie.get('expires') or -1) > 0]
+    return bool(auth), (datetime.fromtimestamp(min(expires)) if expires else None)
+
+
+def export_login_session(path=SESSION_COOKIES_PATH):
+    """데스크톱 Chrome에서 직접 로그인 → 쿠키 파일 저장 (서버 작업자용)"""
+    from browser_handler import BrowserHandler
+
+    handler = BrowserHandler(mode='desktop')
+    handler.setup_driver()
+    try:
+        handler.navigate_to_url("https://nid.naver.com/nidlogin.login")
+        say("브라우저에서 네이버에 로그인해주세요. ('로그인 상태 유지'를 선택하면 쿠키가 오래 유지됩니다)")
+        flush_logs()
+        input("로그인 완료 후 Enter를 눌러주세요...")
+        handler.save_session()
+    finally:
+        handler.close_driver()
+
+    logged_in, expires = session_expiry(handler.session_cookies)
+    if not logged_in:
+        print(f"❌ 로그인 쿠키({', '.join(AUTH_COOKIES)})가 없습니다 - 로그인 후 다시 실행하세요")
+        return False
+    save_session_file(handler.session_cookies, path)
+    print(f"✅ 로그인 쿠키 저장: {path} ({len(handler.session_cookies)}개"
+          + (f", {expires:%Y-%m-%d %H:%M} 만료)" if expires else ", 브라우저 세션 쿠키)"))
+    print("   서버로 복사한 뒤 run --browser-mode headless/xvfb로 실행하세요 (비밀번호처럼 관리).")
+    return True
+
+
+class CaptchaHandoff:
+    """서버 모드 캡차 알림 (스크린샷 저장 + 웹훅)"""
+
+    def __init__(self, directory=CAPTCHA_HANDOFF_DIR, webhook=CAPTCHA_HANDOFF_WEBHOOK):
+        self.directory = directory
+        self.webhook = webhook
+        self.count = 0
+
+    def _screenshot(self, driver, task):
+        if not self.directory:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{task.store_key}_{datetime.now():%Y%m%d_%H%M%S}.png")
+        try:
+            return path if driver.save_screenshot(path) else None
+        except Exception as e:
+            logger.warning(f"캡차 스크린샷 저장 실패: {e}")
+            return None
+
+    def _post(self, payload):
+        import urllib3
+
+        try:
+            response = urllib3.request('POST', self.webhook, json=payload, timeout=WEBHOOK_TIMEOUT, retries=1)
+            if response.status >= 400:
+                logger.warning(f"캡차 알림 웹훅 응답 {response.status}")
+        except Exception as e:
+            logger.warning(f"캡차 알림 웹훅 실패: {e}")
+
+    def notify(self, driver, task, reason):
+        """스크린샷 저장 후 웹훅 알림 → 스크린샷 경로 (저장 못 하면 None)"""
+        self.count += 1
+        screenshot = self._screenshot(driver, task)
+        message = f"🔐 캡차 ({reason}): {task.name} [{task.store_key}] {task.url}"
+        say(f"📸 {message}" + (f" - 스크린샷: {screenshot}" if screenshot else ""), screenshot=screenshot)
+        if self.webhook:
+            # Slack은 text, Discord는 content를 표시 (나머지 필드는 직접 만든 수신기용)
+            self._post({
+                'text': message, 'content': message, 'store_key': str(task.store_key),
+                'store_name': task.name, 'url': task.url, 'reason': reason,
+                'screenshot': os.path.abspath(screenshot) if screenshot else None,
+                'display': os.environ.get('DISPLAY')
+            })
+        return screenshot
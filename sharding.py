@@ -0,0 +1,134 @@
+# sharding.py
+"""
+분산 처리 모듈 (고유번호 기준 샤드 분할 및 결과 병합)
+"""
+
+import logging
+import pathlib
+import zlib
+
+import pandas as pd
+
+from config import EXCEL_FILE_PATH, COLUMNS, FIELD_RULES, SHARD_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+# 샤드 결과 파일에 기록되는 컬럼 (최신화 결과 + 일시)
+RESULT_COLUMNS = list(dict.fromkeys(
+    [COLUMNS['UPDATED_PHONE'], COLUMNS['UPDATED_EMAIL']]
+    + [rule['column'] for rule in FIELD_RULES]
+    + [COLUMNS['UPDATED_AT']]
+))
+
+
+def parse_shard(value):
+    """'2/4' 형식 → (2, 4) (1부터 시작)"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"샤드 형식이 잘못됨: {value} (예: 1/4)")
+
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"샤드 번호 범위 오류: {value}")
+    return index, count
+
+
+def shard_numbers(keys, count):
+    """스토어 키 → 샤드 번호 (1..count, 머신/실행과 무관하게 항상 동일)"""
+    return keys.astype(str).map(lambda key: zlib.crc32(key.encode('utf-8')) % count + 1)
+
+
+def select_shard(df, index, count):
+    """작업 큐에서 해당 샤드에 속한 행만 선택 (순서/인덱스 유지)"""
+    mask = shard_numbers(df[COLUMNS['STORE_KEY']], count) == index
+    return df[mask]
+
+
+def get_shard_path(file_path, index, count):
+    """샤드 결과 파일 경로 (<원본>_shard1of4.csv)"""
+    path = pathlib.Path(file_path)
+    suffix = SHARD_SUFFIX.format(index=index, count=count)
+    return path.with_name(f"{path.stem}{suffix}.csv")
+
+
+def extract_results(df, indices):
+    """처리된 행의 결과 컬럼만 추출 (샤드 결과 파일 형식)"""
+    columns = [COLUMNS['STORE_KEY'], COLUMNS['COMPANY_NAME']] + RESULT_COLUMNS
+    return df.loc[list(indices)].reindex(columns=columns)
+
+
+def ensure_text_column(df, column):
+    """문자열을 기록할 수 있도록 컬럼 준비 (없으면 생성, 빈 숫자형(float64) 컬럼은 object로 변환)"""
+    if column not in df.columns:
+        df[column] = pd.Series(None, index=df.index, dtype=object)
+    elif pd.api.types.is_numeric_dtype(df[column]):
+        df[column] = df[column].astype(object)
+
+
+def _latest_results(results):
+    """같은 고유번호가 여러 번 있으면 최신 일시 결과만 남김 (동일 일시는 정상 결과 우선)"""
+    key = COLUMNS['STORE_KEY']
+    results = results[results[COLUMNS['UPDATED_AT']].notna()].copy()
+    results[key] = results[key].astype(str)
+    results['_ts'] = pd.to_datetime(results[COLUMNS['UPDATED_AT']], errors='coerce')
+    results['_ok'] = ~results[COLUMNS['UPDATED_PHONE']].astype(str).str.startswith('ERROR', na=False)
+
+    results = results.sort_values(['_ts', '_ok'], kind='stable', na_position='first')
+    return results.drop_duplicates(key, keep='last').set_index(key)
+
+
+def apply_results(df, results):
+    """결과를 원본 DataFrame에 반영 (고유번호 기준, 더 최신 일시만 덮어씀)
+
+    Returns:
+        tuple: (반영된 행 수, 원본에 없는 고유번호 수)
+    """
+    key = COLUMNS['STORE_KEY']
+    latest = _latest_results(results)
+    if latest.empty:
+        return 0, 0
+
+    master_keys = df[key].astype(str)
+    incoming = latest.reindex(master_keys.to_numpy())
+
+    incoming_ts = incoming['_ts'].to_numpy()
+    master_ts = pd.to_datetime(
+        df.get(COLUMNS['UPDATED_AT'], pd.Series(None, index=df.index)), errors='coerce'
+    ).to_numpy()
+
+    # 원본에 일시가 없거나 결과가 더 최신(또는 동일)이면 결과 채택
+    take = pd.notna(incoming_ts) & (pd.isna(master_ts) | (incoming_ts >= master_ts))
+
+    for column in RESULT_COLUMNS:
+        if column not in incoming.columns:
+            continue
+        ensure_text_column(df, column)
+        df.loc[take, column] = incoming.loc[take, column].to_numpy()
+
+    unmatched = len(set(latest.index) - set(master_keys))
+    return int(take.sum()), unmatched
+
+
+def merge_shards(shard_paths, master_path=None, output_path=None):
+    """샤드 결과 파일들을 원본 CSV에 병합하여 저장"""
+    master_path = master_path or EXCEL_FILE_PATH
+    output_path = output_path or master_path
+
+    df = pd.read_csv(master_path, encoding='utf-8')
+    results = pd.concat(
+        [pd.read_csv(path, encoding='utf-8', dtype=str) for path in shard_paths],
+        ignore_index=True
+    )
+
+    applied, unmatched = apply_results(df, results)
+    df.to_csv(output_path, index=False, encoding='utf-8')
+
+    print("🔀 샤드 결과 병합")
+    print(f"   샤드 파일: {len(shard_paths)}개 ({len(results)}개 결과)")
+    print(f"   반영: {applied}개 행")
+    if unmatched:
+        print(f"   ⚠️ 원본에 없는 고유번호: {unmatched}개")
+    print(f"💾 병합 저장: {output_path}")
+    logger.info(f"샤드 결과 병합 완료: {applied}개 행 → {output_path}")
+
+    return applied
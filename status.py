@@ -0,0 +1,166 @@
+# status.py
+"""
+진행 현황 모듈 (Chrome/selenium 없이 필요한 컬럼만 읽어 건수 집계)
+"""
+
+import glob
+import json
+import pathlib
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from config import EXCEL_FILE_PATH, COLUMNS, STATUS_CATEGORIES, PLATFORM_PATTERNS, SHARD_SUFFIX
+from excel_handler import completed_mask
+from failures import never_retry_mask
+from sharding import apply_results
+from storefronts import http_store_mask
+
+STATUS_COLUMNS = [
+    COLUMNS['STORE_KEY'],
+    COLUMNS['STORE_URL'],
+    COLUMNS['UPDATED_PHONE'],
+    COLUMNS['UPDATED_EMAIL'],
+    COLUMNS['UPDATED_AT'],
+    COLUMNS['PENDING_REASON']
+]
+
+NO_URL_PLATFORM = 'URL 없음'
+OTHER_PLATFORM = '기타'
+COLLECTOR_PLATFORM = PLATFORM_PATTERNS[0][0]    # 수집기가 처리하는 플랫폼 (스마트스토어)
+
+
+def find_shard_results(file_path):
+    """아직 병합하지 않은 샤드 결과 파일 (<원본>_shard*of*.csv)"""
+    path = pathlib.Path(file_path)
+    pattern = SHARD_SUFFIX.format(index='*', count='*')
+    return sorted(glob.glob(str(path.with_name(f"{glob.escape(path.stem)}{pattern}.csv"))))
+
+
+def load_status_frame(file_path, shard_paths=()):
+    """현황 집계에 필요한 컬럼만 읽고 샤드 결과를 덮어씀"""
+    df = pd.read_csv(file_path, encoding='utf-8', usecols=lambda c: c in STATUS_COLUMNS, dtype=str)
+    df = df.reindex(columns=STATUS_COLUMNS)
+
+    if shard_paths:
+        results = pd.concat(
+            [pd.read_csv(p, encoding='utf-8', usecols=lambda c: c in STATUS_COLUMNS, dtype=str)
+             for p in shard_paths],
+            ignore_index=True
+        )
+        apply_results(df, results)
+    return df
+
+
+def classify_platforms(urls):
+    """URL → 플랫폼 이름 (벡터 연산)"""
+    urls = urls.fillna('').astype(str).str.strip()
+    conditions = [urls == ''] + [urls.str.contains(pattern, case=False, regex=True) for _, pattern in PLATFORM_PATTERNS]
+    choices = [NO_URL_PLATFORM] + [name for name, _ in PLATFORM_PATTERNS]
+    return pd.Series(np.select(conditions, choices, default=OTHER_PLATFORM), index=urls.index)
+
+
+def classify_status(df):
+    """행별 진행 상태 (수집기 필터와 같은 기준: 영업종료 > 영구 실패 > 오류 > 완료 > 미처리)"""
+    phone = df[COLUMNS['UPDATED_PHONE']]
+    phone_text = phone.fillna('').astype(str)
+
+    closed = phone_text.str.startswith('영업종료')
+    permanent = never_retry_mask(phone)
+    error = phone_text.str.startswith('ERROR')
+    done = completed_mask(phone, df[COLUMNS['UPDATED_EMAIL']])
+
+    return pd.Series(np.select(
+        [closed, permanent, error, done],
+        [STATUS_CATEGORIES['CLOSED'], STATUS_CATEGORIES['PERMANENT'], STATUS_CATEGORIES['ERROR'], STATUS_CATEGORIES['DONE']],
+        default=STATUS_CATEGORIES['PENDING']
+    ), index=df.index)
+
+
+def throughput(updated_at, now=None):
+    """최신화 일시 기준 최근 처리량"""
+    now = now or datetime.now()
+    stamps = pd.to_datetime(updated_at, errors='coerce')
+    last_hour = int((stamps >= now - timedelta(hours=1)).sum())
+    last_day = int((stamps >= now - timedelta(days=1)).sum())
+    latest = stamps.max()
+    return {
+        'last_hour': last_hour,
+        'last_24h': last_day,
+        'per_hour_24h': round(last_day / 24, 1),
+        'latest': None if pd.isna(latest) else latest.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def build_status(file_path=None, use_shards=True, now=None):
+    """진행 현황 dict (플랫폼별 상태 건수, 수집 대기 건수, 최근 처리량)"""
+    file_path = file_path or EXCEL_FILE_PATH
+    shard_paths = find_shard_results(file_path) if use_shards else []
+    df = load_status_frame(file_path, shard_paths)
+
+    status = classify_status(df)
+    platforms = classify_platforms(df[COLUMNS['STORE_URL']])
+    categories = list(STATUS_CATEGORIES.values())
+
+    table = pd.crosstab(platforms, status).reindex(columns=categories, fill_value=0)
+    table['합계'] = table.sum(axis=1)
+    table = table.sort_values('합계', ascending=False)
+
+    # 다음 run(스마트스토어)과 run --http/http(HTTP 어댑터 플랫폼)에서 처리할 건수 (미처리 + 재시도 가능한 오류)
+    waiting = status.isin([STATUS_CATEGORIES['PENDING'], STATUS_CATEGORIES['ERROR']])
+    browser_queue = int((waiting & (platforms == COLLECTOR_PLATFORM)).sum())
+    http_queue = int((waiting & http_store_mask(df[COLUMNS['STORE_URL']], platforms)).sum())
+    queue = browser_queue + http_queue
+    rate = throughput(df[COLUMNS['UPDATED_AT']], now)
+    per_hour = rate['last_hour'] or rate['per_hour_24h']
+
+    return {
+        'file': str(file_path),
+        'shards': shard_paths,
+        'total': len(df),
+        'totals': {c: int((status == c).sum()) for c in categories},
+        'flagged': int(df[COLUMNS['PENDING_REASON']].notna().sum()),
+        'platforms': {p: {c: int(v) for c, v in row.items()} for p, row in table.iterrows()},
+        'queue': queue,
+        'browser_queue': browser_queue,
+        'http_queue': http_queue,
+        'throughput': rate,
+        'eta_hours': round(queue / per_hour, 1) if per_hour else None
+    }
+
+
+def print_status(summary, elapsed):
+    """현황 표 출력"""
+    table = pd.DataFrame.from_dict(summary['platforms'], orient='index')
+    table.loc['합계'] = table.sum()
+    rate = summary['throughput']
+
+    print(f"📊 진행 현황: {summary['file']} ({summary['total']}개 행)")
+    if summary['shards']:
+        print(f"🔀 병합 전 샤드 결과 {len(summary['shards'])}개 반영")
+    print(table.to_string())
+    if summary['flagged']:
+        print(f"🆕 import 대기 표시: {summary['flagged']}개")
+    print(f"🎯 수집 대기 (미처리 + 오류): {summary['queue']}개 "
+          f"({COLLECTOR_PLATFORM} {summary['browser_queue']} / HTTP 어댑터 {summary['http_queue']})")
+    print(f"⚡ 최근 1시간: {rate['last_hour']}개 / 최근 24시간: {rate['last_24h']}개 (시간당 {rate['per_hour_24h']}개)")
+    if rate['latest']:
+        print(f"🕒 마지막 최신화: {rate['latest']}")
+    if summary['eta_hours'] is not None:
+        print(f"⏳ 예상 남은 시간: 약 {summary['eta_hours']}시간")
+    print(f"({elapsed:.2f}초)")
+
+
+def run_status(file_path=None, as_json=False, use_shards=True):
+    """진행 현황 출력 (as_json이면 JSON 한 덩어리로 출력 - cron/대시보드용)"""
+    start_time = time.perf_counter()
+    summary = build_status(file_path, use_shards)
+    elapsed = time.perf_counter() - start_time
+
+    if as_json:
+        print(json.dumps({**summary, 'elapsed': round(elapsed, 3)}, ensure_ascii=False))
+    else:
+        print_status(summary, elapsed)
+    return summary
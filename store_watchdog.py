@@ -0,0 +1,50 @@
+# store_watchdog.py
+"""
+스토어별 제한 시간 감시 모듈 (시간 초과 시 브라우저 강제 종료)
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class StoreWatchdog:
+    """스토어 1건 처리에 제한 시간을 거는 감시 타이머
+
+    제한 시간이 지나면 on_expire(브라우저 강제 종료)를 호출한다.
+    브라우저가 종료되면 멈춰 있던 WebDriver 호출이 예외로 빠져나오므로
+    메인 스레드는 disarm()의 반환값으로 시간 초과 여부를 확인한다.
+    """
+
+    def __init__(self, on_expire, deadline):
+        self.on_expire = on_expire
+        self.deadline = deadline
+        self.expired = False
+        self._timer = None
+
+    def arm(self, deadline=None):
+        """감시 시작"""
+        self.disarm()
+        self.expired = False
+        seconds = deadline or self.deadline
+        if not seconds:
+            return
+        self._timer = threading.Timer(seconds, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self):
+        self.expired = True
+        logger.warning(f"스토어 처리 제한 시간 초과 ({self.deadline}초) - 브라우저 강제 종료")
+        try:
+            self.on_expire()
+        except Exception as e:
+            logger.error(f"브라우저 강제 종료 실패: {e}")
+
+    def disarm(self):
+        """감시 해제 → 시간 초과 여부 반환"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        return self.expired
@@ -0,0 +1,482 @@
+# storefronts.py
+"""
+스토어프론트 어댑터 모듈 (네이버 외 URL을 브라우저 없이 HTTP로 처리)
+
+플랫폼(status.classify_platforms 기준)마다 어댑터를 등록한다. 어댑터는 정적 HTML에서
+판매자 정보를 추출하고, 요청은 연결을 재사용하는 HTTP 클라이언트(urllib3 PoolManager)
+하나를 여러 작업 스레드가 함께 쓴다. 결과는 메인 스레드가 CSV에 반영한다
+(DataFrame은 스레드에 안전하지 않음).
+
+    스마트스토어            브라우저 수집기 (collector.py)
+    기타 (자체 쇼핑몰 등)   CompanySiteAdapter - 하단 사업자 정보 (상호/대표자/사업자번호/주소/전화/이메일)
+    쿠팡/에이블리 등        등록 안 함 (정적 HTML에 판매자 정보가 없음 - 스크립트 렌더링/로그인 필요)
+
+로컬 HTML은 file:// URL 또는 extract_fixture()로 같은 어댑터에 넣어 확인한다.
+"""
+
+import logging
+import os
+import queue
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+from config import (
+    COLUMNS, HTTP_WORKERS, HTTP_TIMEOUT, HTTP_RETRIES, HTTP_POOL_MAXSIZE, HTTP_MAX_BYTES,
+    HTTP_USER_AGENT, HTTP_SKIP_HOSTS
+)
+from failures import FailureKind, format_error
+from field_rules import DEFAULT_MATCHER
+from normalization import normalize_phone, normalize_email
+from structured_log import say, detail, set_stage, store_scope
+
+logger = logging.getLogger(__name__)
+
+# 플랫폼 이름 → 어댑터
+ADAPTERS = {}
+
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+_SEGMENT_SPLIT_RE = re.compile(r'\s*(?:\n|\||ㅣ|│|｜|·|∙)\s*')
+_COLON_PAIR_RE = re.compile(r'^([^:：\d]{1,15}?)\s*[:：]\s*(.+)$')
+_HOST_RE = re.compile(r'^(?:www\.)?(.+)$')
+
+# 도메인 조회 실패 메시지 - 작업 스레드가 많으면 DNS가 잠시 실패하기도 하므로
+# 처음에는 network로 남기고, 다음 실행에서 다시 실패해야 permanent로 바꿈
+DNS_FAILURE = "도메인 없음"
+
+# 어댑터 점검용 저장 HTML (자체 쇼핑몰 하단 사업자 정보)
+FOOTER_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'company_footer.html')
+
+
+def register(adapter):
+    """어댑터 등록 (같은 플랫폼이면 교체)"""
+    ADAPTERS[adapter.platform] = adapter
+    return adapter
+
+
+def host_of(url):
+    """URL → 호스트 (www. 제외, 소문자)"""
+    if not url:
+        return ''
+    if '://' not in url:
+        url = 'https://' + url
+    return _HOST_RE.match(urlsplit(url).hostname or '').group(1).lower()
+
+
+def adapter_for(platform, url=None):
+    """플랫폼(과 URL)에 맞는 어댑터 (없거나 자리표시 주소면 None)"""
+    if url is not None and host_of(url) in HTTP_SKIP_HOSTS:
+        return None
+    return ADAPTERS.get(platform)
+
+
+class FetchError(Exception):
+    """HTTP 요청 실패 (kind: FailureKind)"""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+class StorefrontClient:
+    """연결을 재사용하는 HTTP 클라이언트 (작업 스레드끼리 공유)"""
+
+    def __init__(self, workers=HTTP_WORKERS, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES):
+        import urllib3
+
+        self._urllib3 = urllib3
+        # 재시도/연결 풀 경고는 결과(ERROR[유형])로 남으므로 콘솔에는 출력하지 않음
+        logging.getLogger('urllib3.connectionpool').setLevel(logging.ERROR)
+        self.http = urllib3.PoolManager(
+            num_pools=max(10, workers * 4),
+            maxsize=HTTP_POOL_MAXSIZE,
+            headers={'User-Agent': HTTP_USER_AGENT, 'Accept-Language': 'ko-KR,ko;q=0.9'},
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            retries=urllib3.Retry(total=retries, redirect=5, backoff_factor=0.5,
+                                  status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+        )
+
+    def fetch(self, url):
+        """URL → (최종 URL, HTML 문자열) - 실패하면 FetchError"""
+        if url.startswith('file://'):
+            return url, self._read_file(url)
+
+        exceptions = self._urllib3.exceptions
+        try:
+            response = self.http.request('GET', url, preload_content=False)
+        except exceptions.MaxRetryError as e:
+            reason = e.reason
+            if isinstance(reason, exceptions.NameResolutionError):
+                raise FetchError(FailureKind.TRANSIENT_NETWORK, f"{DNS_FAILURE}: {host_of(url)}")
+            if isinstance(reason, exceptions.TimeoutError):
+                raise FetchError(FailureKind.TIMEOUT, f"응답 시간 초과: {url}")
+            raise FetchError(FailureKind.TRANSIENT_NETWORK, f"연결 실패: {reason}")
+        except exceptions.TimeoutError:
+            raise FetchError(FailureKind.TIMEOUT, f"응답 시간 초과: {url}")
+        except exceptions.HTTPError as e:
+            raise FetchError(FailureKind.TRANSIENT_NETWORK, f"요청 실패: {e}")
+
+        try:
+            body = response.read(HTTP_MAX_BYTES)
+        except exceptions.HTTPError as e:
+            response.close()
+            kind = FailureKind.TIMEOUT if isinstance(e, exceptions.TimeoutError) else FailureKind.TRANSIENT_NETWORK
+            raise FetchError(kind, f"응답 읽기 실패: {e}")
+        if len(body) >= HTTP_MAX_BYTES:
+            response.close()    # 나머지는 버림 (하단 정보가 잘릴 수 있음)
+        else:
+            response.release_conn()
+
+        if response.status in (404, 410):
+            raise FetchError(FailureKind.PERMANENT, f"페이지 없음 ({response.status})")
+        if response.status >= 400:
+            raise FetchError(FailureKind.TRANSIENT_NETWORK, f"HTTP {response.status}")
+        return response.geturl() or url, decode_html(body, response.headers.get('Content-Type', ''))
+
+    def _read_file(self, url):
+        path = urlsplit(url).path
+        try:
+            with open(path, 'rb') as f:
+                return decode_html(f.read(HTTP_MAX_BYTES))
+        except OSError as e:
+            raise FetchError(FailureKind.PERMANENT, f"파일 없음: {e}")
+
+
+def decode_html(body, content_type=''):
+    """응답 바이트 → 문자열 (헤더 charset > meta charset > UTF-8, 깨지면 CP949)"""
+    charset = None
+    if 'charset=' in content_type:
+        charset = content_type.split('charset=', 1)[1].split(';')[0].strip().strip('"\'')
+    if not charset:
+        match = _META_CHARSET_RE.search(body[:4096])
+        charset = match.group(1).decode('ascii', 'ignore') if match else 'utf-8'
+    charset = {'euc-kr': 'cp949', 'ks_c_5601-1987': 'cp949'}.get(charset.lower(), charset)
+    try:
+        return body.decode(charset)
+    except (LookupError, UnicodeDecodeError):
+        try:
+            return body.decode('cp949')
+        except UnicodeDecodeError:
+            return body.decode('utf-8', errors='replace')
+
+
+class StorefrontAdapter:
+    """어댑터 기본 클래스 - pages()의 URL을 차례로 받아 extract()로 판매자 정보 추출"""
+
+    platform = None
+
+    def pages(self, url):
+        """요청할 URL 목록 (앞에서부터, 전화번호/이메일을 모두 찾으면 멈춤)"""
+        return [normalize_url(url)]
+
+    def extract(self, html, url):
+        """HTML → 판매자 정보 dict (FIELD_RULES 필드 이름)"""
+        raise NotImplementedError
+
+    def is_complete(self, info):
+        """더 요청하지 않아도 되는지 (기본: 하나라도 찾으면)"""
+        return bool(info)
+
+
+def normalize_url(url):
+    """스킴 없는 URL에 https:// 추가"""
+    url = url.strip()
+    return url if re.match(r'^[a-z][a-z0-9+.-]*://', url, re.IGNORECASE) else 'https://' + url
+
+
+class CompanySiteAdapter(StorefrontAdapter):
+    """자체 쇼핑몰/회사 홈페이지 (카페24·고도몰·아임웹 등) - 하단 사업자 정보에서 추출
+
+    전자상거래법에 따라 하단에 표시하는 '상호 : ... | 대표자 : ... | 사업자등록번호 : ...'
+    형식의 텍스트를 FIELD_RULES 라벨 키워드로 매칭하고, tel:/mailto: 링크로 보완한다.
+    """
+
+    platform = '기타'
+    FOOTER_XPATH = (
+        "//footer | //*[contains(translate(@id, 'FOTER', 'foter'), 'footer')"
+        " or contains(translate(@class, 'FOTER', 'foter'), 'footer')]"
+    )
+
+    def __init__(self, matcher=DEFAULT_MATCHER):
+        self.matcher = matcher
+        self._phone_fields = {rule['field'] for rule in matcher.rules if rule.get('normalizer') == 'phone'}
+        self._email_fields = {rule['field'] for rule in matcher.rules if rule.get('normalizer') == 'email'}
+        keywords = sorted({k for rule in matcher.rules for k in rule['keywords']}, key=len, reverse=True)
+        # 한 줄에 '상호: A 대표: B'처럼 붙어 있는 쌍을 라벨 앞에서 나눔
+        self._label_split = re.compile(
+            r'\s+(?=(?:' + '|'.join(re.escape(k) for k in keywords) + r')[^:：\d]{0,10}[:：])'
+        )
+
+    def pages(self, url):
+        """주어진 URL, 하위 경로면 사이트 첫 화면도"""
+        url = normalize_url(url)
+        parts = urlsplit(url)
+        root = urlunsplit((parts.scheme, parts.netloc, '/', '', ''))
+        if parts.scheme == 'file' or (parts.path in ('', '/') and not parts.query):
+            return [url]
+        return [url, root]
+
+    def is_complete(self, info):
+        """전화번호/이메일을 모두 찾았는지"""
+        return (self._phone_fields | self._email_fields) <= set(info)
+
+    def _segments(self, text):
+        for line in _SEGMENT_SPLIT_RE.split(text):
+            for segment in self._label_split.split(line):
+                segment = segment.strip()
+                if segment:
+                    yield segment
+
+    def _pairs(self, text):
+        """텍스트 → (라벨, 값) 후보 ('라벨: 값' 또는 '라벨 값' - 라벨은 앞 1~2단어)"""
+        for segment in self._segments(text):
+            match = _COLON_PAIR_RE.match(segment)
+            if match:
+                yield match.group(1), match.group(2)
+                continue
+            words = segment.split(None, 2)
+            for size in (1, 2):
+                if len(words) > size and self.matcher.match(' '.join(words[:size])):
+                    yield ' '.join(words[:size]), segment.split(None, size)[size]
+                    break
+
+    def _apply(self, pairs, info):
+        """라벨 매칭 → 정규화 (전화번호/이메일은 유효한 형식일 때만)"""
+        for label, value in pairs:
+            field = self.matcher.match(label)
+            if field is None or field in info:
+                continue
+            normalized = self.matcher.normalize(field, value)
+            if field in self._phone_fields:
+                normalized = normalize_phone(normalized)
+            if normalized:
+                info[field] = normalized
+        return info
+
+    def extract(self, html, url):
+        import lxml.html
+
+        document = lxml.html.document_fromstring(html or '<html><body></body></html>')
+        for element in document.xpath('//script | //style | //noscript'):
+            element.drop_tree()
+
+        info = {}
+        footers = document.xpath(self.FOOTER_XPATH)
+        # 하단 영역 우선, 없거나 정보가 없으면 본문 전체
+        for root in (footers or []) + [document.body if document.body is not None else document]:
+            self._apply(self._pairs(root.text_content()), info)
+            if info:
+                break
+
+        # 라벨 없이 링크로만 있는 연락처
+        for field in self._phone_fields - set(info):
+            for href in document.xpath("//a[starts-with(@href, 'tel:')]/@href"):
+                phone = normalize_phone(href[4:])
+                if phone:
+                    info[field] = phone
+                    break
+        for field in self._email_fields - set(info):
+            for href in document.xpath("//a[starts-with(@href, 'mailto:')]/@href"):
+                email = normalize_email(href[7:].split('?', 1)[0])
+                if email:
+                    info[field] = email
+                    break
+        return info
+
+
+register(CompanySiteAdapter())
+
+
+class HttpResult:
+    """HTTP 처리 결과 1건 (작업 스레드 → 메인 스레드)"""
+
+    __slots__ = ('task', 'seller_info', 'kind', 'message', 'fetches', 'elapsed')
+
+    def __init__(self, task, seller_info=None, kind=None, message=None, fetches=0, elapsed=0.0):
+        self.task = task
+        self.seller_info = seller_info or {}
+        self.kind = kind            # 실패 유형 (성공이면 None)
+        self.message = message
+        self.fetches = fetches
+        self.elapsed = elapsed
+
+
+def _fetch(client, url):
+    """https 연결이 안 되면 http로 한 번 더 (스킴 없이 적힌 자체몰 주소는 http만 되는 경우가 많음)"""
+    try:
+        return client.fetch(url)
+    except FetchError as e:
+        if e.kind != FailureKind.TRANSIENT_NETWORK or not url.startswith('https://'):
+            raise
+        return client.fetch('http://' + url[len('https://'):])
+
+
+def process_http_store(client, adapter, task):
+    """스토어 1건: 어댑터 페이지를 차례로 받아 추출 (작업 스레드에서 실행)"""
+    started = time.perf_counter()
+    info = {}
+    fetches = 0
+    with store_scope(task):
+        set_stage('http')
+        try:
+            for page_url in adapter.pages(task.url):
+                fetches += 1
+                final_url, html = _fetch(client, page_url)
+                for field, value in adapter.extract(html, final_url).items():
+                    info.setdefault(field, value)
+                if adapter.is_complete(info):
+                    break
+        except FetchError as e:
+            if not info:
+                return HttpResult(task, kind=e.kind, message=str(e), fetches=fetches,
+                                  elapsed=time.perf_counter() - started)
+        except Exception as e:
+            logger.debug(f"HTTP 처리 오류: {e}")
+            return HttpResult(task, kind=FailureKind.UNKNOWN, message=str(e), fetches=fetches,
+                              elapsed=time.perf_counter() - started)
+
+    if not info:
+        return HttpResult(task, kind=FailureKind.SELECTOR_MISSING, message="판매자 정보를 찾을 수 없음",
+                          fetches=fetches, elapsed=time.perf_counter() - started)
+    return HttpResult(task, info, fetches=fetches, elapsed=time.perf_counter() - started)
+
+
+class HttpStoreQueue:
+    """HTTP 스토어 병렬 처리 (작업 스레드에서 요청/추출, 메인 스레드에서 drain으로 결과 반영)"""
+
+    def __init__(self, workers=HTTP_WORKERS, client=None):
+        self.client = client or StorefrontClient(workers)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http')
+        self.results = queue.Queue()
+        self.pending = 0
+        self.stats = {'done': 0, 'success': 0, 'failed': 0, 'fetches': 0}
+
+    def submit(self, task, adapter):
+        self.pending += 1
+        future = self.executor.submit(process_http_store, self.client, adapter, task)
+        future.add_done_callback(lambda f: f.cancelled() or self.results.put(f.result()))
+
+    def drain(self, handle, timeout=0):
+        """끝난 결과를 handle(result)로 반영 (첫 결과는 timeout초까지 기다림) → 반영한 수"""
+        handled = 0
+        while self.pending:
+            try:
+                if timeout and not handled:
+                    result = self.results.get(timeout=timeout)
+                else:
+                    result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            self.stats['done'] += 1
+            self.stats['fetches'] += result.fetches
+            self.stats['success' if result.kind is None else 'failed'] += 1
+            handle(result)
+            handled += 1
+        return handled
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def http_store_mask(urls, platforms):
+    """URL 컬럼 → HTTP 어댑터로 처리할 행 (어댑터가 있는 플랫폼, HTTP_SKIP_HOSTS 제외)"""
+    mask = platforms.isin(list(ADAPTERS))
+    if HTTP_SKIP_HOSTS and mask.any():
+        hosts = urls.where(mask, '').fillna('').astype(str).map(host_of)
+        mask &= ~hosts.isin(HTTP_SKIP_HOSTS)
+    return mask
+
+
+def http_tasks(df, tasks):
+    """작업 목록 → [(작업, 어댑터)] (플랫폼별 어댑터가 있는 행만)"""
+    from status import classify_platforms
+
+    platforms = classify_platforms(df.loc[[task.row for task in tasks], COLUMNS['STORE_URL']]).tolist()
+    pairs = []
+    for task, platform in zip(tasks, platforms):
+        adapter = adapter_for(platform, task.url)
+        if adapter is not None:
+            pairs.append((task, adapter))
+    return pairs
+
+
+def apply_http_result(excel_handler, result):
+    """HTTP 결과를 CSV에 반영 (메인 스레드)"""
+    task = result.task
+    with store_scope(task):
+        if result.kind is None:
+            found = ', '.join(f"{field}={value}" for field, value in result.seller_info.items())
+            detail(f"🌐 {task.name}: {found} ({result.elapsed:.1f}초)", stage='save')
+            return excel_handler.update_seller_info(task, result.seller_info)
+        kind = result.kind
+        if kind == FailureKind.TRANSIENT_NETWORK and result.message.startswith(DNS_FAILURE):
+            # 지난 실행에서도 같은 도메인 조회 실패였으면 영구 실패
+            previous = excel_handler.df.at[task.row, COLUMNS['UPDATED_PHONE']]
+            if isinstance(previous, str) and previous == format_error(kind, result.message):
+                kind = FailureKind.PERMANENT
+        detail(f"🌐 {task.name}: ERROR[{kind}] {result.message}", stage='failed', kind=kind)
+        excel_handler.log_error(task, result.message, kind)
+        return False
+
+
+def run_http_stores(file_path=None, workers=HTTP_WORKERS, limit=None, pending_only=False):
+    """네이버 외 스토어만 HTTP 어댑터로 처리 (브라우저/로그인 없음)"""
+    from excel_handler import ExcelHandler
+    from tasks import build_tasks
+
+    excel_handler = ExcelHandler(file_path)
+    excel_handler.load_data()
+    stores = excel_handler.filter_http_stores(list(ADAPTERS), pending_only)
+    pairs = http_tasks(excel_handler.df, build_tasks(stores))
+    if limit:
+        pairs = pairs[:limit]
+    if not pairs:
+        say("❌ HTTP로 처리할 스토어가 없습니다.")
+        return None
+
+    say(f"🌐 HTTP 어댑터 처리: {len(pairs)}개 (작업 스레드 {workers}개, 어댑터: {', '.join(ADAPTERS)})")
+    started = time.perf_counter()
+    http_queue = HttpStoreQueue(workers)
+    for task, adapter in pairs:
+        http_queue.submit(task, adapter)
+
+    last_report = started
+    try:
+        while http_queue.pending:
+            # 끝난 결과를 모아서 한 번에 저장 (건마다 CSV 전체를 쓰지 않음)
+            with excel_handler.batch():
+                http_queue.drain(lambda result: apply_http_result(excel_handler, result), timeout=1)
+            if time.perf_counter() - last_report >= 5:
+                last_report = time.perf_counter()
+                say(f"   진행: {http_queue.stats['done']}/{len(pairs)} (성공 {http_queue.stats['success']})")
+    except KeyboardInterrupt:
+        say("\n⏹️ 사용자에 의해 중단됨")
+    finally:
+        http_queue.shutdown()
+
+    elapsed = time.perf_counter() - started
+    stats = http_queue.stats
+    say("=" * 60)
+    say("📊 HTTP 어댑터 결과")
+    say(f"처리: {stats['done']}개 (성공 {stats['success']} / 실패 {stats['failed']}, 요청 {stats['fetches']}회)")
+    say(f"소요 시간: {elapsed:.1f}초 ({stats['done'] / elapsed if elapsed else 0:.1f} 스토어/초)")
+    say(f"최종 파일: {excel_handler.file_path}")
+    say("=" * 60)
+    return stats
+
+
+def extract_fixture(path=FOOTER_FIXTURE, url=None, platform=CompanySiteAdapter.platform):
+    """로컬 HTML 파일에 어댑터 적용 → 판매자 정보 (어댑터 점검용)
+
+    >>> info = extract_fixture()    # fixtures/company_footer.html (스크립트 안 번호는 무시)
+    >>> info['상호명'], info['대표자명'], info['사업자번호']
+    ('주식회사 브리치', '홍길동', '123-45-67890')
+    >>> info['전화번호'], info['이메일'], info['주소']
+    ('02-1234-5678', 'cs@brich.co.kr', '서울특별시 강남구 테헤란로 123, 4층')
+    """
+    adapter = ADAPTERS[platform]
+    with open(path, 'rb') as f:
+        html = decode_html(f.read())
+    return adapter.extract(html, url or f"file://{path}")
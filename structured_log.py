@@ -0,0 +1,184 @@
+# structured_log.py
+"""
+구조화 로깅 모듈 (큐 기반 백그라운드 출력 + JSON lines 기록)
+
+수집 루프에서는 로그 레코드를 큐에 넣기만 하고, 콘솔/파일 출력은 별도 스레드
+(QueueListener)가 처리한다. 모든 레코드에는 처리 중인 스토어의 고유번호와
+단계(stage)가 붙는다.
+
+    progress 로거 (say)   → stdout, 메시지만 (기존 print 출력과 동일한 모양)
+    그 외 로거            → stderr, LOG_FORMAT
+    --log-json 경로       → 한 줄에 JSON 하나 (ts, level, logger, msg, store_key, stage, ...)
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime
+
+from config import LOG_FORMAT, LOG_LEVEL, DEBUG_MODE, VERBOSE_LOGGING
+
+# 진행 출력 전용 로거 (print 대체)
+progress = logging.getLogger('progress')
+
+# 스토어별 세부 출력 (추출한 필드, 선택자별 결과 등) 레벨
+# VERBOSE_LOGGING이면 콘솔에도, 아니면 DEBUG_MODE일 때 JSON 기록에만 남는다.
+DETAIL = logging.INFO if VERBOSE_LOGGING else logging.DEBUG
+
+# 현재 처리 중인 스토어 (스레드/컨텍스트별)
+_store_context = contextvars.ContextVar('store_context', default=None)
+
+# 레코드에 기본으로 있는 속성 (JSON에 extra 필드만 골라 넣기 위함)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+_queue = None
+_queue_handler = None
+_listener = None
+
+
+class _StoreState:
+    __slots__ = ('store_key', 'store_name', 'stage')
+
+    def __init__(self, store_key, store_name):
+        self.store_key = store_key
+        self.store_name = store_name
+        self.stage = None
+
+
+@contextlib.contextmanager
+def store_scope(task):
+    """with 블록 안의 모든 로그에 스토어 고유번호/이름을 붙임"""
+    token = _store_context.set(_StoreState(task.store_key, task.name))
+    try:
+        yield
+    finally:
+        _store_context.reset(token)
+
+
+def set_stage(stage):
+    """현재 스토어의 처리 단계 기록 (navigate/button/captcha/extract/save/...)"""
+    state = _store_context.get()
+    if state is not None:
+        state.stage = stage
+
+
+def say(message, stage=None, level=logging.INFO, **fields):
+    """진행 메시지 출력 (콘솔에는 메시지만, JSON에는 스토어/단계/추가 필드와 함께)"""
+    if stage:
+        set_stage(stage)
+    if progress.isEnabledFor(level):
+        progress.log(level, message, extra={'fields': fields} if fields else None)
+
+
+def detail(message, **fields):
+    """스토어별 세부 메시지 (VERBOSE_LOGGING일 때만 콘솔 출력)"""
+    say(message, level=DETAIL, **fields)
+
+
+class StoreContextFilter(logging.Filter):
+    """레코드를 큐에 넣기 전에 (로그를 남긴 스레드에서) 스토어 정보를 붙임"""
+
+    def filter(self, record):
+        state = _store_context.get()
+        record.store_key = state.store_key if state else None
+        record.store_name = state.store_name if state else None
+        if getattr(record, 'stage', None) is None:
+            record.stage = state.stage if state else None
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """레코드 → JSON 한 줄"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage().strip(),
+            'store_key': getattr(record, 'store_key', None),
+            'stage': getattr(record, 'stage', None)
+        }
+        if getattr(record, 'store_name', None):
+            entry['store_name'] = record.store_name
+        entry.update(getattr(record, 'fields', None) or {})
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry and key not in ('fields', 'store_name'):
+                entry[key] = value    # logger.info(..., extra={...})로 넘긴 값
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _is_progress(record):
+    return record.name == progress.name
+
+
+def setup_logging(json_path=None, quiet=False):
+    """루트 로거를 큐 핸들러 하나로 교체하고 출력 스레드 시작
+
+    DEBUG_MODE면 progress 로거의 DEBUG 레코드까지 남기고 (JSON 기록),
+    VERBOSE_LOGGING이면 세부 메시지도 콘솔에 출력한다.
+    quiet면 콘솔에는 경고 이상만 출력한다.
+    """
+    global _queue, _queue_handler, _listener
+    shutdown()
+
+    console_level = logging.WARNING if quiet else logging.INFO
+
+    progress_handler = logging.StreamHandler(sys.stdout)
+    progress_handler.setLevel(console_level)
+    progress_handler.setFormatter(logging.Formatter('%(message)s'))
+    progress_handler.addFilter(_is_progress)
+
+    log_handler = logging.StreamHandler(sys.stderr)
+    log_handler.setLevel(console_level)
+    log_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_handler.addFilter(lambda record: not _is_progress(record))
+
+    sinks = [progress_handler, log_handler]
+    if json_path:
+        json_handler = logging.FileHandler(json_path, encoding='utf-8')
+        json_handler.setFormatter(JsonLinesFormatter())
+        sinks.append(json_handler)
+
+    _queue = queue.Queue(-1)
+    _queue_handler = logging.handlers.QueueHandler(_queue)
+    _queue_handler.addFilter(StoreContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(getattr(logging, LOG_LEVEL))
+    progress.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
+
+    _listener = logging.handlers.QueueListener(_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def flush():
+    """큐에 쌓인 레코드가 모두 출력될 때까지 대기 (input()/print 직전에 호출)"""
+    if _queue is not None and _listener is not None:
+        _queue.join()
+    sys.stdout.flush()
+
+
+def shutdown():
+    """출력 스레드 종료 (남은 레코드는 모두 출력, 이후 로그는 표준 동작으로)"""
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown)
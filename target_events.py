@@ -0,0 +1,114 @@
+# target_events.py
+"""
+DevTools 타깃 이벤트 감시 모듈 (새 탭/탭 닫힘/주소 변경을 폴링 없이 감지)
+"""
+
+import json
+import logging
+import threading
+import urllib.request
+
+import websocket
+
+logger = logging.getLogger(__name__)
+
+
+class TargetWatcher:
+    """브라우저 DevTools 웹소켓의 Target 이벤트로 페이지 탭 상태를 추적
+
+    chromedriver의 창 핸들은 DevTools targetId와 같으므로 pages의 키를
+    그대로 driver.switch_to.window()에 사용할 수 있다.
+    """
+
+    def __init__(self, debugger_address):
+        self.debugger_address = debugger_address
+        self.pages = {}                 # targetId → url (type == 'page'만, 열린 순서 유지)
+        self._condition = threading.Condition()
+        self._ws = None
+        self._thread = None
+        self._next_id = 0
+        self.running = False
+
+    def start(self):
+        """브라우저 웹소켓 연결 및 타깃 이벤트 구독"""
+        with urllib.request.urlopen(f"http://{self.debugger_address}/json/version", timeout=5) as response:
+            ws_url = json.load(response)['webSocketDebuggerUrl']
+
+        self._ws = websocket.create_connection(ws_url, timeout=5, suppress_origin=True)
+        self._ws.settimeout(None)
+        self.running = True
+        self._send('Target.setDiscoverTargets', {'discover': True})
+
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+        logger.info(f"DevTools 타깃 이벤트 감시 시작: {self.debugger_address}")
+
+    def stop(self):
+        """감시 종료"""
+        self.running = False
+        try:
+            if self._ws:
+                self._ws.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._condition.notify_all()
+
+    def _send(self, method, params=None):
+        self._next_id += 1
+        self._ws.send(json.dumps({'id': self._next_id, 'method': method, 'params': params or {}}))
+
+    def _listen(self):
+        """이벤트 수신 스레드"""
+        while self.running:
+            try:
+                message = json.loads(self._ws.recv())
+            except Exception as e:
+                if self.running:
+                    logger.warning(f"DevTools 이벤트 연결 종료: {e}")
+                self.running = False
+                break
+
+            method = message.get('method')
+            if method:
+                self._handle(method, message.get('params', {}))
+
+        with self._condition:
+            self._condition.notify_all()
+
+    def _handle(self, method, params):
+        """Target 이벤트 → 탭 상태 갱신"""
+        with self._condition:
+            if method in ('Target.targetCreated', 'Target.targetInfoChanged'):
+                info = params.get('targetInfo', {})
+                if info.get('type') != 'page':
+                    return
+                self.pages[info['targetId']] = info.get('url', '')
+            elif method == 'Target.targetDestroyed':
+                if self.pages.pop(params.get('targetId'), None) is None:
+                    return
+            else:
+                return
+            self._condition.notify_all()
+
+    def wait_for(self, predicate, timeout):
+        """predicate()가 참이 될 때까지 이벤트 대기 (감시 중단 시 즉시 반환)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: predicate() or not self.running, timeout)
+
+    def wait_for_new_page(self, exclude, timeout):
+        """exclude 이외의 새 탭이 열릴 때까지 대기 → targetId 또는 None"""
+        def new_page():
+            return next((t for t in reversed(list(self.pages)) if t not in exclude), None)
+
+        self.wait_for(lambda: new_page() is not None, timeout)
+        with self._condition:
+            return new_page()
+
+    def is_open(self, target_id):
+        with self._condition:
+            return target_id in self.pages
+
+    def url_of(self, target_id):
+        with self._condition:
+            return self.pages.get(target_id, '')
@@ -0,0 +1,55 @@
+# tasks.py
+"""
+스토어 작업 단위 모듈 (pandas Series 대신 가벼운 레코드 사용)
+"""
+
+from config import COLUMNS
+
+
+class StoreTask:
+    """스토어 1건 처리에 필요한 값만 담은 작업 레코드"""
+
+    __slots__ = ('row', 'store_key', 'name', 'url', 'current_phone', 'current_email')
+
+    def __init__(self, row, store_key, name, url, current_phone=None, current_email=None):
+        self.row = row                      # 원본 DataFrame 인덱스 (저장 시 사용)
+        self.store_key = store_key          # 고유번호
+        self.name = name                    # 입점사명
+        self.url = url                      # 온라인 쇼핑몰 URL
+        self.current_phone = current_phone  # 현재 최신화 전화번호 (없으면 None)
+        self.current_email = current_email  # 현재 최신화 이메일 (없으면 None)
+
+    @property
+    def excel_row(self):
+        """엑셀/CSV 기준 행 번호 (헤더 포함, 1부터 시작)"""
+        return self.row + 2
+
+    def __repr__(self):
+        return f"StoreTask(row={self.row}, name={self.name!r}, url={self.url!r})"
+
+
+def _column_values(df, key):
+    """컬럼 값을 파이썬 리스트로 (없거나 NaN이면 None)"""
+    column = COLUMNS[key]
+    if column not in df.columns:
+        return [None] * len(df)
+    series = df[column]
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def build_tasks(df):
+    """작업 대상 DataFrame → StoreTask 리스트 (컬럼 단위로 한 번에 변환)
+
+    df의 인덱스는 원본 DataFrame의 인덱스여야 한다.
+    """
+    return [
+        StoreTask(*values)
+        for values in zip(
+            df.index.tolist(),
+            _column_values(df, 'STORE_KEY'),
+            _column_values(df, 'COMPANY_NAME'),
+            _column_values(df, 'STORE_URL'),
+            _column_values(df, 'UPDATED_PHONE'),
+            _column_values(df, 'UPDATED_EMAIL')
+        )
+    ]
@@ -2,75 +2,167 @@
 SmartStore 연락처 자동 수집기
 - 엑셀 '온라인 쇼핑몰 URL' 컬럼에 smartstore/shopping.naver 주소가 있을 때만 작업
 - 사용자는 캡차만 풀고 엔터(또는 아무 키) → 나머지 단계는 자동
+- --stream: 엑셀을 한 행씩 읽고 결과를 한 행씩 사이드카 CSV에 기록 (중단 후 이어서 실행 가능)
 """
 
-import time, sys, argparse, pathlib
+import time, sys, argparse, pathlib, csv, re
+from datetime import datetime
 import pandas as pd
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import undetected_chromedriver as uc
-
-BTN_SEL = 'button[data-shp-area="fot.sellerinfo"]'
-CAPTCHA_IMG = 'img#captchaimg'
-SELLER_DLG = 'dl._3BlyWp6LJv'          # 판매자 정보 팝업
-
-def scrape_seller_info(driver):
-    """판매자 팝업이 열린 상태에서 전화·메일 추출"""
-    root = driver.find_element(By.CSS_SELECTOR, SELLER_DLG)
-    field_elems = root.find_elements(By.CSS_SELECTOR, 'div.aAVvlAZ43w')
-    info = {}
-    for d in field_elems:
-        key = d.find_element(By.TAG_NAME, 'dt').text.strip()
-        val = d.find_element(By.TAG_NAME, 'dd').text.strip()
-        info[key] = val
-    # SmartStore가 주로 쓰는 라벨만 리턴
-    return {
-        '최신화 전화번호': info.get('고객센터') or '',
-        '최신화 이메일':   info.get('e-mail') or '',
-    }
-
-def process_url(driver, url):
-    driver.get(url)
-    WebDriverWait(driver, 20).until(EC.element_to_be_clickable((By.CSS_SELECTOR, BTN_SEL))).click()
-
-    # 1) 캡차가 뜨면 사용자가 풀게 둔다
-    try:
-        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, CAPTCHA_IMG)))
-        print(f'⚠️  {url} – 캡차 풀고 엔터를 눌러 주세요…', flush=True)
-        input()                 # 사용자가 풀면 엔터
-    except Exception:
-        pass                    # 캡차가 안 뜨는 경우도 있음
+from openpyxl import load_workbook, Workbook
+
+from browser_handler import BrowserHandler
+from config import COLUMNS, FIELD_RULES
+from structured_log import setup_logging
+
+TARGET_URL_RE = re.compile(r'smartstore|shopping\.naver')
+RESULT_COLUMNS = list(dict.fromkeys(rule['column'] for rule in FIELD_RULES))
+SIDECAR_COLUMNS = ['엑셀 행', COLUMNS['STORE_KEY'], COLUMNS['COMPANY_NAME'], COLUMNS['STORE_URL']] \
+    + RESULT_COLUMNS + [COLUMNS['UPDATED_AT']]
+
+def to_result_columns(seller_info):
+    """BrowserHandler 추출 결과(필드명 키) → 엑셀 컬럼명 키"""
+    return {rule['column']: seller_info.get(rule['field']) or '' for rule in FIELD_RULES}
+
+def process_url(browser, url):
+    """스토어 접속 → 판매자 정보 버튼 클릭 → (캡차) → 정보 추출"""
+    browser.navigate_to_url(url)
+    if not browser.find_seller_info_button():
+        raise RuntimeError('판매자 정보 버튼 없음')
+
+    # 1) 캡차가 뜨면 사용자가 풀게 둔다 (완료 자동 감지 / r: 다시로드 / s: 건너뛰기)
+    if browser.detect_captcha_by_window_change():
+        result = browser.wait_for_captcha_completion()
+        if result == 'auto_retry':
+            browser.driver.switch_to.window(browser.main_window)
+            browser.find_seller_info_button()
+        elif result != 'success':
+            raise RuntimeError(f'캡차 미완료 ({result})')
 
     # 2) 팝업의 판매자 정보를 파싱
-    WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, SELLER_DLG)))
-    return scrape_seller_info(driver)
+    return to_result_columns(browser.extract_seller_info())
+
+def open_browser():
+    """수집기와 동일한 드라이버 설정 사용"""
+    browser = BrowserHandler()
+    browser.setup_driver()
+    return browser
 
 def main(xlsx_path):
     df = pd.read_excel(xlsx_path)
-    mask = df['온라인 쇼핑몰 URL'].str.contains('smartstore|shopping.naver', na=False)
+    mask = df[COLUMNS['STORE_URL']].str.contains(TARGET_URL_RE, na=False)
     targets = df[mask]
 
-    driver = uc.Chrome(headless=False)          # 로그인 세션이 유지되도록 쿠키 프로필 써도 OK
-    wait = WebDriverWait(driver, 30)
+    browser = open_browser()                   # 로그인 세션이 유지되도록 쿠키 프로필 써도 OK
 
     for idx, row in targets.iterrows():
-        url = row['온라인 쇼핑몰 URL']
+        url = row[COLUMNS['STORE_URL']]
         try:
-            result = process_url(driver, url)
+            result = process_url(browser, url)
             for k, v in result.items():
                 df.at[idx, k] = v
-            print(f'✅ {row["입점사명"]} – {result}')
+            print(f'✅ {row[COLUMNS["COMPANY_NAME"]]} – {result}')
         except Exception as e:
             print(f'❌ {url} – {e}')
 
-    driver.quit()
+    browser.close_driver()
     backup = pathlib.Path(xlsx_path).with_suffix('.bak.xlsx')
     pathlib.Path(xlsx_path).rename(backup)
     df.to_excel(xlsx_path, index=False)
     print(f'🔄 저장 완료 ({xlsx_path}), 백업: {backup}')
 
+def iter_sheet_rows(xlsx_path):
+    """읽기 전용 모드로 (엑셀 행 번호, 행 dict) 순회"""
+    wb = load_workbook(xlsx_path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) if h is not None else '' for h in next(rows)]
+        for excel_row, values in enumerate(rows, start=2):
+            yield excel_row, dict(zip(header, values))
+    finally:
+        wb.close()
+
+def load_done_rows(sidecar_path):
+    """사이드카에 이미 기록된 엑셀 행 번호 (ERROR 행은 다시 시도)"""
+    if not sidecar_path.exists():
+        return set()
+    with open(sidecar_path, newline='', encoding='utf-8') as f:
+        return {
+            int(r['엑셀 행']) for r in csv.DictReader(f)
+            if r.get('엑셀 행') and not (r.get(COLUMNS['UPDATED_PHONE']) or '').startswith('ERROR')
+        }
+
+def main_stream(xlsx_path, sidecar_path=None, output_path=None):
+    """스트리밍 모드: 한 행씩 처리하고 결과를 즉시 사이드카 CSV에 추가"""
+    sidecar_path = pathlib.Path(sidecar_path or pathlib.Path(xlsx_path).with_suffix('.results.csv'))
+    done_rows = load_done_rows(sidecar_path)
+    if done_rows:
+        print(f'⏭️ 이미 처리된 {len(done_rows)}개 행은 건너뜀 ({sidecar_path})')
+
+    browser = open_browser()
+    is_new = not sidecar_path.exists()
+
+    try:
+        with open(sidecar_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=SIDECAR_COLUMNS)
+            if is_new:
+                writer.writeheader()
+
+            for excel_row, row in iter_sheet_rows(xlsx_path):
+                url = row.get(COLUMNS['STORE_URL'])
+                if excel_row in done_rows or not url or not TARGET_URL_RE.search(str(url)):
+                    continue
+                try:
+                    result = process_url(browser, str(url))
+                    print(f'✅ {row.get(COLUMNS["COMPANY_NAME"])} – {result}')
+                except Exception as e:
+                    result = {COLUMNS['UPDATED_PHONE']: f'ERROR: {e}'}
+                    print(f'❌ {url} – {e}')
+
+                writer.writerow({
+                    '엑셀 행': excel_row,
+                    COLUMNS['STORE_KEY']: row.get(COLUMNS['STORE_KEY']),
+                    COLUMNS['COMPANY_NAME']: row.get(COLUMNS['COMPANY_NAME']),
+                    COLUMNS['STORE_URL']: url,
+                    COLUMNS['UPDATED_AT']: datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    **result
+                })
+                f.flush()       # 중단되어도 여기까지의 결과는 보존
+    finally:
+        browser.close_driver()
+
+    print(f'💾 결과 저장: {sidecar_path}')
+    if output_path:
+        write_merged_workbook(xlsx_path, sidecar_path, output_path)
+
+def write_merged_workbook(xlsx_path, sidecar_path, output_path):
+    """원본 엑셀 + 사이드카 결과를 쓰기 전용 모드로 한 행씩 기록"""
+    with open(sidecar_path, newline='', encoding='utf-8') as f:
+        results = {int(r['엑셀 행']): r for r in csv.DictReader(f)}
+
+    out = Workbook(write_only=True)
+    ws = out.create_sheet()
+    extra = [COLUMNS['UPDATED_AT']]
+    header = None
+
+    for excel_row, row in iter_sheet_rows(xlsx_path):
+        if header is None:
+            header = list(row) + [c for c in RESULT_COLUMNS + extra if c not in row]
+            ws.append(header)
+        merged = {**row, **{k: v for k, v in results.get(excel_row, {}).items() if k in header and v}}
+        ws.append([merged.get(c) for c in header])
+
+    out.save(output_path)
+    print(f'🔄 엑셀 저장 완료 ({output_path})')
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('xlsx', help='업데이트할 엑셀 파일 경로')
-    main(parser.parse_args().xlsx)
+    parser.add_argument('--stream', action='store_true', help='한 행씩 읽고 결과를 사이드카 CSV에 즉시 기록')
+    parser.add_argument('--sidecar', help='스트리밍 결과 CSV 경로 (기본: <엑셀>.results.csv)')
+    parser.add_argument('--output', help='스트리밍 종료 후 결과를 합친 엑셀 저장 경로')
+    args = parser.parse_args()
+    setup_logging()     # BrowserHandler 진행 메시지 출력
+    if args.stream:
+        main_stream(args.xlsx, args.sidecar, args.output)
+    else:
+        main(args.xlsx)